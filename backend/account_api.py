@@ -7,19 +7,29 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
+import asyncio
 
 # Import Supabase service
 try:
-    from services.supabase_service import supabase
+    from services.supabase_async import supabase
     SUPABASE_AVAILABLE = True
 except ImportError:
     try:
-        from .services.supabase_service import supabase
+        from .services.supabase_async import supabase
         SUPABASE_AVAILABLE = True
     except ImportError:
         SUPABASE_AVAILABLE = False
         supabase = None
 
+try:
+    from pagination import page_query, page_result, select_columns, total_count, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+    from wallet_balances import fetch_wallet_balances, format_units, RpcBatchError
+    from config import AVALANCHE_RPC
+except ImportError:
+    from .pagination import page_query, page_result, select_columns, total_count, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+    from .wallet_balances import fetch_wallet_balances, format_units, RpcBatchError
+    from .config import AVALANCHE_RPC
+
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 def require_supabase():
@@ -99,7 +109,7 @@ async def create_account(account: AccountCreate):
             raise HTTPException(status_code=400, detail="Invalid wallet address format")
         
         # Check if wallet already exists
-        existing = supabase.table("accounts").select("id").eq("wallet_address", account.wallet_address).execute()
+        existing = await supabase.table("accounts").select("id").eq("wallet_address", account.wallet_address).execute()
         if existing.data:
             raise HTTPException(status_code=400, detail="Account with this wallet address already exists")
         
@@ -115,7 +125,7 @@ async def create_account(account: AccountCreate):
             "wallet_key_name": account.wallet_key_name
         }
         
-        result = supabase.table("accounts").insert(account_data).execute()
+        result = await supabase.table("accounts").insert(account_data).execute()
         
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create account")
@@ -130,16 +140,18 @@ async def create_account(account: AccountCreate):
 async def list_accounts(
     owner_wallet: Optional[str] = Query(None, description="Filter by owner wallet"),
     account_type: Optional[str] = Query(None, description="Filter by account type"),
-    include_inactive: bool = Query(False, description="Include inactive accounts")
+    include_inactive: bool = Query(False, description="Include inactive accounts"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    include_count: bool = Query(False, description="Also return the total number of matching rows")
 ):
-    """List all accounts with optional filters"""
+    """List accounts with optional filters, newest first, one page at a time"""
     if not check_supabase_available():
         # Return empty list if Supabase not available
-        return {"accounts": []}
+        return {"accounts": [], "next_cursor": None}
     
-    try:
-        query = supabase.table("accounts").select("*")
-        
+    def filtered(query):
         if owner_wallet:
             query = query.eq("owner_wallet", owner_wallet)
         
@@ -148,13 +160,114 @@ async def list_accounts(
         
         if not include_inactive:
             query = query.eq("is_active", True)
-        
-        result = query.order("created_at", desc=True).execute()
-        
-        return {"accounts": result.data or []}
+        return query
+    
+    try:
+        query = filtered(supabase.table("accounts").select(select_columns(fields)))
+        result = await page_query(query, cursor, limit, desc=True).execute()
+        accounts, next_cursor = page_result(result.data or [], limit)
+        
+        response = {"accounts": accounts, "next_cursor": next_cursor}
+        if include_count:
+            # Counted without the cursor so every page reports the same total
+            response["total"] = await total_count(filtered(supabase.table("accounts").select("id", count="exact")))
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing accounts: {str(e)}")
 
+# Declared before /{account_id} so "clusters" is not taken for an account ID
+@router.get("/clusters")
+async def list_clusters(
+    owner_wallet: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    include_count: bool = Query(False, description="Also return the total number of matching rows")
+):
+    """List account clusters, newest first, one page at a time"""
+    require_supabase()
+    
+    def filtered(query):
+        return query.eq("owner_wallet", owner_wallet) if owner_wallet else query
+    
+    try:
+        query = filtered(supabase.table("account_clusters").select(select_columns(fields)))
+        result = await page_query(query, cursor, limit, desc=True).execute()
+        clusters, next_cursor = page_result(result.data or [], limit)
+        
+        response = {"clusters": clusters, "next_cursor": next_cursor}
+        if include_count:
+            response["total"] = await total_count(filtered(supabase.table("account_clusters").select("id", count="exact")))
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing clusters: {str(e)}")
+
+# Loads an account and all of its relations in one PostgREST request
+# (sub_accounts and account_balances reference accounts twice, so the FK is named)
+ACCOUNT_DETAIL_SELECT = (
+    "*, "
+    "members:joint_account_members(*), "
+    "business_details:business_accounts(*), "
+    "sub_accounts:sub_accounts!sub_accounts_parent_account_id_fkey(*), "
+    "balance:account_balances!account_balances_account_id_fkey(*)"
+)
+
+# Upper bound for /accounts/batch (ids travel in the query string)
+MAX_BATCH_ACCOUNTS = 100
+
+def _embedded_one(value):
+    """One-to-one embeds arrive as an object or a one-element list depending on the PostgREST version"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+def _shape_account(account: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the relations that apply to the account's type"""
+    members = account.pop("members", None) or []
+    business_details = _embedded_one(account.pop("business_details", None))
+    sub_accounts = account.pop("sub_accounts", None) or []
+    balance = _embedded_one(account.pop("balance", None))
+    
+    if account["type"] == "joint":
+        account["members"] = members
+    
+    if account["type"] == "business" and business_details:
+        account["business_details"] = business_details
+    
+    if account["type"] == "sub" or account.get("parent_id"):
+        account["sub_accounts"] = sub_accounts
+    
+    if balance:
+        account["balance"] = balance
+    
+    return account
+
+@router.get("/batch")
+async def get_accounts_batch(ids: str = Query(..., description="Comma-separated account IDs")):
+    """Get many accounts with their related data in a single query"""
+    require_supabase()
+    
+    account_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not account_ids:
+        raise HTTPException(status_code=400, detail="At least one account ID is required")
+    if len(account_ids) > MAX_BATCH_ACCOUNTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ACCOUNTS} accounts per request")
+    
+    try:
+        result = await supabase.table("accounts").select(ACCOUNT_DETAIL_SELECT).in_("id", account_ids).execute()
+        
+        by_id = {row["id"]: _shape_account(row) for row in (result.data or [])}
+        return {
+            "accounts": [by_id[account_id] for account_id in account_ids if account_id in by_id],
+            "missing": [account_id for account_id in account_ids if account_id not in by_id]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting accounts: {str(e)}")
+
 @router.get("/{account_id}")
 async def get_account(account_id: str):
     """Get account by ID"""
@@ -162,33 +275,12 @@ async def get_account(account_id: str):
         raise HTTPException(status_code=404, detail="Account not found. Supabase not configured.")
     
     try:
-        result = supabase.table("accounts").select("*").eq("id", account_id).execute()
+        result = await supabase.table("accounts").select(ACCOUNT_DETAIL_SELECT).eq("id", account_id).execute()
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Account not found")
         
-        account = result.data[0]
-        
-        # Load related data based on account type
-        if account["type"] == "joint":
-            members = supabase.table("joint_account_members").select("*").eq("account_id", account_id).execute()
-            account["members"] = members.data or []
-        
-        if account["type"] == "business":
-            business = supabase.table("business_accounts").select("*").eq("account_id", account_id).execute()
-            if business.data:
-                account["business_details"] = business.data[0]
-        
-        if account["type"] == "sub" or account.get("parent_id"):
-            sub_accounts = supabase.table("sub_accounts").select("*").eq("parent_account_id", account_id).execute()
-            account["sub_accounts"] = sub_accounts.data or []
-        
-        # Load balance
-        balance = supabase.table("account_balances").select("*").eq("account_id", account_id).execute()
-        if balance.data:
-            account["balance"] = balance.data[0]
-        
-        return {"account": account}
+        return {"account": _shape_account(result.data[0])}
     except HTTPException:
         raise
     except Exception as e:
@@ -215,7 +307,7 @@ async def update_account(account_id: str, account: AccountUpdate):
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        result = supabase.table("accounts").update(update_data).eq("id", account_id).execute()
+        result = await supabase.table("accounts").update(update_data).eq("id", account_id).execute()
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Account not found")
@@ -232,7 +324,7 @@ async def delete_account(account_id: str):
     require_supabase()
     
     try:
-        result = supabase.table("accounts").delete().eq("id", account_id).execute()
+        result = await supabase.table("accounts").delete().eq("id", account_id).execute()
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Account not found")
@@ -257,7 +349,7 @@ async def add_joint_member(account_id: str, member: JointAccountMember):
             "added_by": member.member_wallet  # Should be from auth context
         }
         
-        result = supabase.table("joint_account_members").insert(member_data).execute()
+        result = await supabase.table("joint_account_members").insert(member_data).execute()
         
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to add member")
@@ -272,7 +364,7 @@ async def remove_joint_member(account_id: str, member_wallet: str):
     require_supabase()
     
     try:
-        result = supabase.table("joint_account_members").delete().eq("account_id", account_id).eq("member_wallet", member_wallet).execute()
+        result = await supabase.table("joint_account_members").delete().eq("account_id", account_id).eq("member_wallet", member_wallet).execute()
         
         return {"message": "Member removed successfully"}
     except Exception as e:
@@ -286,7 +378,7 @@ async def set_business_details(account_id: str, details: BusinessAccountDetails)
     
     try:
         # Check if account exists and is business type
-        account = supabase.table("accounts").select("*").eq("id", account_id).execute()
+        account = await supabase.table("accounts").select("*").eq("id", account_id).execute()
         if not account.data:
             raise HTTPException(status_code=404, detail="Account not found")
         
@@ -305,7 +397,7 @@ async def set_business_details(account_id: str, details: BusinessAccountDetails)
         }
         
         # Upsert business details
-        result = supabase.table("business_accounts").upsert(business_data, on_conflict="account_id").execute()
+        result = await supabase.table("business_accounts").upsert(business_data, on_conflict="account_id").execute()
         
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to set business details")
@@ -330,7 +422,7 @@ async def create_cluster(cluster: AccountClusterCreate):
             "account_ids": cluster.account_ids
         }
         
-        result = supabase.table("account_clusters").insert(cluster_data).execute()
+        result = await supabase.table("account_clusters").insert(cluster_data).execute()
         
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create cluster")
@@ -339,30 +431,13 @@ async def create_cluster(cluster: AccountClusterCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating cluster: {str(e)}")
 
-@router.get("/clusters")
-async def list_clusters(owner_wallet: Optional[str] = Query(None)):
-    """List account clusters"""
-    require_supabase()
-    
-    try:
-        query = supabase.table("account_clusters").select("*")
-        
-        if owner_wallet:
-            query = query.eq("owner_wallet", owner_wallet)
-        
-        result = query.order("created_at", desc=True).execute()
-        
-        return {"clusters": result.data or []}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error listing clusters: {str(e)}")
-
 @router.delete("/clusters/{cluster_id}")
 async def delete_cluster(cluster_id: str):
     """Delete an account cluster"""
     require_supabase()
     
     try:
-        result = supabase.table("account_clusters").delete().eq("id", cluster_id).execute()
+        result = await supabase.table("account_clusters").delete().eq("id", cluster_id).execute()
         
         return {"message": "Cluster deleted successfully"}
     except Exception as e:
@@ -381,7 +456,7 @@ async def link_sub_account(link: SubAccountLink):
             "relationship_type": link.relationship_type
         }
         
-        result = supabase.table("sub_accounts").insert(link_data).execute()
+        result = await supabase.table("sub_accounts").insert(link_data).execute()
         
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to link sub-account")
@@ -396,19 +471,184 @@ async def get_sub_accounts(account_id: str):
     require_supabase()
     
     try:
-        result = supabase.table("sub_accounts").select("*, child_account:accounts!sub_accounts_child_account_id_fkey(*)").eq("parent_account_id", account_id).execute()
+        result = await supabase.table("sub_accounts").select("*, child_account:accounts!sub_accounts_child_account_id_fkey(*)").eq("parent_account_id", account_id).execute()
         
         return {"sub_accounts": result.data or []}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting sub-accounts: {str(e)}")
 
+# Account hierarchies (parent_id and sub_accounts links, walked by the account_subtree function)
+MAX_SUBTREE_DEPTH = 32
+BALANCE_FIELDS = ("xbgl_balance", "chaos_balance", "sc_balance", "avax_balance")
+
+async def _load_subtree(root_ids: List[str], max_depth: int) -> List[Dict[str, Any]]:
+    """Every account under root_ids with its own balances, in one query"""
+    result = await supabase.rpc("account_subtree", {"p_roots": root_ids, "p_max_depth": max_depth}, idempotent=True).execute()
+    return result.data or []
+
+def _roll_up(nodes: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Balances of each node plus everything below it"""
+    totals = {node["account_id"]: {field: float(node.get(field) or 0) for field in BALANCE_FIELDS} for node in nodes}
+    # Deepest first, so each child is complete before it is added to its parent
+    for node in sorted(nodes, key=lambda n: n["depth"], reverse=True):
+        parent = node.get("parent_account_id")
+        if parent in totals:
+            for field in BALANCE_FIELDS:
+                totals[parent][field] += totals[node["account_id"]][field]
+    return totals
+
+def _nest(nodes: List[Dict[str, Any]], root_id: str) -> Optional[Dict[str, Any]]:
+    by_id = {node["account_id"]: {**node, "children": []} for node in nodes}
+    for node in by_id.values():
+        parent = by_id.get(node.get("parent_account_id"))
+        if parent is not None and node["account_id"] != root_id:
+            parent["children"].append(node)
+    return by_id.get(root_id)
+
+@router.get("/{account_id}/subtree")
+async def get_account_subtree(
+    account_id: str,
+    max_depth: int = Query(MAX_SUBTREE_DEPTH, ge=1, le=MAX_SUBTREE_DEPTH),
+    nested: bool = Query(False, description="Return a tree instead of a flat list")
+):
+    """Get every account below an account, each with balances rolled up from its own subtree"""
+    require_supabase()
+    
+    try:
+        nodes = await _load_subtree([account_id], max_depth)
+        if not nodes:
+            raise HTTPException(status_code=404, detail="Account not found")
+        
+        rollups = _roll_up(nodes)
+        for node in nodes:
+            node["rollup"] = rollups[node["account_id"]]
+        
+        response = {
+            "account_id": account_id,
+            "count": len(nodes),
+            "depth": max(node["depth"] for node in nodes)
+        }
+        if nested:
+            response["tree"] = _nest(nodes, account_id)
+        else:
+            response["accounts"] = nodes
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting account subtree: {str(e)}")
+
+@router.get("/{account_id}/subtree/balances")
+async def get_account_subtree_balances(
+    account_id: str,
+    max_depth: int = Query(MAX_SUBTREE_DEPTH, ge=1, le=MAX_SUBTREE_DEPTH)
+):
+    """Get the combined balances of an account and everything below it"""
+    require_supabase()
+    
+    try:
+        nodes = await _load_subtree([account_id], max_depth)
+        if not nodes:
+            raise HTTPException(status_code=404, detail="Account not found")
+        
+        return {
+            "account_id": account_id,
+            "accounts": len(nodes),
+            "depth": max(node["depth"] for node in nodes),
+            "balances": _roll_up(nodes)[account_id]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting subtree balances: {str(e)}")
+
+async def _onchain_balances(nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Native and CSN balances of every account's wallet, read in one batched RPC round"""
+    snapshot = await asyncio.to_thread(fetch_wallet_balances, AVALANCHE_RPC, [node["wallet_address"] for node in nodes])
+    by_wallet = {address.lower(): balance for address, balance in snapshot.wallets.items()}
+    
+    members = []
+    for node in nodes:
+        balance = by_wallet.get((node.get("wallet_address") or "").lower())
+        members.append({
+            "account_id": node["account_id"],
+            "name": node.get("name"),
+            "type": node.get("type"),
+            "depth": node.get("depth"),
+            "wallet_address": node.get("wallet_address"),
+            "native": format_units(balance.native_wei) if balance and balance.native_wei is not None else None,
+            "csn": format_units(balance.csn_raw, snapshot.csn_decimals) if balance and balance.csn_raw is not None else None
+        })
+    
+    # Each wallet counts once even if several accounts share it
+    native_total = sum(balance.native_wei or 0 for balance in snapshot.wallets.values())
+    # Wallets whose native balance could not be read are left out of the total
+    unread = sum(1 for balance in snapshot.wallets.values() if balance.native_wei is None)
+    csn_total = sum(balance.csn_raw or 0 for balance in snapshot.wallets.values())
+    return {
+        "block_number": snapshot.block_number,
+        "members": members,
+        "totals": {
+            "wallets": len(snapshot.wallets),
+            "unread_wallets": unread,
+            "native": format_units(native_total),
+            "csn": format_units(csn_total, snapshot.csn_decimals)
+        }
+    }
+
+@router.get("/{account_id}/subtree/onchain-balances")
+async def get_account_onchain_balances(
+    account_id: str,
+    max_depth: int = Query(MAX_SUBTREE_DEPTH, ge=1, le=MAX_SUBTREE_DEPTH)
+):
+    """Get live native and CSN balances of an account (joint, business, ...) and all its sub-accounts"""
+    require_supabase()
+    
+    try:
+        nodes = await _load_subtree([account_id], max_depth)
+        if not nodes:
+            raise HTTPException(status_code=404, detail="Account not found")
+        
+        return {"account_id": account_id, **await _onchain_balances(nodes)}
+    except HTTPException:
+        raise
+    except RpcBatchError as e:
+        raise HTTPException(status_code=503, detail=f"RPC unavailable: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting on-chain balances: {str(e)}")
+
+@router.get("/clusters/{cluster_id}/onchain-balances")
+async def get_cluster_onchain_balances(
+    cluster_id: str,
+    max_depth: int = Query(MAX_SUBTREE_DEPTH, ge=1, le=MAX_SUBTREE_DEPTH)
+):
+    """Get live native and CSN balances of a cluster's accounts and their sub-accounts, with totals"""
+    require_supabase()
+    
+    try:
+        result = await supabase.table("account_clusters").select("id, name, account_ids").eq("id", cluster_id).execute()
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Cluster not found")
+        cluster = result.data[0]
+        
+        account_ids = cluster.get("account_ids") or []
+        nodes = await _load_subtree(account_ids, max_depth) if account_ids else []
+        
+        return {"cluster_id": cluster_id, "name": cluster.get("name"), **await _onchain_balances(nodes)}
+    except HTTPException:
+        raise
+    except RpcBatchError as e:
+        raise HTTPException(status_code=503, detail=f"RPC unavailable: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting cluster balances: {str(e)}")
+
 @router.delete("/sub-accounts/{link_id}")
 async def unlink_sub_account(link_id: str):
     """Unlink a sub-account"""
     require_supabase()
     
     try:
-        result = supabase.table("sub_accounts").delete().eq("id", link_id).execute()
+        result = await supabase.table("sub_accounts").delete().eq("id", link_id).execute()
         
         return {"message": "Sub-account unlinked successfully"}
     except Exception as e:
@@ -1,18 +1,24 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import services (works when run from backend directory with uvicorn)
 from services.alchemy_service import get_wallet_nfts, get_wallet_balance
-from services.supabase_service import upsert_plot, get_plots_for_wallet
+from services.supabase_service import upsert_plot, upsert_plots, get_plots_for_wallet
+from services.supabase_async import close_supabase
 
 # Import contract API (works when run from backend directory)
 from contract_api import router as contract_router
 from economy_api import router as economy_router
+from economy_engine import get_economy_engine
 from npc_api import router as npc_router
 from city_api import router as city_router
 from governance_api import router as governance_router
 from portfolio_api import router as portfolio_router
+from portfolio_projection import shutdown_projection_pool
 from managers_api import router as managers_router
+from jobs_api import router as jobs_router
+from job_runner import get_job_manager, JobStep
 try:
     from nanofiber_api import router as nanofiber_router
     NANOFIBER_API_AVAILABLE = True
@@ -74,16 +80,35 @@ except ImportError as e:
 # Import CLI detector and subnet interaction
 try:
     from cli_detector import get_cli_detector, detect_tools
-    from subnet_interaction import create_subnet_interactor, auto_detect_and_interact
+    from subnet_interaction import create_subnet_interactor, auto_detect_and_interact, get_interactor_pool
     CLI_DETECTOR_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: CLI detector not available: {e}")
     CLI_DETECTOR_AVAILABLE = False
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Scheduled economy ticks (ECONOMY_TICK_INTERVAL > 0)
+    economy_engine = get_economy_engine()
+    if economy_engine is not None:
+        economy_engine.start()
+    yield
+    if economy_engine is not None:
+        await economy_engine.stop()
+    # Write out buffered balance refreshes before the client goes away
+    if CELESTIAL_FORGE_AVAILABLE:
+        from celestial_forge_api import close_balance_writers
+        await close_balance_writers()
+    # Stop projection worker processes
+    shutdown_projection_pool()
+    # Release pooled Supabase connections
+    await close_supabase()
+
 app = FastAPI(
     title="Sarakt Land Registry API",
     description="Backend API for Sarakt Land Registry and Contract Management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware - allow all origins in development
@@ -104,6 +129,7 @@ app.include_router(city_router)
 app.include_router(governance_router)
 app.include_router(portfolio_router)
 app.include_router(managers_router)
+app.include_router(jobs_router)
 # Include nanofiber router if available
 if NANOFIBER_API_AVAILABLE and nanofiber_router:
     app.include_router(nanofiber_router)
@@ -141,6 +167,7 @@ async def root():
         "wallet": "/wallet",
         "plots": "/plots",
         "nanofiber": "/nanofiber",
+        "jobs": "/jobs",
     }
     
     if AVALANCHE_CLI_AVAILABLE:
@@ -172,17 +199,38 @@ async def wallet_balance(address: str):
 async def sync_nfts(address: str):
     """Sync NFTs from Alchemy (legacy endpoint)"""
     nfts = await get_wallet_nfts(address)
-    for nft in nfts:
-        token = nft.get("tokenId")
-        meta = nft.get("rawMetadata", {})
-        upsert_plot(address, token, meta)
-    return {"synced": len(nfts)}
+    result = await upsert_plots(
+        address,
+        ((nft.get("tokenId"), nft.get("rawMetadata") or {}) for nft in nfts)
+    )
+    return {"synced": result["upserted"], "failed": result["failed"]}
 
 @app.post("/plots/save")
 async def save_plot_data(request: dict):
-    """Save plot purchase data to Supabase"""
+    """
+    Save plot purchase data to Supabase
+
+    Accepts a single plot ({wallet, token_id, metadata}) or a batch
+    ({wallet, plots: [{token_id, metadata}, ...]}).
+    """
     try:
         wallet = request.get("wallet") or request.get("address")
+        plots = request.get("plots")
+
+        if plots is not None:
+            if not wallet or not isinstance(plots, list):
+                raise HTTPException(status_code=400, detail="wallet and a plots list are required")
+            result = await upsert_plots(
+                wallet,
+                ((plot.get("token_id") or plot.get("plotId"), plot.get("metadata") or {}) for plot in plots)
+            )
+            return {
+                "success": not result["failed"],
+                "message": f"Saved {result['upserted']} plot(s)",
+                "saved": result["upserted"],
+                "failed": result["failed"]
+            }
+
         token_id = request.get("token_id") or request.get("plotId")
         metadata = request.get("metadata") or {}
         
@@ -190,7 +238,7 @@ async def save_plot_data(request: dict):
             raise HTTPException(status_code=400, detail="wallet and token_id are required")
         
         # Save to Supabase
-        upsert_plot(wallet, str(token_id), metadata)
+        await upsert_plot(wallet, str(token_id), metadata)
         
         return {"success": True, "message": "Plot data saved"}
     except HTTPException:
@@ -200,8 +248,8 @@ async def save_plot_data(request: dict):
         return {"success": False, "message": f"Plot data not saved (backend may not be configured): {str(e)}"}
 
 @app.get("/plots/{address}")
-def plots(address: str):
-    return {"plots": get_plots_for_wallet(address)}
+async def plots(address: str):
+    return {"plots": await get_plots_for_wallet(address)}
 
 
 # CLI Detection and Subnet Interaction endpoints
@@ -234,6 +282,23 @@ if CLI_DETECTOR_AVAILABLE:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
+    @cli_router.get("/interactors")
+    async def get_interactor_pool_stats():
+        """Show pooled subnet interactors and cache hit counts"""
+        return {
+            "success": True,
+            "pool": get_interactor_pool().stats()
+        }
+    
+    @cli_router.post("/interactors/refresh")
+    async def refresh_interactors(subnet_name: str = None):
+        """Force configuration rediscovery for one subnet, or all subnets"""
+        get_interactor_pool().invalidate(subnet_name)
+        return {
+            "success": True,
+            "pool": get_interactor_pool().stats()
+        }
+    
     @cli_router.get("/subnet/list")
     async def list_subnets():
         """List available subnets"""
@@ -277,12 +342,27 @@ if CLI_DETECTOR_AVAILABLE:
             raise HTTPException(status_code=500, detail=str(e))
     
     @cli_router.post("/subnet/{subnet_name}/deploy")
-    async def deploy_to_subnet(subnet_name: str):
+    async def deploy_to_subnet(
+        subnet_name: str,
+        background: bool = Query(False, description="Run as a background job and return its ID immediately")
+    ):
         """Deploy contracts to a subnet using detected tools"""
         try:
             interactor = create_subnet_interactor(subnet_name)
             project_root = Path(__file__).parent.parent
             
+            if background:
+                try:
+                    steps = interactor.build_deploy_steps(project_root)
+                except RuntimeError as e:
+                    return {"success": False, "error": str(e)}
+                job = get_job_manager().submit("contract_deploy", steps, subnet=subnet_name)
+                return {
+                    "success": True,
+                    "job": job.to_dict(),
+                    "message": f"Deployment to '{subnet_name}' started. Follow it at /jobs/{job.id}/logs"
+                }
+            
             # Compile first
             compile_result = interactor.compile_contracts(project_root)
             if not compile_result.get("success"):
@@ -309,9 +389,21 @@ if CLI_DETECTOR_AVAILABLE:
             raise HTTPException(status_code=500, detail=str(e))
     
     @cli_router.post("/network/{network_name}/run")
-    async def run_network(network_name: str):
+    async def run_network(
+        network_name: str,
+        background: bool = Query(False, description="Run as a background job and return its ID immediately")
+    ):
         """Run a network using 'avalanche network run'"""
         try:
+            if background:
+                argv = get_cli_detector().avalanche_command_argv("network run", [network_name])
+                job = get_job_manager().submit("network_run", [JobStep(argv, timeout=1800, label="network run")], subnet=network_name)
+                return {
+                    "success": True,
+                    "job": job.to_dict(),
+                    "message": f"Network '{network_name}' starting. Follow it at /jobs/{job.id}/logs"
+                }
+            
             interactor = create_subnet_interactor(network_name)
             result = interactor.network_run(network_name)
             return result
@@ -7,10 +7,17 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 import subprocess
 import json
-import re
 import os
 from pathlib import Path
 
+from describe_parser import (
+    parse_blockchain_describe,
+    parse_subnet_describe,
+    parse_network_status,
+    describe_from_sidecar,
+    load_sidecar,
+)
+
 router = APIRouter(prefix="/avalanche-info", tags=["avalanche-info"])
 
 def get_avalanche_cli_home() -> Path:
@@ -19,6 +26,13 @@ def get_avalanche_cli_home() -> Path:
 
 def discover_rpc_from_blockchain_describe(subnet_name: str = "ChaosStarNetwork") -> Optional[str]:
     """Discover RPC URL from blockchain describe command output"""
+    # The CLI's sidecar.json holds the same data without spawning a subprocess
+    sidecar = load_sidecar(subnet_name, get_avalanche_cli_home())
+    if sidecar:
+        rpc_urls = describe_from_sidecar(sidecar)["rpc_urls"]
+        if "localhost" in rpc_urls:
+            return rpc_urls["localhost"]
+
     try:
         result = subprocess.run(
             ["avalanche", "blockchain", "describe", subnet_name],
@@ -68,322 +82,6 @@ def get_rpc_url_for_balance() -> str:
     # Fallback to Chaos Star Network RPC (never use port 9650)
     return CHAOSSTARNETWORK_RPC
 
-def parse_blockchain_describe(output: str) -> Dict[str, Any]:
-    """Parse blockchain describe output into structured data"""
-    parsed = {
-        "name": "",
-        "vm_id": "",
-        "vm_version": "",
-        "validation": "",
-        "networks": {},
-        "icm": {},
-        "token": {},
-        "initial_allocation": [],
-        "rpc_urls": {},
-        "primary_nodes": [],
-        "l1_nodes": [],
-        "precompile_configs": {},
-        "wallet_connection": {}
-    }
-    
-    lines = output.split('\n')
-    current_section = None
-    in_rpc_section = False
-    in_primary_nodes = False
-    in_l1_nodes = False
-    in_precompile = False
-    in_wallet = False
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('+'):
-            # Check for section headers
-            if 'RPC URLS' in line.upper():
-                in_rpc_section = True
-                in_primary_nodes = False
-                in_l1_nodes = False
-                in_precompile = False
-                in_wallet = False
-            elif 'PRIMARY NODES' in line.upper():
-                in_primary_nodes = True
-                in_rpc_section = False
-                in_l1_nodes = False
-                in_precompile = False
-                in_wallet = False
-            elif 'L1 NODES' in line.upper():
-                in_l1_nodes = True
-                in_rpc_section = False
-                in_primary_nodes = False
-                in_precompile = False
-                in_wallet = False
-            elif 'PRECOMPILE' in line.upper() and 'CONFIGS' in line.upper():
-                in_precompile = True
-                in_rpc_section = False
-                in_primary_nodes = False
-                in_l1_nodes = False
-                in_wallet = False
-            elif 'WALLET CONNECTION' in line.upper():
-                in_wallet = True
-                in_rpc_section = False
-                in_primary_nodes = False
-                in_l1_nodes = False
-                in_precompile = False
-            continue
-        
-        # Parse RPC URLs
-        if in_rpc_section and '|' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                location = parts[0]
-                rpc_url = parts[1] if len(parts) > 1 else ""
-                if rpc_url and 'http' in rpc_url:
-                    parsed["rpc_urls"][location.lower()] = rpc_url
-        
-        # Parse Primary Nodes
-        if in_primary_nodes and '|' in line and 'NAME' not in line.upper() and 'NODE ID' not in line.upper():
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 3:
-                node = {
-                    "name": parts[0],
-                    "node_id": parts[1],
-                    "endpoint": parts[2] if len(parts) > 2 else ""
-                }
-                parsed["primary_nodes"].append(node)
-        
-        # Parse L1 Nodes
-        if in_l1_nodes and '|' in line and 'NAME' not in line.upper() and 'NODE ID' not in line.upper():
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 3:
-                node = {
-                    "name": parts[0],
-                    "node_id": parts[1],
-                    "endpoint": parts[2] if len(parts) > 2 else ""
-                }
-                parsed["l1_nodes"].append(node)
-        
-        # Parse Precompile Configs
-        if in_precompile and '|' in line and 'PRECOMPILE' not in line.upper() and 'ADMIN' not in line.upper():
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 4:
-                precompile_name = parts[0]
-                if precompile_name not in parsed["precompile_configs"]:
-                    parsed["precompile_configs"][precompile_name] = {}
-                parsed["precompile_configs"][precompile_name] = {
-                    "admin_addresses": parts[1] if parts[1] != "n/a" else None,
-                    "manager_addresses": parts[2] if parts[2] != "n/a" else None,
-                    "enabled_addresses": parts[3] if parts[3] != "n/a" else None
-                }
-        
-        # Parse Wallet Connection Info
-        if in_wallet and '|' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                key = parts[0].lower().replace(' ', '_')
-                value = parts[1] if len(parts) > 1 else ""
-                parsed["wallet_connection"][key] = value
-        
-        # Parse main blockchain info
-        if '| Name' in line:
-            parts = line.split('|')
-            if len(parts) >= 3:
-                parsed["name"] = parts[2].strip()
-        elif '| VM ID' in line:
-            parts = line.split('|')
-            if len(parts) >= 3:
-                parsed["vm_id"] = parts[2].strip()
-        elif '| VM Version' in line:
-            parts = line.split('|')
-            if len(parts) >= 3:
-                parsed["vm_version"] = parts[2].strip()
-        elif '| Validation' in line:
-            parts = line.split('|')
-            if len(parts) >= 3:
-                parsed["validation"] = parts[2].strip()
-        
-        # Parse network sections (Local Network, Fuji, etc.)
-        if '| Local Network' in line or '| Fuji' in line or '| Mainnet' in line:
-            network_name = line.split('|')[1].strip()
-            if network_name not in parsed["networks"]:
-                parsed["networks"][network_name] = {}
-            current_section = ("network", network_name)
-        elif current_section and current_section[0] == "network":
-            if '|' in line:
-                parts = [p.strip() for p in line.split('|') if p.strip()]
-                if len(parts) >= 2:
-                    key = parts[0]
-                    value = parts[1] if len(parts) > 1 else ""
-                    parsed["networks"][current_section[1]][key] = value
-        
-        # Parse ICM section
-        if 'ICM' in line and ('Messenger' in line or 'Registry' in line):
-            current_section = ("icm", None)
-        elif current_section and current_section[0] == "icm":
-            if '|' in line:
-                parts = [p.strip() for p in line.split('|') if p.strip()]
-                if len(parts) >= 2:
-                    key = parts[0].replace('Address', '').replace('ICM ', '').strip().lower()
-                    value = parts[1] if len(parts) > 1 else ""
-                    if 'messenger' in key:
-                        parsed["icm"]["messenger_address"] = value
-                    elif 'registry' in key:
-                        parsed["icm"]["registry_address"] = value
-        
-        # Parse Token section
-        if '| TOKEN' in line or 'TOKEN' in line:
-            current_section = ("token", None)
-        elif current_section and current_section[0] == "token":
-            if '|' in line:
-                parts = [p.strip() for p in line.split('|') if p.strip()]
-                if len(parts) >= 2:
-                    key = parts[0].lower().replace(' ', '_')
-                    value = parts[1] if len(parts) > 1 else ""
-                    parsed["token"][key] = value
-    
-    return parsed
-
-def parse_subnet_describe(output: str) -> Dict[str, Any]:
-    """Parse subnet describe output into structured data"""
-    result = {
-        "name": None,
-        "vm_id": None,
-        "vm_version": None,
-        "validation": None,
-        "networks": {},
-        "icm": {},
-        "token": {},
-        "initial_allocation": []
-    }
-    
-    lines = output.split('\n')
-    current_section = None
-    current_network = None
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('+') or line.startswith('|') and '---' in line:
-            continue
-        
-        # Extract name
-        if '| Name' in line or 'CHAOSSTARNETWORK' in line.upper() or 'NETHER' in line.upper():
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                name = parts[-1].strip()
-                if name and name not in ['Name', 'CHAOSSTARNETWORK', 'NETHER']:
-                    result["name"] = name
-        
-        # Extract VM ID
-        if 'VM ID' in line or 'VMID' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                result["vm_id"] = parts[-1].strip()
-        
-        # Extract VM Version
-        if 'VM Version' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                result["vm_version"] = parts[-1].strip()
-        
-        # Extract Validation
-        if 'Validation' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                result["validation"] = parts[-1].strip()
-        
-        # Extract network info
-        if 'Fuji' in line or 'Local Network' in line:
-            network_name = "Fuji" if "Fuji" in line else "Local"
-            current_network = network_name
-            result["networks"][network_name] = {}
-        
-        if current_network and ('ChainID' in line or 'SubnetID' in line or 'BlockchainID' in line or 'RPC Endpoint' in line):
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                key = parts[0].strip()
-                value = parts[-1].strip()
-                if key and value:
-                    result["networks"][current_network][key] = value
-        
-        # Extract ICM info
-        if 'ICM Messenger Address' in line or 'ICM Registry Address' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                key = parts[0].strip().replace(' Address', '')
-                value = parts[-1].strip()
-                if 'Messenger' in key:
-                    result["icm"]["messenger_address"] = value
-                elif 'Registry' in key:
-                    result["icm"]["registry_address"] = value
-        
-        # Extract token info
-        if 'Token Name' in line or 'Token Symbol' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                key = parts[0].strip().replace('Token ', '').lower()
-                value = parts[-1].strip()
-                result["token"][key] = value
-    
-    return result
-
-def parse_network_status(output: str) -> Dict[str, Any]:
-    """Parse network status output into structured data"""
-    result = {
-        "is_up": False,
-        "nodes": 0,
-        "custom_vms": 0,
-        "network_healthy": False,
-        "custom_vms_healthy": False,
-        "rpc_urls": {},
-        "primary_nodes": [],
-        "l1_nodes": []
-    }
-    
-    lines = output.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        
-        if 'Network is Up:' in line:
-            result["is_up"] = True
-        
-        if 'Number of Nodes:' in line:
-            match = re.search(r'(\d+)', line)
-            if match:
-                result["nodes"] = int(match.group(1))
-        
-        if 'Number of Custom VMs:' in line:
-            match = re.search(r'(\d+)', line)
-            if match:
-                result["custom_vms"] = int(match.group(1))
-        
-        if 'Network Healthy:' in line:
-            result["network_healthy"] = 'true' in line.lower()
-        
-        if 'Custom VMs Healthy:' in line:
-            result["custom_vms_healthy"] = 'true' in line.lower()
-        
-        # Extract RPC URLs
-        if 'Localhost' in line and 'http' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 2:
-                result["rpc_urls"]["localhost"] = parts[-1].strip()
-        
-        # Extract node info
-        if 'NodeID-' in line:
-            parts = [p.strip() for p in line.split('|') if p.strip()]
-            if len(parts) >= 3:
-                node_info = {
-                    "name": parts[0] if len(parts) > 0 else "",
-                    "node_id": parts[1] if len(parts) > 1 else "",
-                    "endpoint": parts[2] if len(parts) > 2 else ""
-                }
-                if 'PRIMARY' in output.upper() or 'node1' in line.lower() or 'node2' in line.lower():
-                    if 'PRIMARY' in output.upper():
-                        result["primary_nodes"].append(node_info)
-                    else:
-                        result["l1_nodes"].append(node_info)
-    
-    return result
-
 @router.get("/subnets")
 async def list_subnets():
     """List all subnets using 'avalanche network status' command"""
@@ -937,9 +635,9 @@ async def get_all_wallet_balances():
         
         # 2. Get all accounts from database
         try:
-            from services.supabase_service import supabase
+            from services.supabase_async import supabase
             if supabase:
-                accounts_result = supabase.table("accounts").select("id, name, wallet_address, type").execute()
+                accounts_result = await supabase.table("accounts").select("id, name, wallet_address, type").execute()
                 
                 if accounts_result.data:
                     for account in accounts_result.data:
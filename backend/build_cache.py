@@ -0,0 +1,278 @@
+"""
+Incremental Forge Build Cache
+Skips 'forge build' and ABI extraction when contract sources are unchanged, and
+shares a single build between concurrent deploy requests
+"""
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+
+try:
+    from .cli_detector import get_cli_detector
+    from .job_runner import JobStep
+except ImportError:
+    from cli_detector import get_cli_detector
+    from job_runner import JobStep
+
+
+# Written to the forge output directory after a successful build
+BUILD_STAMP_FILE = ".build-hash"
+# Written to an ABI export directory once its ABIs match a build
+ABI_STAMP_FILE = ".abi-hash"
+
+# Files outside the sources directory that change compilation output
+_CONFIG_FILES = ("foundry.toml", "foundry.lock", "remappings.txt")
+
+
+@dataclass
+class BuildResult:
+    """Outcome of BuildCache.ensure_built"""
+    success: bool
+    cached: bool
+    source_hash: str
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+
+
+class BuildCache:
+    """Content-hash build cache for one Foundry project"""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self.sources_dir = self.project_root / "src" / "contracts"
+        self.out_dir = self.project_root / "out"
+        self.lib_dir = self.project_root / "lib"
+        self._build_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, sha256) so unchanged files are not re-read
+        self._file_digests: Dict[Path, Tuple[int, int, str]] = {}
+        # contract name -> (build hash, abi)
+        self._abis: Dict[str, Tuple[str, Optional[List]]] = {}
+        # contract name -> (build hash, creation bytecode)
+        self._bytecodes: Dict[str, Tuple[str, str]] = {}
+
+    def source_hash(self) -> str:
+        """Hash of everything that affects compilation output"""
+        digest = hashlib.sha256()
+
+        if self.sources_dir.exists():
+            for path in sorted(self.sources_dir.rglob("*.sol")):
+                digest.update(str(path.relative_to(self.project_root)).encode())
+                digest.update(self._file_digest(path).encode())
+
+        for name in _CONFIG_FILES:
+            path = self.project_root / name
+            if path.exists():
+                digest.update(name.encode())
+                digest.update(self._file_digest(path).encode())
+
+        # Library revisions (remapped imports resolve into lib/)
+        if self.lib_dir.exists():
+            for lib in sorted(p for p in self.lib_dir.iterdir() if p.is_dir()):
+                digest.update(lib.name.encode())
+                digest.update(self._lib_revision(lib).encode())
+
+        return digest.hexdigest()
+
+    def built_hash(self) -> Optional[str]:
+        """Source hash recorded by the last successful build, if any"""
+        stamp = self.out_dir / BUILD_STAMP_FILE
+        try:
+            return stamp.read_text().strip()
+        except OSError:
+            return None
+
+    def is_fresh(self, source_hash: Optional[str] = None) -> bool:
+        """True when out/ already holds artifacts for the current sources"""
+        return (source_hash or self.source_hash()) == self.built_hash()
+
+    def ensure_built(self, force: bool = False, timeout: int = 120) -> BuildResult:
+        """
+        Run 'forge build' unless the current sources were already built
+
+        Concurrent callers share one build: the first runs forge, the others wait
+        for it and then see a fresh stamp.
+
+        Raises:
+            subprocess.TimeoutExpired: if forge does not finish within timeout
+        """
+        source_hash = self.source_hash()
+        if not force and self.is_fresh(source_hash):
+            return BuildResult(success=True, cached=True, source_hash=source_hash)
+
+        with self._build_lock:
+            # Another request may have built while we waited
+            source_hash = self.source_hash()
+            if not force and self.is_fresh(source_hash):
+                return BuildResult(success=True, cached=True, source_hash=source_hash)
+
+            start = time.monotonic()
+            result = get_cli_detector().execute_forge_command(
+                "build",
+                cwd=self.project_root,
+                timeout=timeout
+            )
+            duration = time.monotonic() - start
+
+            if result.returncode != 0:
+                return BuildResult(
+                    success=False,
+                    cached=False,
+                    source_hash=source_hash,
+                    stdout=result.stdout,
+                    stderr=result.stderr,
+                    duration=duration
+                )
+
+            self.record_build(source_hash)
+            return BuildResult(
+                success=True,
+                cached=False,
+                source_hash=source_hash,
+                stdout=result.stdout,
+                stderr=result.stderr,
+                duration=duration
+            )
+
+    def compile_step(self, timeout: int = 120) -> Optional[JobStep]:
+        """
+        'forge build' as a background job step, or None when the build is fresh
+
+        The step runs under the same lock as ensure_built, so concurrent deploys
+        share one build: it re-checks freshness once it holds the lock, and
+        records the stamp of the sources hashed at that point when forge succeeds.
+        """
+        if self.is_fresh():
+            return None
+        building = {}
+
+        def already_built() -> bool:
+            building["hash"] = self.source_hash()
+            return self.is_fresh(building["hash"])
+
+        return JobStep(
+            get_cli_detector().forge_command_argv("build"),
+            cwd=self.project_root,
+            timeout=timeout,
+            label="compile",
+            on_success=lambda: self.record_build(building["hash"]),
+            lock=self._build_lock,
+            skip_if=already_built
+        )
+
+    def record_build(self, source_hash: str):
+        """Mark out/ as built from source_hash (for builds run outside ensure_built)"""
+        self.out_dir.mkdir(exist_ok=True)
+        (self.out_dir / BUILD_STAMP_FILE).write_text(source_hash)
+        with self._lock:
+            self._abis.clear()
+            self._bytecodes.clear()
+
+    def get_abi(self, contract_name: str) -> Optional[List]:
+        """ABI from the compiled artifact, memoized until the next build"""
+        return self._artifact_field(self._abis, contract_name, lambda artifact: artifact.get("abi"))
+
+    def get_bytecode(self, contract_name: str) -> Optional[str]:
+        """Creation bytecode (0x-prefixed) from the compiled artifact, memoized until the next build"""
+        return self._artifact_field(
+            self._bytecodes,
+            contract_name,
+            lambda artifact: (artifact.get("bytecode") or {}).get("object")
+        )
+
+    def _artifact_field(self, memo: Dict, contract_name: str, extract):
+        build_hash = self.built_hash() or ""
+        with self._lock:
+            cached = memo.get(contract_name)
+            if cached and cached[0] == build_hash:
+                return cached[1]
+
+        artifact = self._read_artifact(contract_name)
+        value = extract(artifact) if artifact else None
+        if value is not None:
+            with self._lock:
+                memo[contract_name] = (build_hash, value)
+        return value
+
+    def abis_current(self, abi_dir: Path, variant: str = "") -> bool:
+        """True when abi_dir was exported from the current build"""
+        build_hash = self.built_hash()
+        if not build_hash:
+            return False
+        try:
+            return (abi_dir / ABI_STAMP_FILE).read_text().strip() == f"{build_hash}{variant}"
+        except OSError:
+            return False
+
+    def mark_abis_current(self, abi_dir: Path, variant: str = ""):
+        """Record that abi_dir holds ABIs exported from the current build"""
+        build_hash = self.built_hash()
+        if build_hash:
+            (abi_dir / ABI_STAMP_FILE).write_text(f"{build_hash}{variant}")
+
+    def _read_artifact(self, contract_name: str) -> Optional[Dict]:
+        # Try multiple paths for the artifact location
+        possible_paths = [
+            self.out_dir / contract_name / f"{contract_name}.sol" / f"{contract_name}.json",
+            self.out_dir / f"{contract_name}.sol" / f"{contract_name}.json",
+            self.out_dir / contract_name / f"{contract_name}.json",
+        ]
+
+        for abi_path in possible_paths:
+            if abi_path.exists():
+                try:
+                    with open(abi_path, 'r') as f:
+                        return json.load(f)
+                except Exception as e:
+                    print(f"Error reading artifact {abi_path}: {e}")
+                    continue
+
+        return None
+
+    def _file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        cached = self._file_digests.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        file_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._file_digests[path] = (stat.st_mtime_ns, stat.st_size, file_hash)
+        return file_hash
+
+    @staticmethod
+    def _lib_revision(lib: Path) -> str:
+        """Checked-out git revision of a library (submodule or plain clone)"""
+        git_path = lib / ".git"
+        try:
+            if git_path.is_file():
+                # Submodules point to their git dir: "gitdir: ../../.git/modules/<name>"
+                git_dir = (lib / git_path.read_text().split(":", 1)[1].strip()).resolve()
+            else:
+                git_dir = git_path
+            head = (git_dir / "HEAD").read_text().strip()
+            if head.startswith("ref:"):
+                ref_file = git_dir / head.split(":", 1)[1].strip()
+                if ref_file.exists():
+                    return ref_file.read_text().strip()
+            return head
+        except (OSError, IndexError):
+            return ""
+
+
+# Global instances, one per project root
+_build_caches: Dict[Path, BuildCache] = {}
+_build_caches_lock = threading.Lock()
+
+
+def get_build_cache(project_root: Path = None) -> BuildCache:
+    """Get or create the build cache for a project (defaults to the repository root)"""
+    root = Path(project_root or Path(__file__).parent.parent).resolve()
+    with _build_caches_lock:
+        if root not in _build_caches:
+            _build_caches[root] = BuildCache(root)
+        return _build_caches[root]
@@ -6,30 +6,73 @@ Uses subnet admin keys automatically discovered from Avalanche CLI configuration
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
+import asyncio
 import os
 import subprocess
 from pathlib import Path
 
 from subnet_interaction import create_subnet_interactor, is_avalanche_cli_available
 from cli_detector import get_cli_detector
+from job_runner import get_job_manager, JobStep
+from deploy_orchestrator import get_deployment_orchestrator, DEPLOY_MAX_PARALLEL
+from contract_status import probe_contracts, RpcBatchError
+from query_cache import get_celestial_cache
+from write_behind import WriteBehindBuffer
+from pagination import page_query, page_result, select_columns, total_count, project, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 # Import config to get admin keys (auto-loaded from subnet)
 from config import PRIVATE_KEY, ADMIN_PRIVATE_KEY, AVALANCHE_RPC, SUBNET_NAME
 
-# Import Supabase client for database queries
+# Import the async Supabase client for database queries
 try:
-    from supabase_client import supabase
-    SUPABASE_AVAILABLE = True
+    from services.supabase_async import supabase
+    SUPABASE_AVAILABLE = supabase is not None
 except ImportError:
-    try:
-        from supabase_client import supabase
-        SUPABASE_AVAILABLE = True
-    except ImportError:
-        SUPABASE_AVAILABLE = False
-        supabase = None
+    SUPABASE_AVAILABLE = False
+    supabase = None
 
 router = APIRouter(prefix="/celestial-forge", tags=["celestial-forge"])
 
+# Tables behind the cached star system / planet reads
+CELESTIAL_TABLES = ("star_systems", "planets")
+
+# Postgres function applying a batch of buffered balance refreshes, per table
+BALANCE_RPC = {
+    "star_systems": "apply_star_system_balances",
+    "planets": "apply_planet_balances",
+}
+_balance_writers: Dict[str, WriteBehindBuffer] = {}
+
+
+def get_balance_writer(table: str) -> WriteBehindBuffer:
+    """Write-behind buffer for native_balance refreshes of star_systems or planets"""
+    if table not in _balance_writers:
+        async def flush(rows):
+            # Sets absolute values, so repeating a batch the database already applied is harmless
+            await supabase.rpc(BALANCE_RPC[table], {
+                "p_rows": [{"id": row_id, **values} for row_id, values in rows]
+            }, idempotent=True).execute()
+            get_celestial_cache().invalidate(table)
+        _balance_writers[table] = WriteBehindBuffer(flush)
+    return _balance_writers[table]
+
+
+async def close_balance_writers():
+    """Flush buffered balance refreshes (call on application shutdown)"""
+    for writer in _balance_writers.values():
+        await writer.close()
+
+
+async def _read_native_balance(rpc_url: str, wallet: str) -> float:
+    from web3 import Web3
+
+    def read():
+        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        return float(w3.from_wei(w3.eth.get_balance(wallet), "ether"))
+
+    # web3's HTTP provider blocks; keep it off the event loop
+    return await asyncio.to_thread(read)
+
 
 # Helper functions for Sarakt Star System and planets
 def _get_default_sarakt_system() -> Dict[str, Any]:
@@ -82,41 +125,78 @@ def _get_default_planets(star_system_id: str) -> List[Dict[str, Any]]:
     ]
 
 
+# Resolved Sarakt Star System ID once seeding has succeeded in this process
+_sarakt_system_id: Optional[str] = None
+_sarakt_seed_lock = asyncio.Lock()
+
+
 async def _ensure_sarakt_system_exists() -> str:
-    """Ensure Sarakt Star System exists in database, return its ID"""
+    """
+    Ensure Sarakt Star System exists in database, return its ID
+    
+    Seeding runs once per process; later calls return the cached ID without
+    touching the database. A failed attempt is retried on the next call.
+    """
+    global _sarakt_system_id
+    if _sarakt_system_id is not None:
+        return _sarakt_system_id
     if not SUPABASE_AVAILABLE:
         return "sarakt-star-system"
     
-    try:
-        # Check if Sarakt Star System exists
-        response = supabase.table("star_systems").select("*").eq("name", "Sarakt Star System").execute()
+    async with _sarakt_seed_lock:
+        # Another request may have seeded while we waited
+        if _sarakt_system_id is not None:
+            return _sarakt_system_id
         
-        if response.data and len(response.data) > 0:
-            system_id = response.data[0]["id"]
-        else:
-            # Create Sarakt Star System
-            sarakt_system = _get_default_sarakt_system()
-            insert_response = supabase.table("star_systems").insert(sarakt_system).execute()
-            if insert_response.data and len(insert_response.data) > 0:
-                system_id = insert_response.data[0]["id"]
+        try:
+            # Check if Sarakt Star System exists
+            response = await supabase.table("star_systems").select("id").eq("name", "Sarakt Star System").limit(1).execute()
+            
+            if response.data and len(response.data) > 0:
+                system_id = response.data[0]["id"]
             else:
-                system_id = sarakt_system["id"]
-        
-        # Ensure planets exist
-        planets_response = supabase.table("planets").select("*").eq("star_system_id", system_id).execute()
-        existing_planet_names = {p.get("name") for p in (planets_response.data or [])}
-        
-        default_planets = _get_default_planets(system_id)
-        for planet in default_planets:
-            if planet.get("name") not in existing_planet_names:
-                try:
-                    supabase.table("planets").insert(planet).execute()
-                except Exception:
-                    pass  # Planet might already exist
-        
-        return system_id
-    except Exception:
-        return "sarakt-star-system"
+                # Create Sarakt Star System
+                sarakt_system = _get_default_sarakt_system()
+                insert_response = await supabase.table("star_systems").insert(sarakt_system).execute()
+                get_celestial_cache().invalidate("star_systems")
+                if insert_response.data and len(insert_response.data) > 0:
+                    system_id = insert_response.data[0]["id"]
+                else:
+                    system_id = sarakt_system["id"]
+            
+            # Ensure planets exist
+            planets_response = await supabase.table("planets").select("name").eq("star_system_id", system_id).execute()
+            existing_planet_names = {p.get("name") for p in (planets_response.data or [])}
+            
+            missing_planets = [
+                planet for planet in _get_default_planets(system_id)
+                if planet.get("name") not in existing_planet_names
+            ]
+            if missing_planets:
+                # Planets another worker seeded meanwhile are skipped; any other failure
+                # leaves the ID uncached so the next call retries
+                await supabase.table("planets").upsert(
+                    missing_planets, on_conflict="id", ignore_duplicates=True
+                ).execute()
+                get_celestial_cache().invalidate("planets")
+            
+            _sarakt_system_id = system_id
+            return system_id
+        except Exception:
+            return "sarakt-star-system"
+
+
+async def _load_sarakt_planet(planet_name: str) -> Dict[str, Any]:
+    """Database rows for a default Sarakt planet and its star system (cached)"""
+    async def load():
+        db_planet = await supabase.table("planets").select("*").eq("name", planet_name).execute()
+        db_system = await supabase.table("star_systems").select("*").eq("name", "Sarakt Star System").execute()
+        return {
+            "planet": db_planet.data[0] if db_planet.data else None,
+            "star_system": db_system.data[0] if db_system.data else None
+        }
+    
+    return await get_celestial_cache().aget_or_load(("planet", "sarakt", planet_name), load, CELESTIAL_TABLES)
 
 
 class TokenConfig(BaseModel):
@@ -454,7 +534,8 @@ async def spawn_star_system(request: StarSystemCreate, mock: Optional[bool] = Qu
                 }
                 
                 # Upsert star system
-                supabase.table("star_systems").upsert(star_system_data_db, on_conflict="name").execute()
+                await supabase.table("star_systems").upsert(star_system_data_db, on_conflict="name").execute()
+                get_celestial_cache().invalidate("star_systems")
             except Exception as db_error:
                 print(f"Warning: Could not save to database: {db_error}")
         
@@ -586,10 +667,16 @@ async def get_subnet_status(subnet_name: str):
 
 
 @router.post("/subnet/{subnet_name}/deploy")
-async def deploy_subnet(subnet_name: str):
+async def deploy_subnet(
+    subnet_name: str,
+    background: bool = Query(False, description="Run as a background job and return its ID immediately")
+):
     """
     Deploy a subnet (star system) using Avalanche CLI
     Uses admin keys automatically discovered from subnet configuration
+    
+    With background=true the deploy runs as a tracked job; poll /jobs/{id}/logs
+    or stream /jobs/{id}/stream for live output.
     """
     if not is_avalanche_cli_available():
         raise HTTPException(status_code=503, detail="Avalanche CLI is not installed")
@@ -604,6 +691,16 @@ async def deploy_subnet(subnet_name: str):
             admin_account = Account.from_key(admin_key)
             print(f"Deploying subnet '{subnet_name}' with admin account: {admin_account.address}")
         
+        if background:
+            argv = get_cli_detector().avalanche_command_argv("subnet deploy", [subnet_name])
+            job = get_job_manager().submit("subnet_deploy", [JobStep(argv, timeout=1800, label="subnet deploy")], subnet=subnet_name)
+            return {
+                "success": True,
+                "subnet_name": subnet_name,
+                "job": job.to_dict(),
+                "message": f"Subnet '{subnet_name}' deployment started. Follow it at /jobs/{job.id}/logs"
+            }
+        
         # Execute subnet deploy command
         deploy_result = interactor.execute_subnet_command(
             "subnet deploy",
@@ -829,9 +926,25 @@ async def get_tools_status():
 
 
 # Star System & Planet Interaction Endpoints
+@router.get("/cache")
+async def get_celestial_cache_stats():
+    """Hit/miss counters for the star system and planet read cache, and buffered balance writes"""
+    return {
+        "success": True,
+        "cache": get_celestial_cache().stats(),
+        "balance_writes": {table: writer.stats() for table, writer in _balance_writers.items()}
+    }
+
+
 @router.get("/star-systems")
-async def list_star_systems(owner_wallet: Optional[str] = None):
-    """List all star systems, optionally filtered by owner. Includes Sarakt Star System with Sarakt Prime and Zythera."""
+async def list_star_systems(
+    owner_wallet: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    include_count: bool = Query(False, description="Also return the total number of matching rows")
+):
+    """List star systems a page at a time, optionally filtered by owner. Includes Sarakt Star System with Sarakt Prime and Zythera."""
     try:
         # First, ensure Sarakt Star System exists (seed it if needed)
         await _ensure_sarakt_system_exists()
@@ -844,24 +957,36 @@ async def list_star_systems(owner_wallet: Optional[str] = None):
                 "count": 1
             }
         
-        query = supabase.table("star_systems").select("*").order("created_at", desc=False)
+        def filtered(query):
+            return query.eq("owner_wallet", owner_wallet) if owner_wallet else query
         
-        if owner_wallet:
-            query = query.eq("owner_wallet", owner_wallet)
+        async def load_systems():
+            query = filtered(supabase.table("star_systems").select(select_columns(fields, extra=("name",))))
+            result = await page_query(query, cursor, limit).execute()
+            systems, next_cursor = page_result(result.data or [], limit)
+            total = await total_count(filtered(supabase.table("star_systems").select("id", count="exact"))) if include_count else None
+            return {"rows": systems, "next_cursor": next_cursor, "total": total}
         
-        response = query.execute()
+        page = await get_celestial_cache().aget_or_load(
+            ("star_systems", owner_wallet, cursor, limit, fields, include_count), load_systems, CELESTIAL_TABLES
+        )
+        systems = page["rows"]
         
-        # Ensure Sarakt system is included
-        systems = response.data or []
-        sarakt_system = _get_default_sarakt_system()
-        if not any(s.get("name") == "Sarakt Star System" for s in systems):
-            systems.insert(0, sarakt_system)
+        # Ensure Sarakt system is included (on the first page)
+        if not cursor and not any(s.get("name") == "Sarakt Star System" for s in systems):
+            systems.insert(0, project(_get_default_sarakt_system(), fields))
         
-        return {
+        response = {
             "success": True,
             "star_systems": systems,
-            "count": len(systems)
+            "count": len(systems),
+            "next_cursor": page["next_cursor"]
         }
+        if include_count:
+            response["total"] = page["total"]
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         # Fallback to default system on error
         return {
@@ -877,26 +1002,32 @@ async def get_star_system(system_id: str):
     try:
         # Check if requesting Sarakt Star System
         if system_id.lower() in ["sarakt star system", "sarakt-star-system", "sarakt"]:
-            await _ensure_sarakt_system_exists()
+            sarakt_system_id = await _ensure_sarakt_system_exists()
             sarakt_system = _get_default_sarakt_system()
-            sarakt_system_id = sarakt_system["id"]
             planets = _get_default_planets(sarakt_system_id)
             
             if SUPABASE_AVAILABLE:
                 # Try to get from database and merge
                 try:
-                    db_response = supabase.table("star_systems").select("*").eq("name", "Sarakt Star System").execute()
-                    if db_response.data and len(db_response.data) > 0:
-                        sarakt_system = {**sarakt_system, **db_response.data[0]}
+                    async def load_sarakt():
+                        db_response = await supabase.table("star_systems").select("*").eq("name", "Sarakt Star System").execute()
+                        planets_response = await supabase.table("planets").select("*").eq("star_system_id", sarakt_system_id).execute()
+                        return {
+                            "star_system": db_response.data[0] if db_response.data else None,
+                            "planets": planets_response.data or []
+                        }
                     
-                    planets_response = supabase.table("planets").select("*").eq("star_system_id", sarakt_system_id).execute()
-                    if planets_response.data:
+                    db = await get_celestial_cache().aget_or_load(("star_system", "sarakt", sarakt_system_id), load_sarakt, CELESTIAL_TABLES)
+                    if db["star_system"]:
+                        sarakt_system = {**sarakt_system, **db["star_system"]}
+                    
+                    if db["planets"]:
                         # Merge with defaults
-                        existing_names = {p.get("name") for p in planets_response.data}
+                        existing_names = {p.get("name") for p in db["planets"]}
                         for planet in planets:
                             if planet.get("name") not in existing_names:
-                                planets_response.data.insert(0, planet)
-                        planets = planets_response.data
+                                db["planets"].insert(0, planet)
+                        planets = db["planets"]
                 except Exception:
                     pass
             
@@ -909,25 +1040,30 @@ async def get_star_system(system_id: str):
         if not SUPABASE_AVAILABLE:
             raise HTTPException(status_code=503, detail="Supabase not available")
         
-        # Try by ID first
-        response = supabase.table("star_systems").select("*").eq("id", system_id).execute()
-        
-        if not response.data or len(response.data) == 0:
-            # Try by name
-            response = supabase.table("star_systems").select("*").eq("name", system_id).execute()
+        async def load_system():
+            # Try by ID first
+            response = await supabase.table("star_systems").select("*").eq("id", system_id).execute()
+            
+            if not response.data or len(response.data) == 0:
+                # Try by name
+                response = await supabase.table("star_systems").select("*").eq("name", system_id).execute()
+            
+            if not response.data or len(response.data) == 0:
+                return None
+            
+            star_system = response.data[0]
+            
+            # Get planets for this star system
+            planets_response = await supabase.table("planets").select("*").eq("star_system_id", star_system["id"]).execute()
+            return {"star_system": star_system, "planets": planets_response.data or []}
         
-        if not response.data or len(response.data) == 0:
+        result = await get_celestial_cache().aget_or_load(("star_system", system_id), load_system, CELESTIAL_TABLES)
+        if result is None:
             raise HTTPException(status_code=404, detail="Star system not found")
         
-        star_system = response.data[0]
-        
-        # Get planets for this star system
-        planets_response = supabase.table("planets").select("*").eq("star_system_id", star_system["id"]).execute()
-        
         return {
             "success": True,
-            "star_system": star_system,
-            "planets": planets_response.data or []
+            **result
         }
     except HTTPException:
         raise
@@ -936,8 +1072,15 @@ async def get_star_system(system_id: str):
 
 
 @router.get("/planets")
-async def list_planets(star_system_id: Optional[str] = None, owner_wallet: Optional[str] = None):
-    """List all planets, optionally filtered by star system or owner. Includes Sarakt Prime and Zythera."""
+async def list_planets(
+    star_system_id: Optional[str] = None,
+    owner_wallet: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    include_count: bool = Query(False, description="Also return the total number of matching rows")
+):
+    """List planets a page at a time, optionally filtered by star system or owner. Includes Sarakt Prime and Zythera."""
     try:
         # Ensure Sarakt system and planets exist
         sarakt_system_id = await _ensure_sarakt_system_exists()
@@ -953,33 +1096,47 @@ async def list_planets(star_system_id: Optional[str] = None, owner_wallet: Optio
                 "count": len(default_planets)
             }
         
-        query = supabase.table("planets").select("*").order("created_at", desc=False)
-        
-        if star_system_id:
-            query = query.eq("star_system_id", star_system_id)
-        
-        if owner_wallet:
-            query = query.eq("owner_wallet", owner_wallet)
-        
-        response = query.execute()
-        planets = response.data or []
+        def filtered(query):
+            if star_system_id:
+                query = query.eq("star_system_id", star_system_id)
+            if owner_wallet:
+                query = query.eq("owner_wallet", owner_wallet)
+            return query
+        
+        async def load_planets():
+            query = filtered(supabase.table("planets").select(select_columns(fields, extra=("name",))))
+            result = await page_query(query, cursor, limit).execute()
+            planets, next_cursor = page_result(result.data or [], limit)
+            total = await total_count(filtered(supabase.table("planets").select("id", count="exact"))) if include_count else None
+            return {"rows": planets, "next_cursor": next_cursor, "total": total}
+        
+        page = await get_celestial_cache().aget_or_load(
+            ("planets", star_system_id, owner_wallet, cursor, limit, fields, include_count), load_planets, CELESTIAL_TABLES
+        )
+        planets = page["rows"]
         
-        # Add Sarakt Prime and Zythera if they don't exist
-        if not star_system_id or star_system_id == sarakt_system_id:
+        # Add Sarakt Prime and Zythera if they don't exist (on the first page)
+        if not cursor and (not star_system_id or star_system_id == sarakt_system_id):
             existing_names = {p.get("name") for p in planets}
             default_planets = _get_default_planets(sarakt_system_id)
             for planet in default_planets:
                 if planet.get("name") not in existing_names:
-                    planets.insert(0, planet)
+                    planets.insert(0, project(planet, fields))
         
-        return {
+        response = {
             "success": True,
             "planets": planets,
-            "count": len(planets)
+            "count": len(planets),
+            "next_cursor": page["next_cursor"]
         }
+        if include_count:
+            response["total"] = page["total"]
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
-        # Fallback to default planets on error
-        sarakt_system_id = await _ensure_sarakt_system_exists()
+        # Fallback to default planets on error (without retrying the seed)
+        sarakt_system_id = _sarakt_system_id or "sarakt-star-system"
         default_planets = _get_default_planets(sarakt_system_id)
         if star_system_id and star_system_id != sarakt_system_id:
             default_planets = []
@@ -1004,13 +1161,11 @@ async def get_planet(planet_id: str):
             
             if SUPABASE_AVAILABLE:
                 try:
-                    db_planet = supabase.table("planets").select("*").eq("name", "Sarakt Prime").execute()
-                    if db_planet.data and len(db_planet.data) > 0:
-                        planet = {**planet, **db_planet.data[0]}
-                    
-                    db_system = supabase.table("star_systems").select("*").eq("name", "Sarakt Star System").execute()
-                    if db_system.data and len(db_system.data) > 0:
-                        star_system = {**star_system, **db_system.data[0]}
+                    db = await _load_sarakt_planet("Sarakt Prime")
+                    if db["planet"]:
+                        planet = {**planet, **db["planet"]}
+                    if db["star_system"]:
+                        star_system = {**star_system, **db["star_system"]}
                 except Exception:
                     pass
             
@@ -1028,13 +1183,11 @@ async def get_planet(planet_id: str):
             
             if SUPABASE_AVAILABLE:
                 try:
-                    db_planet = supabase.table("planets").select("*").eq("name", "Zythera").execute()
-                    if db_planet.data and len(db_planet.data) > 0:
-                        planet = {**planet, **db_planet.data[0]}
-                    
-                    db_system = supabase.table("star_systems").select("*").eq("name", "Sarakt Star System").execute()
-                    if db_system.data and len(db_system.data) > 0:
-                        star_system = {**star_system, **db_system.data[0]}
+                    db = await _load_sarakt_planet("Zythera")
+                    if db["planet"]:
+                        planet = {**planet, **db["planet"]}
+                    if db["star_system"]:
+                        star_system = {**star_system, **db["star_system"]}
                 except Exception:
                     pass
             
@@ -1047,25 +1200,33 @@ async def get_planet(planet_id: str):
         if not SUPABASE_AVAILABLE:
             raise HTTPException(status_code=503, detail="Supabase not available")
         
-        # Try by ID first
-        response = supabase.table("planets").select("*").eq("id", planet_id).execute()
-        
-        if not response.data or len(response.data) == 0:
-            # Try by name
-            response = supabase.table("planets").select("*").eq("name", planet_id).execute()
+        async def load_planet():
+            # Try by ID first
+            response = await supabase.table("planets").select("*").eq("id", planet_id).execute()
+            
+            if not response.data or len(response.data) == 0:
+                # Try by name
+                response = await supabase.table("planets").select("*").eq("name", planet_id).execute()
+            
+            if not response.data or len(response.data) == 0:
+                return None
+            
+            planet = response.data[0]
+            
+            # Get star system info
+            star_system_response = await supabase.table("star_systems").select("*").eq("id", planet["star_system_id"]).execute()
+            return {
+                "planet": planet,
+                "star_system": star_system_response.data[0] if star_system_response.data and len(star_system_response.data) > 0 else None
+            }
         
-        if not response.data or len(response.data) == 0:
+        result = await get_celestial_cache().aget_or_load(("planet", planet_id), load_planet, CELESTIAL_TABLES)
+        if result is None:
             raise HTTPException(status_code=404, detail="Planet not found")
         
-        planet = response.data[0]
-        
-        # Get star system info
-        star_system_response = supabase.table("star_systems").select("*").eq("id", planet["star_system_id"]).execute()
-        
         return {
             "success": True,
-            "planet": planet,
-            "star_system": star_system_response.data[0] if star_system_response.data and len(star_system_response.data) > 0 else None
+            **result
         }
     except HTTPException:
         raise
@@ -1084,7 +1245,8 @@ async def update_star_system_status(system_id: str, status: str):
     
     try:
         from datetime import datetime
-        response = supabase.table("star_systems").update({"status": status, "updated_at": datetime.now().isoformat()}).eq("id", system_id).execute()
+        response = await supabase.table("star_systems").update({"status": status, "updated_at": datetime.now().isoformat()}).eq("id", system_id).execute()
+        get_celestial_cache().invalidate("star_systems")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Star system not found")
@@ -1111,7 +1273,8 @@ async def update_planet_status(planet_id: str, status: str):
     
     try:
         from datetime import datetime
-        response = supabase.table("planets").update({"status": status, "updated_at": datetime.now().isoformat()}).eq("id", planet_id).execute()
+        response = await supabase.table("planets").update({"status": status, "updated_at": datetime.now().isoformat()}).eq("id", planet_id).execute()
+        get_celestial_cache().invalidate("planets")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Planet not found")
@@ -1184,6 +1347,74 @@ async def deploy_contracts_to_subnet(subnet_name: str):
         )
 
 
+class ContractRolloutRequest(BaseModel):
+    subnets: Optional[List[str]] = None  # Subnet (star system) names
+    all_subnets: bool = False  # Deploy to every subnet configured in Avalanche CLI
+    max_parallel: int = DEPLOY_MAX_PARALLEL
+
+
+@router.post("/deployments/rollout")
+async def start_contract_rollout(request: ContractRolloutRequest):
+    """
+    Deploy the contract suite to many subnets in parallel
+    Contracts are compiled once; progress is reported per subnet at /deployments/rollouts/{id}
+    """
+    from cli_detector import is_forge_available
+    if not is_forge_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Forge is not installed. Please install Foundry to deploy contracts."
+        )
+    
+    subnets = list(request.subnets or [])
+    if request.all_subnets:
+        subnets.extend(subnet["name"] for subnet in create_subnet_interactor().list_subnets())
+    if not subnets:
+        raise HTTPException(status_code=400, detail="Provide subnets or set all_subnets")
+    if request.max_parallel < 1:
+        raise HTTPException(status_code=400, detail="max_parallel must be at least 1")
+    
+    rollout = get_deployment_orchestrator().start(subnets, max_parallel=request.max_parallel)
+    return {
+        "success": True,
+        "rollout": rollout.to_dict(),
+        "message": f"Deploying to {len(rollout.targets)} subnet(s). Follow progress at /celestial-forge/deployments/rollouts/{rollout.id}"
+    }
+
+
+@router.get("/deployments/rollouts")
+async def list_contract_rollouts():
+    """List contract rollouts, newest first"""
+    rollouts = get_deployment_orchestrator().list()
+    return {
+        "success": True,
+        "rollouts": [rollout.to_dict(include_targets=False) for rollout in rollouts],
+        "count": len(rollouts)
+    }
+
+
+@router.get("/deployments/rollouts/{rollout_id}")
+async def get_contract_rollout(rollout_id: str):
+    """Get rollout progress with per-subnet status, job IDs and addresses"""
+    rollout = get_deployment_orchestrator().get(rollout_id)
+    if not rollout:
+        raise HTTPException(status_code=404, detail="Rollout not found")
+    return {"success": True, "rollout": rollout.to_dict()}
+
+
+@router.post("/deployments/rollouts/{rollout_id}/cancel")
+async def cancel_contract_rollout(rollout_id: str):
+    """Stop a rollout: pending subnets are skipped and running deploy jobs are cancelled"""
+    rollout = get_deployment_orchestrator().cancel(rollout_id)
+    if not rollout:
+        raise HTTPException(status_code=404, detail="Rollout not found")
+    return {
+        "success": True,
+        "rollout": rollout.to_dict(),
+        "message": "Rollout already finished" if rollout.finished else "Cancellation requested"
+    }
+
+
 @router.get("/star-systems/{subnet_name}/contracts")
 async def get_subnet_contracts(subnet_name: str):
     """
@@ -1206,14 +1437,21 @@ async def get_subnet_contracts(subnet_name: str):
             if abi:
                 abis[contract_name] = abi
         
-        # Check deployment status
+        # Check deployment status (one batched probe, reused within a block)
+        try:
+            probes = probe_contracts(contract_manager.rpc_url, contract_manager.addresses).contracts
+        except RpcBatchError as e:
+            print(f"Warning: Could not check contract status for {subnet_name}: {e}")
+            probes = {}
+        
         deployment_status = {}
         for name, address in contract_manager.addresses.items():
-            deployed = contract_manager.check_contract_deployed(address) if address else False
+            deployed = bool(probes.get(name) and probes[name].has_code)
             deployment_status[name] = {
                 "address": address,
                 "deployed": deployed,
-                "abi_available": name in abis
+                "abi_available": name in abis,
+                "error": probes[name].error if name in probes else None
             }
         
         return {
@@ -1274,7 +1512,8 @@ async def assign_subnet_to_star_system(system_id: str, subnet_name: str, subnet_
             "updated_at": datetime.now().isoformat()
         }
         
-        response = supabase.table("star_systems").update(update_data).eq("id", system_id).execute()
+        response = await supabase.table("star_systems").update(update_data).eq("id", system_id).execute()
+        get_celestial_cache().invalidate("star_systems")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Star system not found")
@@ -1324,7 +1563,8 @@ async def assign_subnet_to_planet(planet_id: str, subnet_name: str, node_id: Opt
             "updated_at": datetime.now().isoformat()
         }
         
-        response = supabase.table("planets").update(update_data).eq("id", planet_id).execute()
+        response = await supabase.table("planets").update(update_data).eq("id", planet_id).execute()
+        get_celestial_cache().invalidate("planets")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Planet not found")
@@ -1390,7 +1630,8 @@ async def assign_node_to_planet(planet_id: str, request: AssignNodeRequest):
                     update_data["subnet_name"] = request.subnet_name
                     update_data["assigned_subnet_id"] = assigned_subnet_id
         
-        response = supabase.table("planets").update(update_data).eq("id", planet_id).execute()
+        response = await supabase.table("planets").update(update_data).eq("id", planet_id).execute()
+        get_celestial_cache().invalidate("planets")
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Planet not found")
@@ -1414,7 +1655,7 @@ async def get_star_system_native_balance(system_id: str):
     
     try:
         # Get star system
-        response = supabase.table("star_systems").select("*").eq("id", system_id).execute()
+        response = await supabase.table("star_systems").select("*").eq("id", system_id).execute()
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Star system not found")
@@ -1433,17 +1674,14 @@ async def get_star_system_native_balance(system_id: str):
         
         # Get native balance from RPC
         try:
-            from web3 import Web3
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
-            balance_wei = w3.eth.get_balance(owner_wallet)
-            balance = float(w3.from_wei(balance_wei, "ether"))
+            balance = await _read_native_balance(rpc_url, owner_wallet)
             
-            # Update balance in database
-            from datetime import datetime
-            supabase.table("star_systems").update({
+            # Persist in the background; repeated reads of one row collapse into one write
+            from datetime import datetime, timezone
+            get_balance_writer("star_systems").put(system_id, {
                 "native_balance": balance,
-                "updated_at": datetime.now().isoformat()
-            }).eq("id", system_id).execute()
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            })
             
             return {
                 "success": True,
@@ -1471,7 +1709,7 @@ async def get_planet_native_balance(planet_id: str):
     
     try:
         # Get planet
-        response = supabase.table("planets").select("*").eq("id", planet_id).execute()
+        response = await supabase.table("planets").select("*").eq("id", planet_id).execute()
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Planet not found")
@@ -1480,7 +1718,7 @@ async def get_planet_native_balance(planet_id: str):
         owner_wallet = planet.get("owner_wallet")
         
         # Get star system for RPC URL
-        star_system_response = supabase.table("star_systems").select("rpc_url, native_coin_symbol").eq("id", planet.get("star_system_id")).execute()
+        star_system_response = await supabase.table("star_systems").select("rpc_url, native_coin_symbol").eq("id", planet.get("star_system_id")).execute()
         star_system = star_system_response.data[0] if star_system_response.data else {}
         rpc_url = star_system.get("rpc_url")
         
@@ -1494,17 +1732,14 @@ async def get_planet_native_balance(planet_id: str):
         
         # Get native balance from RPC
         try:
-            from web3 import Web3
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
-            balance_wei = w3.eth.get_balance(owner_wallet)
-            balance = float(w3.from_wei(balance_wei, "ether"))
+            balance = await _read_native_balance(rpc_url, owner_wallet)
             
-            # Update balance in database
-            from datetime import datetime
-            supabase.table("planets").update({
+            # Persist in the background; repeated reads of one row collapse into one write
+            from datetime import datetime, timezone
+            get_balance_writer("planets").put(planet_id, {
                 "native_balance": balance,
-                "updated_at": datetime.now().isoformat()
-            }).eq("id", planet_id).execute()
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            })
             
             return {
                 "success": True,
@@ -1532,7 +1767,7 @@ async def deploy_star_system_mock(system_id: str):
     
     try:
         # Get current star system
-        response = supabase.table("star_systems").select("*").eq("id", system_id).execute()
+        response = await supabase.table("star_systems").select("*").eq("id", system_id).execute()
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(status_code=404, detail="Star system not found")
@@ -1542,10 +1777,11 @@ async def deploy_star_system_mock(system_id: str):
         # For mock systems, just update status to active
         if star_system.get("subnet_id", "").startswith("mock-") or star_system.get("status") == "deploying":
             from datetime import datetime
-            update_response = supabase.table("star_systems").update({
+            update_response = await supabase.table("star_systems").update({
                 "status": "active",
                 "updated_at": datetime.now().isoformat()
             }).eq("id", system_id).execute()
+            get_celestial_cache().invalidate("star_systems")
             
             return {
                 "success": True,
@@ -259,22 +259,25 @@ class CLIDetector:
         Returns:
             subprocess.CompletedProcess result
         """
+        return subprocess.run(
+            self.avalanche_command_argv(command, args),
+            capture_output=capture_output,
+            text=True,
+            timeout=timeout
+        )
+    
+    def avalanche_command_argv(self, command: str, args: List[str] = None) -> List[str]:
+        """Build the argv for an Avalanche CLI command (raises if the CLI is missing)"""
         if not self.avalanche_status or not self.avalanche_status.installed:
             self.detect_avalanche_cli()
         
         if not self.avalanche_status.installed:
             raise RuntimeError("Avalanche CLI is not installed or not in PATH")
         
-        cmd_parts = command.split()
+        cmd_parts = ["avalanche"] + command.split()
         if args:
             cmd_parts.extend(args)
-        
-        return subprocess.run(
-            ["avalanche"] + cmd_parts,
-            capture_output=capture_output,
-            text=True,
-            timeout=timeout
-        )
+        return cmd_parts
     
     def execute_forge_command(
         self,
@@ -282,7 +285,8 @@ class CLIDetector:
         args: List[str] = None,
         cwd: Optional[Path] = None,
         timeout: int = 120,
-        capture_output: bool = True
+        capture_output: bool = True,
+        env: Optional[Dict[str, str]] = None
     ) -> subprocess.CompletedProcess:
         """
         Execute a Forge command
@@ -293,10 +297,22 @@ class CLIDetector:
             cwd: Working directory
             timeout: Command timeout in seconds
             capture_output: Whether to capture output
+            env: Environment for the forge process (defaults to the current environment)
             
         Returns:
             subprocess.CompletedProcess result
         """
+        return subprocess.run(
+            self.forge_command_argv(command, args),
+            cwd=cwd,
+            capture_output=capture_output,
+            text=True,
+            timeout=timeout,
+            env=env
+        )
+    
+    def forge_command_argv(self, command: str, args: List[str] = None) -> List[str]:
+        """Build the argv for a Forge command (raises if Forge is missing)"""
         if not self.forge_status or not self.forge_status.installed:
             self.detect_forge()
         
@@ -306,14 +322,7 @@ class CLIDetector:
         cmd_parts = ["forge", command]
         if args:
             cmd_parts.extend(args)
-        
-        return subprocess.run(
-            cmd_parts,
-            cwd=cwd,
-            capture_output=capture_output,
-            text=True,
-            timeout=timeout
-        )
+        return cmd_parts
     
     def list_subnets(self) -> List[Dict[str, Any]]:
         """List available subnets using Avalanche CLI"""
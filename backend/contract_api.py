@@ -1,15 +1,22 @@
 """
 API endpoints for contract management
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+import functools
 import traceback
 from typing import List, Dict, Any, Optional
 
 # Import contract manager (works when run from backend directory)
 try:
     from .contract_manager import ContractManager
+    from .job_runner import get_job_manager
+    from .config import SUBNET_NAME
+    from .create2_deployer import plan_deployment, DEPLOY_SALT
 except ImportError:
     from contract_manager import ContractManager
+    from job_runner import get_job_manager
+    from config import SUBNET_NAME
+    from create2_deployer import plan_deployment, DEPLOY_SALT
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
@@ -95,11 +102,42 @@ async def get_contract_addresses():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/deploy")
-async def deploy_contracts():
+async def deploy_contracts(
+    background: bool = Query(False, description="Run the deployment as a background job and return its ID immediately"),
+    deterministic: bool = Query(False, description="Deploy at precomputed CREATE2 addresses, skipping contracts already present"),
+    salt: Optional[str] = Query(None, description="CREATE2 salt for deterministic deployments (defaults to DEPLOY_SALT)")
+):
     """Deploy all contracts if not already deployed"""
     try:
         manager = get_contract_manager()
-        result = manager.setup_and_deploy()
+        
+        if background:
+            # A complete registry says nothing about the CREATE2 addresses; the deterministic
+            # script skips contracts already there itself
+            if not deterministic:
+                status = manager.get_deployment_status()
+                if all(info["deployed"] for info in status.values() if info["required"]):
+                    return {
+                        "success": True,
+                        "status": "deployed",
+                        "addresses": manager.addresses,
+                        "deployment_status": status
+                    }
+            steps, run = manager.build_deploy_steps(deterministic_salt=(salt or DEPLOY_SALT) if deterministic else None)
+            job = get_job_manager().submit(
+                "contract_deploy",
+                steps,
+                subnet=SUBNET_NAME,
+                on_success=functools.partial(manager.complete_deployment, **run)
+            )
+            return {
+                "success": True,
+                "status": "deploying",
+                "job": job.to_dict(),
+                "message": f"Deployment started. Follow it at /jobs/{job.id}/logs"
+            }
+        
+        result = manager.setup_and_deploy(deterministic=deterministic, salt=salt or DEPLOY_SALT)
         return {
             "success": result.get("status") != "error",
             **result
@@ -107,6 +145,24 @@ async def deploy_contracts():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Deployment failed: {str(e)}\n{traceback.format_exc()}")
 
+@router.get("/deterministic-addresses")
+async def get_deterministic_addresses(
+    salt: Optional[str] = Query(None, description="CREATE2 salt (defaults to DEPLOY_SALT)")
+):
+    """Addresses a deterministic deployment uses, computed from the build without touching the chain"""
+    try:
+        manager = get_contract_manager()
+        plan = plan_deployment(manager.build_cache, manager.deployer.address, salt or DEPLOY_SALT)
+        return {
+            "success": True,
+            "salt": plan.salt,
+            "deployer": plan.deployer,
+            "factory": plan.factory,
+            "addresses": plan.addresses
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/compile")
 async def compile_contracts():
     """Compile all contracts"""
@@ -149,7 +205,9 @@ async def check_contract(contract_name: str):
             "contract": contract_name,
             "deployed": contract_info["deployed"],
             "address": contract_info["address"],
-            "status": contract_info["status"]
+            "responsive": contract_info["responsive"],
+            "status": contract_info["status"],
+            "block_number": contract_info["block_number"]
         }
     except HTTPException:
         raise
@@ -5,6 +5,8 @@ Integrates with Avalanche CLI and Foundry for contract deployment
 import os
 import json
 import subprocess
+import time
+import uuid
 from pathlib import Path
 from web3 import Web3
 from eth_account import Account
@@ -19,8 +21,22 @@ except ImportError:
 # Import CLI detector for automatic tool detection
 try:
     from .cli_detector import get_cli_detector, is_forge_available
+    from .job_runner import Job, JobStep
+    from .build_cache import get_build_cache
+    from .deployment_results import collect_deployment, write_registry
+    from .contract_status import probe_contracts, RpcBatchError
+    from .create2_deployer import (
+        plan_deployment, missing_contracts, check_factory, DEPLOY_SALT, DETERMINISTIC_SCRIPT_NAME
+    )
 except ImportError:
     from cli_detector import get_cli_detector, is_forge_available
+    from job_runner import Job, JobStep
+    from build_cache import get_build_cache
+    from deployment_results import collect_deployment, write_registry
+    from contract_status import probe_contracts, RpcBatchError
+    from create2_deployer import (
+        plan_deployment, missing_contracts, check_factory, DEPLOY_SALT, DETERMINISTIC_SCRIPT_NAME
+    )
 
 
 class ContractManager:
@@ -58,6 +74,7 @@ class ContractManager:
         
         # CLI detector for Forge operations
         self.cli_detector = get_cli_detector()
+        self.build_cache = get_build_cache(self.project_root)
         
         self.addresses_file = self.deployments_dir / "addresses.json"
         self.load_addresses()
@@ -72,9 +89,8 @@ class ContractManager:
         return self.addresses
     
     def save_addresses(self):
-        """Save deployment addresses to file"""
-        with open(self.addresses_file, 'w') as f:
-            json.dump(self.addresses, f, indent=2)
+        """Save deployment addresses to file (atomically)"""
+        write_registry(self.addresses_file, self.addresses, merge=False)
     
     def get_rpc_url(self) -> str:
         """Get RPC URL for Avalanche subnet"""
@@ -119,38 +135,54 @@ class ContractManager:
             }
         }
         
+        # Code and view checks for every contract in one round trip, reused within a block
+        try:
+            snapshot = probe_contracts(
+                self.get_rpc_url(),
+                {name: info["address"] for name, info in contracts.items()}
+            )
+            probes = snapshot.contracts
+            block_number = snapshot.block_number
+        except RpcBatchError as e:
+            print(f"Warning: Could not check contract status: {e}")
+            probes = {}
+            block_number = None
+        
         status = {}
         for name, info in contracts.items():
             address = info["address"]
-            deployed = self.check_contract_deployed(address) if address else False
+            probe = probes.get(name)
+            deployed = bool(probe and probe.has_code)
             
             status[name] = {
                 "name": name,
                 "address": address,
                 "deployed": deployed,
+                "responsive": probe.view_ok if probe else None,
+                "error": probe.error if probe else None,
                 "required": info["required"],
-                "status": "deployed" if deployed else ("address_set" if address else "not_deployed")
+                "status": "deployed" if deployed else ("address_set" if address else "not_deployed"),
+                "block_number": block_number
             }
         
         return status
     
     def compile_contracts(self) -> bool:
-        """Compile Solidity contracts using Foundry"""
+        """Compile Solidity contracts using Foundry (skipped when sources are unchanged)"""
         if not is_forge_available():
             raise Exception("Foundry (forge) not found. Please install Foundry.")
         
         try:
-            result = self.cli_detector.execute_forge_command(
-                "build",
-                cwd=self.project_root,
-                timeout=120
-            )
+            result = self.build_cache.ensure_built(timeout=120)
             
-            if result.returncode != 0:
+            if not result.success:
                 print(f"Compilation error: {result.stderr}")
                 return False
             
-            print("Contracts compiled successfully")
+            if result.cached:
+                print("Contracts up to date, skipping compilation")
+            else:
+                print("Contracts compiled successfully")
             return True
         except subprocess.TimeoutExpired:
             raise Exception("Contract compilation timed out")
@@ -159,24 +191,19 @@ class ContractManager:
     
     def extract_abi(self, contract_name: str) -> Optional[Dict]:
         """Extract ABI from compiled contract"""
-        # Try multiple paths for ABI location
-        possible_paths = [
-            self.project_root / "out" / contract_name / f"{contract_name}.sol" / f"{contract_name}.json",
-            self.project_root / "out" / f"{contract_name}.sol" / f"{contract_name}.json",
-            self.project_root / "out" / contract_name / f"{contract_name}.json",
-        ]
+        return self.build_cache.get_abi(contract_name)
+    
+    def export_abis(self, contract_names: List[str]):
+        """Save ABIs for contract_names unless they were already exported from this build"""
+        if self.build_cache.abis_current(self.abi_dir):
+            print("ABIs up to date, skipping extraction")
+            return
         
-        for abi_path in possible_paths:
-            if abi_path.exists():
-                try:
-                    with open(abi_path, 'r') as f:
-                        artifact = json.load(f)
-                        return artifact.get("abi")
-                except Exception as e:
-                    print(f"Error extracting ABI from {abi_path}: {e}")
-                    continue
-        
-        return None
+        for contract_name in contract_names:
+            abi = self.extract_abi(contract_name)
+            if abi:
+                self.save_abi(contract_name, abi)
+        self.build_cache.mark_abis_current(self.abi_dir)
     
     def save_abi(self, contract_name: str, abi: Dict):
         """Save ABI to backend/abi directory"""
@@ -253,11 +280,7 @@ class ContractManager:
         
         # 2. Extract and save ABIs
         print("\nStep 2: Extracting ABIs...")
-        contracts_to_abi = ["SaraktDigitalID", "SaraktTreasury", "SaraktLandV2", "DummyToken"]
-        for contract_name in contracts_to_abi:
-            abi = self.extract_abi(contract_name)
-            if abi:
-                self.save_abi(contract_name, abi)
+        self.export_abis(["SaraktDigitalID", "SaraktTreasury", "SaraktLandV2", "DummyToken"])
         
         # 3. Deploy using Foundry script
         print("\nStep 3: Deploying contracts...")
@@ -269,20 +292,14 @@ class ContractManager:
             raise Exception("deploy_all.s.sol script not found")
         
         try:
-            # Convert private key to integer for Forge
             # Forge expects private key as hex string
-            private_key_for_forge = PRIVATE_KEY
-            if not private_key_for_forge.startswith("0x"):
-                # If it's already an integer string, we need to convert
-                try:
-                    int_key = int(private_key_for_forge)
-                    private_key_for_forge = hex(int_key)
-                except:
-                    pass
+            private_key_for_forge = self._forge_private_key()
             
             print(f"Deploying to: {rpc_url}")
             print(f"Deployer: {self.deployer.address}")
             
+            script_output = self._new_script_output()
+            started_at = time.time()
             result = self.cli_detector.execute_forge_command(
                 "script",
                 args=[
@@ -293,10 +310,12 @@ class ContractManager:
                     "-vv"
                 ],
                 cwd=self.project_root,
-                timeout=600
+                timeout=600,
+                env=self._forge_env(private_key_for_forge, script_output)
             )
             
             if result.returncode != 0:
+                script_output.unlink(missing_ok=True)
                 print(f"Deployment error: {result.stderr}")
                 print(f"Output: {result.stdout}")
                 raise Exception(f"Deployment failed: {result.stderr}")
@@ -307,15 +326,8 @@ class ContractManager:
             for line in output_lines[-50:]:
                 print(line)
             
-            # Load addresses from the file that was written by the script
-            # Wait a moment for file to be written
-            import time
-            time.sleep(2)
-            self.load_addresses()
-            
-            if not self.addresses:
-                raise Exception("Deployment completed but addresses file was not updated. Check forge output.")
-            
+            # Resolve addresses from forge's broadcast record for this chain
+            self.record_deployment(script_output, started_at)
             return self.addresses
             
         except subprocess.TimeoutExpired:
@@ -323,55 +335,197 @@ class ContractManager:
         except Exception as e:
             raise Exception(f"Deployment failed: {str(e)}")
     
+    def deploy_deterministic(self, salt: str = DEPLOY_SALT) -> Dict[str, str]:
+        """
+        Deploy the core contracts at precomputed CREATE2 addresses
+        
+        Contracts that already have code are skipped; when all of them exist forge is
+        not run at all, so redeploying is idempotent.
+        """
+        print("=== Starting Deterministic Contract Deployment ===\n")
+        
+        print("Step 1: Compiling contracts...")
+        if not self.compile_contracts():
+            raise Exception("Contract compilation failed")
+        self.export_abis(["SaraktDigitalID", "SaraktTreasury", "SaraktLandV2", "DummyToken"])
+        
+        rpc_url = self.get_rpc_url()
+        plan = plan_deployment(self.build_cache, self.deployer.address, salt)
+        missing = missing_contracts(rpc_url, plan)
+        
+        if not missing:
+            print("\nAll contracts already deployed at their deterministic addresses, skipping forge")
+        else:
+            print(f"\nStep 2: Deploying {', '.join(missing)} (salt '{salt}')...")
+            check_factory(rpc_url, plan)
+            private_key_for_forge = self._forge_private_key()
+            script_output = self._new_script_output()
+            try:
+                result = self.cli_detector.execute_forge_command(
+                    "script",
+                    args=self._deterministic_script_args(rpc_url, private_key_for_forge),
+                    cwd=self.project_root,
+                    timeout=600,
+                    env=self._forge_env(private_key_for_forge, script_output, salt)
+                )
+            except subprocess.TimeoutExpired:
+                raise Exception("Deployment timed out")
+            finally:
+                # Addresses come from the plan, not the script's output
+                script_output.unlink(missing_ok=True)
+            
+            if result.returncode != 0:
+                print(f"Output: {result.stdout}")
+                raise Exception(f"Deployment failed: {result.stderr}")
+        
+        return self.record_deterministic_deployment(salt, plan)
+    
+    def record_deterministic_deployment(self, salt: str = DEPLOY_SALT, plan=None) -> Dict[str, str]:
+        """Check every planned address holds code and update addresses.json"""
+        plan = plan or plan_deployment(self.build_cache, self.deployer.address, salt)
+        missing = missing_contracts(self.get_rpc_url(), plan)
+        if missing:
+            raise Exception(f"Deterministic deployment left no code at: {', '.join(missing)}")
+        
+        self.addresses = write_registry(self.addresses_file, plan.addresses)
+        return self.addresses
+    
+    def _deterministic_script_args(self, rpc_url: str, private_key_for_forge: str) -> List[str]:
+        return [
+            str(self.project_root / "scripts" / DETERMINISTIC_SCRIPT_NAME),
+            "--rpc-url", rpc_url,
+            "--private-key", private_key_for_forge,
+            "--broadcast",
+            "-vv"
+        ]
+    
+    def _forge_private_key(self) -> str:
+        """PRIVATE_KEY formatted as a hex string for Forge"""
+        private_key_for_forge = PRIVATE_KEY
+        if not private_key_for_forge.startswith("0x"):
+            # If it's already an integer string, we need to convert
+            try:
+                int_key = int(private_key_for_forge)
+                private_key_for_forge = hex(int_key)
+            except:
+                pass
+        return private_key_for_forge
+    
+    def _forge_env(self, private_key_for_forge: str, script_output: Path, salt: Optional[str] = None) -> Dict[str, str]:
+        """Environment for deploy_all.s.sol (and deploy_deterministic.s.sol when salt is given)"""
+        env = os.environ.copy()
+        if salt is not None:
+            env["DEPLOY_SALT"] = salt
+        # deploy_all.s.sol reads the deployer key from PRIVATE_KEY
+        env["PRIVATE_KEY"] = private_key_for_forge
+        # The script's own output is only a fallback; the registry is written atomically here
+        env["DEPLOYMENTS_FILE"] = str(script_output)
+        return env
+    
+    def _new_script_output(self) -> Path:
+        # One file per run, so concurrent deployments cannot read each other's output
+        return self.deployments_dir / f".deploy_all-output.{uuid.uuid4().hex}.json"
+    
+    def record_deployment(self, script_output: Path, started_at: Optional[float] = None) -> Dict[str, str]:
+        """Confirm the latest deploy_all broadcast and update addresses.json"""
+        try:
+            result = collect_deployment(
+                self.project_root,
+                self.w3.eth.chain_id,
+                self.get_rpc_url(),
+                started_at=started_at,
+                script_output=script_output
+            )
+        finally:
+            script_output.unlink(missing_ok=True)
+        
+        if result.unconfirmed:
+            print(f"Warning: unconfirmed contract creations: {', '.join(result.unconfirmed)}")
+        self.addresses = write_registry(self.addresses_file, result.addresses)
+        return self.addresses
+    
+    def build_deploy_steps(self, deterministic_salt: Optional[str] = None) -> Tuple[List[JobStep], Dict]:
+        """
+        Build the compile (if needed) + deploy steps for running deploy_all as a background job
+        
+        With deterministic_salt the job runs deploy_deterministic.s.sol instead, which skips
+        contracts already present at their CREATE2 addresses.
+        
+        Returns:
+            (steps, run): run holds this job's output file, start time and salt, to be
+            passed to complete_deployment as keyword arguments when the job succeeds
+        """
+        script_name = DETERMINISTIC_SCRIPT_NAME if deterministic_salt is not None else "deploy_all.s.sol"
+        script_path = self.project_root / "scripts" / script_name
+        if not script_path.exists():
+            raise Exception(f"{script_name} script not found")
+        
+        private_key_for_forge = self._forge_private_key()
+        # Kept per job rather than on the manager: jobs queue behind each other on one chain
+        run = {"output": self._new_script_output(), "started_at": time.time(), "salt": deterministic_salt}
+        env = self._forge_env(private_key_for_forge, run["output"], deterministic_salt)
+        
+        compile_step = self.build_cache.compile_step(timeout=120)
+        steps = ([compile_step] if compile_step else []) + [
+            JobStep(
+                self.cli_detector.forge_command_argv("script", [
+                    str(script_path),
+                    "--rpc-url", self.get_rpc_url(),
+                    "--private-key", private_key_for_forge,
+                    "--broadcast",
+                    "-vv"
+                ]),
+                cwd=self.project_root,
+                env=env,
+                timeout=600,
+                label="deploy"
+            ),
+        ]
+        return steps, run
+    
+    def complete_deployment(
+        self,
+        job: Optional[Job] = None,
+        *,
+        output: Path,
+        started_at: Optional[float] = None,
+        salt: Optional[str] = None
+    ) -> Dict:
+        """Extract ABIs, reload addresses and verify after a background deploy job succeeds"""
+        self.export_abis(["SaraktDigitalID", "SaraktTreasury", "SaraktLandV2", "DummyToken"])
+        if salt is not None:
+            output.unlink(missing_ok=True)
+            self.record_deterministic_deployment(salt)
+        else:
+            self.record_deployment(output, started_at)
+        
+        verification = self.verify_contracts()
+        return {
+            "status": "deployed" if all(verification.values()) else "partial",
+            "addresses": self.addresses,
+            "deployment_status": self.get_deployment_status(),
+            "verification": verification
+        }
+    
     def verify_contracts(self) -> Dict[str, bool]:
         """Verify all deployed contracts are functioning"""
         status = self.get_deployment_status()
         verification = {}
         
         for contract_name, info in status.items():
-            if not info["deployed"]:
+            # ABIs are memoized per build, so this does not re-read out/
+            if not info["deployed"] or not self.extract_abi(contract_name):
                 verification[contract_name] = False
                 continue
             
-            address = info["address"]
-            try:
-                # Try to read a function from the contract
-                abi = self.extract_abi(contract_name)
-                if not abi:
-                    verification[contract_name] = False
-                    continue
-                
-                contract = self.w3.eth.contract(
-                    address=Web3.to_checksum_address(address),
-                    abi=abi
-                )
-                
-                # Try to call a view function
-                if contract_name == "SaraktLandV2":
-                    try:
-                        contract.functions.TOTAL_PLOTS().call()
-                        verification[contract_name] = True
-                    except:
-                        verification[contract_name] = False
-                elif contract_name == "SaraktDigitalID":
-                    verification[contract_name] = True  # Can't easily verify without owner
-                elif contract_name == "SaraktTreasury":
-                    try:
-                        contract.functions.balanceAVAX().call()
-                        verification[contract_name] = True
-                    except:
-                        verification[contract_name] = False
-                else:
-                    verification[contract_name] = True
-                    
-            except Exception as e:
-                print(f"Verification error for {contract_name}: {e}")
-                verification[contract_name] = False
+            # The status probe already ran the view check (SaraktLandV2.TOTAL_PLOTS,
+            # SaraktTreasury.balanceAVAX); contracts without one only need code
+            verification[contract_name] = info["responsive"] is not False
         
         return verification
     
-    def setup_and_deploy(self) -> Dict:
-        """Complete setup: check, compile, deploy if needed"""
+    def setup_and_deploy(self, deterministic: bool = False, salt: str = DEPLOY_SALT) -> Dict:
+        """Complete setup: check, compile, deploy if needed (at CREATE2 addresses when deterministic)"""
         print("=== Contract Management System ===\n")
         
         # Check current status
@@ -388,7 +542,9 @@ class ContractManager:
             if info["required"]
         )
         
-        if all_deployed:
+        # The existing registry may point elsewhere; deterministic runs check the CREATE2
+        # addresses instead (deploy_deterministic skips forge when they all have code)
+        if all_deployed and not deterministic:
             print("\n✓ All required contracts are deployed!")
             return {
                 "status": "deployed",
@@ -397,9 +553,12 @@ class ContractManager:
             }
         
         # Deploy missing contracts
-        print("\n⚠ Some contracts are not deployed. Starting deployment...")
+        if deterministic:
+            print("\nChecking the deterministic addresses...")
+        else:
+            print("\n⚠ Some contracts are not deployed. Starting deployment...")
         try:
-            addresses = self.deploy_all_contracts()
+            addresses = self.deploy_deterministic(salt) if deterministic else self.deploy_all_contracts()
             
             # Verify deployment
             print("\n=== Verifying Deployment ===")
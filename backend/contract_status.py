@@ -0,0 +1,139 @@
+"""
+Batched Contract Status Probe
+Checks code and a view call for every deployed contract in one JSON-RPC round
+trip, and reuses the answer until the chain moves to a new block
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Tuple
+
+from web3 import Web3
+
+try:
+    from .rpc_batch import batch_call, RpcBatchError
+except ImportError:
+    from rpc_batch import batch_call, RpcBatchError
+
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# View function that proves a contract responds (contracts without one only need code)
+VIEW_CHECKS = {
+    "SaraktLandV2": "TOTAL_PLOTS()",
+    "SaraktTreasury": "balanceAVAX()",
+}
+
+# Within this window a probe is answered without asking the node for the block number
+STATUS_MIN_INTERVAL = float(os.getenv("CONTRACT_STATUS_MIN_INTERVAL", "1"))
+
+_SELECTORS = {name: Web3.to_hex(Web3.keccak(text=signature)[:4]) for name, signature in VIEW_CHECKS.items()}
+
+
+@dataclass
+class ContractProbe:
+    """On-chain state of one contract address"""
+    address: str
+    has_code: bool = False
+    # None when the contract has no view check
+    view_ok: Optional[bool] = None
+    # Why the address could not be probed (e.g. it is malformed)
+    error: Optional[str] = None
+
+
+@dataclass
+class StatusSnapshot:
+    """Probe results for a set of addresses at one block"""
+    block_number: int
+    contracts: Dict[str, ContractProbe] = field(default_factory=dict)
+    checked_at: float = field(default_factory=time.monotonic)
+
+
+# (rpc_url, contracts) -> latest snapshot
+_snapshots: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], StatusSnapshot] = {}
+_probe_locks: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+def _has_code(code: Optional[str]) -> bool:
+    # More than just constructor bytecode
+    return bool(code) and len(bytes.fromhex(code[2:] if code.startswith("0x") else code)) > 4
+
+
+def _probe(rpc_url: str, contracts: Dict[str, str], block: str) -> Dict[str, ContractProbe]:
+    probes = {name: ContractProbe(address=address or "") for name, address in contracts.items()}
+    names = []
+    calls = []
+    for name, address in contracts.items():
+        if not address or address == ZERO_ADDRESS:
+            continue
+        try:
+            address = Web3.to_checksum_address(address)
+        except (ValueError, TypeError) as e:
+            # A bad entry in addresses.json is reported as not deployed rather than failing the probe
+            probes[name].error = f"Invalid address: {e}"
+            continue
+        names.append(name)
+        calls.append(("eth_getCode", [address, block]))
+        if name in _SELECTORS:
+            calls.append(("eth_call", [{"to": address, "data": _SELECTORS[name]}, block]))
+
+    results = iter(batch_call(rpc_url, calls) if calls else [])
+    for name in names:
+        probe = probes[name]
+        probe.has_code = _has_code(next(results))
+        if name in _SELECTORS:
+            # Always consume the call's slot; a reverted call comes back as an error (None)
+            call_result = next(results)
+            probe.view_ok = probe.has_code and call_result is not None
+    return probes
+
+
+def probe_contracts(rpc_url: str, contracts: Dict[str, str]) -> StatusSnapshot:
+    """
+    Code and view-call status for named contract addresses
+
+    The node is asked for the latest block number first; if it has not changed
+    since the last probe of the same addresses, the cached snapshot is returned.
+    Otherwise every getCode and view call is sent in a single batch pinned to
+    that block.
+
+    Args:
+        rpc_url: Node HTTP endpoint
+        contracts: Contract name -> address (empty or malformed addresses are
+            reported as not deployed; malformed ones with an error)
+
+    Raises:
+        RpcBatchError: If the node cannot be reached
+    """
+    key = (rpc_url, tuple(sorted((name, (address or "").lower()) for name, address in contracts.items())))
+    with _locks_lock:
+        lock = _probe_locks.setdefault(key, threading.Lock())
+
+    # Concurrent pollers of the same subnet share one probe
+    with lock:
+        snapshot = _snapshots.get(key)
+        if snapshot and time.monotonic() - snapshot.checked_at < STATUS_MIN_INTERVAL:
+            return snapshot
+
+        block_hex = batch_call(rpc_url, [("eth_blockNumber", [])])[0]
+        if block_hex is None:
+            raise RpcBatchError(f"Node at {rpc_url} did not return a block number")
+        block_number = int(block_hex, 16)
+
+        if snapshot and snapshot.block_number == block_number:
+            snapshot.checked_at = time.monotonic()
+            return snapshot
+
+        snapshot = StatusSnapshot(block_number=block_number, contracts=_probe(rpc_url, contracts, block_hex))
+        _snapshots[key] = snapshot
+        return snapshot
+
+
+def invalidate(rpc_url: Optional[str] = None):
+    """Drop cached snapshots (all of them, or those for one node)"""
+    with _locks_lock:
+        for key in list(_snapshots):
+            if rpc_url is None or key[0] == rpc_url:
+                _snapshots.pop(key, None)
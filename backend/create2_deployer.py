@@ -0,0 +1,119 @@
+"""
+Deterministic (CREATE2) Deployment Planning
+Computes the addresses scripts/deploy_deterministic.s.sol deploys the core suite to,
+without touching the chain, and checks which of them already hold code
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from eth_abi import encode
+from web3 import Web3
+
+try:
+    from .build_cache import BuildCache
+    from .rpc_batch import batch_call
+except ImportError:
+    from build_cache import BuildCache
+    from rpc_batch import batch_call
+
+
+DETERMINISTIC_SCRIPT_NAME = "deploy_deterministic.s.sol"
+
+# Forge sends `new X{salt: ...}` through this proxy (deterministic-deployment-proxy)
+CREATE2_PROXY = "0x4e59b44847b379578588920cA78FbF26c0B4956C"
+FACTORY_SALT = Web3.keccak(text="sarakt.create2-factory.v1")
+FACTORY_CONTRACT = "Create2Factory"
+
+# Changing the salt yields a fresh set of addresses
+DEPLOY_SALT = os.getenv("DEPLOY_SALT", "sarakt-v1")
+
+# Deployment order and registry key (must match deploy_deterministic.s.sol)
+SUITE: List[Tuple[str, str]] = [
+    ("SaraktDigitalID", "digitalID"),
+    ("DummyToken", "dummyToken"),
+    ("SaraktTreasury", "treasury"),
+    ("SaraktLandV2", "land"),
+]
+
+
+def create2_address(deployer: str, salt: bytes, init_code: bytes) -> str:
+    """Address of a CREATE2 deployment (EIP-1014)"""
+    digest = Web3.keccak(
+        b"\xff" + bytes.fromhex(deployer[2:]) + salt + Web3.keccak(init_code)
+    )
+    return Web3.to_checksum_address(digest[12:])
+
+
+@dataclass
+class DeterministicPlan:
+    """Where the suite lands for one deployer and salt"""
+    deployer: str
+    salt: str
+    factory: str
+    # registry key -> address
+    addresses: Dict[str, str] = field(default_factory=dict)
+
+
+def _constructor_args(contract_name: str, addresses: Dict[str, str]) -> bytes:
+    if contract_name == "DummyToken":
+        return encode(["string", "string"], ["Sarakt Token", "SAR"])
+    if contract_name == "SaraktTreasury":
+        return encode(["address[]"], [[addresses["dummyToken"]]])
+    if contract_name == "SaraktLandV2":
+        return encode(["address", "address"], [addresses["treasury"], addresses["digitalID"]])
+    return b""
+
+
+def _creation_code(build_cache: BuildCache, contract_name: str) -> bytes:
+    bytecode = build_cache.get_bytecode(contract_name)
+    if not bytecode:
+        raise Exception(f"No compiled bytecode for {contract_name}. Run 'forge build' first.")
+    return bytes.fromhex(bytecode[2:] if bytecode.startswith("0x") else bytecode)
+
+
+def plan_deployment(build_cache: BuildCache, deployer: str, salt: str = DEPLOY_SALT) -> DeterministicPlan:
+    """
+    Precompute the suite's addresses from the compiled artifacts
+
+    Raises:
+        Exception: If the contracts have not been compiled
+    """
+    deployer = Web3.to_checksum_address(deployer)
+    factory = create2_address(CREATE2_PROXY, FACTORY_SALT, _creation_code(build_cache, FACTORY_CONTRACT))
+    plan = DeterministicPlan(deployer=deployer, salt=salt, factory=factory)
+
+    for contract_name, key in SUITE:
+        contract_salt = Web3.keccak(text=f"{salt}:{contract_name}")
+        # Create2Factory binds the salt to the caller
+        caller_salt = Web3.keccak(bytes.fromhex(deployer[2:]) + contract_salt)
+        init_code = _creation_code(build_cache, contract_name) + _constructor_args(contract_name, plan.addresses)
+        plan.addresses[key] = create2_address(factory, caller_salt, init_code)
+
+    return plan
+
+
+def missing_contracts(rpc_url: str, plan: DeterministicPlan) -> List[str]:
+    """Registry keys in the plan with no code on chain yet (one batched getCode)"""
+    keys = list(plan.addresses)
+    codes = batch_call(rpc_url, [("eth_getCode", [plan.addresses[key], "latest"]) for key in keys])
+    return [key for key, code in zip(keys, codes) if not code or code == "0x"]
+
+
+def check_factory(rpc_url: str, plan: DeterministicPlan):
+    """
+    Make sure the factory exists or forge can place it through the CREATE2 proxy
+
+    Raises:
+        Exception: If neither the factory nor the proxy has code on this chain
+    """
+    factory_code, proxy_code = batch_call(rpc_url, [
+        ("eth_getCode", [plan.factory, "latest"]),
+        ("eth_getCode", [CREATE2_PROXY, "latest"]),
+    ])
+    if (factory_code and factory_code != "0x") or (proxy_code and proxy_code != "0x"):
+        return
+    raise Exception(
+        f"Chain has no CREATE2 deployment proxy at {CREATE2_PROXY}. "
+        "Add it to the subnet genesis or deploy with deploy_all.s.sol instead."
+    )
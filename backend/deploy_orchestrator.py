@@ -0,0 +1,276 @@
+"""
+Multi-Subnet Deployment Orchestrator
+Compiles the contract suite once and rolls deploy_all.s.sol out to many subnets in
+parallel, tracking progress per subnet
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, List, Any
+
+try:
+    from .build_cache import get_build_cache
+    from .job_runner import get_job_manager, Job, JOB_SUCCEEDED
+except ImportError:
+    from build_cache import get_build_cache
+    from job_runner import get_job_manager, Job, JOB_SUCCEEDED
+
+
+# Subnets deployed at the same time within one rollout (overridable from the environment)
+DEPLOY_MAX_PARALLEL = int(os.getenv("DEPLOY_MAX_PARALLEL", "8"))
+MAX_FINISHED_ROLLOUTS = 50
+
+# Rollout and per-subnet states
+ROLLOUT_COMPILING = "compiling"
+ROLLOUT_DEPLOYING = "deploying"
+ROLLOUT_COMPLETED = "completed"
+ROLLOUT_FAILED = "failed"
+ROLLOUT_CANCELLED = "cancelled"
+
+TARGET_PENDING = "pending"
+TARGET_RUNNING = "running"
+TARGET_SUCCEEDED = "succeeded"
+TARGET_FAILED = "failed"
+TARGET_SKIPPED = "skipped"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class DeploymentTarget:
+    """Progress of one subnet within a rollout"""
+
+    def __init__(self, subnet_name: str):
+        self.subnet_name = subnet_name
+        self.status = TARGET_PENDING
+        self.job_id: Optional[str] = None
+        self.rpc_url: Optional[str] = None
+        self.addresses: Dict[str, str] = {}
+        self.error: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._addresses_out: Optional[Path] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (TARGET_SUCCEEDED, TARGET_FAILED, TARGET_SKIPPED)
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        self.finished_at = _now()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "subnet_name": self.subnet_name,
+            "status": self.status,
+            "job_id": self.job_id,
+            "rpc_url": self.rpc_url,
+            "addresses": self.addresses,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class Rollout:
+    """One contract suite deployment across many subnets"""
+
+    def __init__(self, subnets: List[str], max_parallel: int):
+        self.id = str(uuid.uuid4())
+        self.max_parallel = max(1, max_parallel)
+        self.targets: Dict[str, DeploymentTarget] = {name: DeploymentTarget(name) for name in subnets}
+        self.status = ROLLOUT_COMPILING
+        self.error: Optional[str] = None
+        self.build: Optional[Dict[str, Any]] = None
+        self.created_at = _now()
+        self.finished_at: Optional[str] = None
+        self._started = time.monotonic()
+        self._duration: Optional[float] = None
+        self._cancel_requested = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ROLLOUT_COMPLETED, ROLLOUT_FAILED, ROLLOUT_CANCELLED)
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        if error:
+            self.error = error
+        self.finished_at = _now()
+        self._duration = time.monotonic() - self._started
+
+    def counts(self) -> Dict[str, int]:
+        counts = {state: 0 for state in (TARGET_PENDING, TARGET_RUNNING, TARGET_SUCCEEDED, TARGET_FAILED, TARGET_SKIPPED)}
+        for target in self.targets.values():
+            counts[target.status] += 1
+        return counts
+
+    def to_dict(self, include_targets: bool = True) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "max_parallel": self.max_parallel,
+            "build": self.build,
+            "total": len(self.targets),
+            "progress": self.counts(),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(self._duration if self._duration is not None else time.monotonic() - self._started, 2),
+        }
+        if include_targets:
+            data["targets"] = [target.to_dict() for target in self.targets.values()]
+        return data
+
+
+class DeploymentOrchestrator:
+    """Starts and tracks multi-subnet rollouts"""
+
+    def __init__(self, project_root: Path = None):
+        self.project_root = Path(project_root or Path(__file__).parent.parent)
+        self._rollouts: Dict[str, Rollout] = {}
+        self._lock = threading.Lock()
+
+    def start(self, subnets: List[str], max_parallel: int = DEPLOY_MAX_PARALLEL) -> Rollout:
+        """Queue a rollout and run it in the background"""
+        subnets = list(dict.fromkeys(name for name in subnets if name))
+        if not subnets:
+            raise ValueError("At least one subnet is required")
+
+        rollout = Rollout(subnets, max_parallel)
+        with self._lock:
+            self._rollouts[rollout.id] = rollout
+            self._prune_finished()
+
+        thread = threading.Thread(target=self._run, args=(rollout,), name=f"rollout-{rollout.id[:8]}", daemon=True)
+        thread.start()
+        return rollout
+
+    def get(self, rollout_id: str) -> Optional[Rollout]:
+        return self._rollouts.get(rollout_id)
+
+    def list(self) -> List[Rollout]:
+        return sorted(self._rollouts.values(), key=lambda rollout: rollout.created_at, reverse=True)
+
+    def cancel(self, rollout_id: str) -> Optional[Rollout]:
+        """Stop starting new subnets and cancel the deploy jobs still running"""
+        rollout = self.get(rollout_id)
+        if not rollout or rollout.finished:
+            return rollout
+
+        rollout._cancel_requested = True
+        for target in rollout.targets.values():
+            if target.job_id and not target.finished:
+                get_job_manager().cancel(target.job_id)
+        return rollout
+
+    def _prune_finished(self):
+        finished = [rollout for rollout in self._rollouts.values() if rollout.finished]
+        if len(finished) <= MAX_FINISHED_ROLLOUTS:
+            return
+        finished.sort(key=lambda rollout: rollout.finished_at or "")
+        for rollout in finished[:len(finished) - MAX_FINISHED_ROLLOUTS]:
+            self._rollouts.pop(rollout.id, None)
+
+    def _run(self, rollout: Rollout):
+        try:
+            # 1. Compile once for every subnet
+            build = get_build_cache(self.project_root).ensure_built(timeout=300)
+            rollout.build = {
+                "cached": build.cached,
+                "source_hash": build.source_hash,
+                "duration_seconds": round(build.duration, 2),
+            }
+            if not build.success:
+                rollout.finish(ROLLOUT_FAILED, f"Compilation failed: {build.stderr[-2000:]}")
+                return
+
+            # 2. Fan out, keeping at most max_parallel subnets in flight
+            rollout.status = ROLLOUT_DEPLOYING
+            running: Dict[str, Job] = {}
+            pending = list(rollout.targets.values())
+
+            while pending or running:
+                while pending and len(running) < rollout.max_parallel and not rollout._cancel_requested:
+                    target = pending.pop(0)
+                    job = self._start_target(target)
+                    if job:
+                        running[target.subnet_name] = job
+
+                for subnet_name, job in list(running.items()):
+                    if job.finished:
+                        self._finish_target(rollout.targets[subnet_name], job)
+                        del running[subnet_name]
+
+                if rollout._cancel_requested:
+                    for target in pending:
+                        target.finish(TARGET_SKIPPED, "Rollout cancelled")
+                    pending = []
+
+                if running:
+                    time.sleep(0.5)
+
+            if rollout._cancel_requested:
+                rollout.finish(ROLLOUT_CANCELLED, "Cancelled by request")
+            elif any(target.status == TARGET_FAILED for target in rollout.targets.values()):
+                rollout.finish(ROLLOUT_FAILED, "One or more subnets failed to deploy")
+            else:
+                rollout.finish(ROLLOUT_COMPLETED)
+        except Exception as e:
+            rollout.finish(ROLLOUT_FAILED, str(e))
+
+    def _start_target(self, target: DeploymentTarget) -> Optional[Job]:
+        target.status = TARGET_RUNNING
+        target.started_at = _now()
+        try:
+            try:
+                from .subnet_contract_manager import SubnetContractManager
+            except ImportError:
+                from subnet_contract_manager import SubnetContractManager
+
+            manager = SubnetContractManager(target.subnet_name)
+            target.rpc_url = manager.rpc_url
+
+            # Each job writes its own file; it only replaces addresses.json once it succeeds
+            addresses_out = manager.deployments_dir / f".addresses.{uuid.uuid4().hex}.json"
+            target._addresses_out = addresses_out
+            job = get_job_manager().submit(
+                "rollout_deploy",
+                manager.build_deploy_steps(addresses_out),
+                subnet=target.subnet_name,
+                # Deployments sharing a chain must not interleave their nonces
+                concurrency_key=manager.rpc_url,
+                on_success=lambda job: manager.complete_deployment(addresses_out, job)
+            )
+            target.job_id = job.id
+            return job
+        except Exception as e:
+            target.finish(TARGET_FAILED, str(e))
+            return None
+
+    @staticmethod
+    def _finish_target(target: DeploymentTarget, job: Job):
+        if job.status == JOB_SUCCEEDED:
+            target.addresses = job.result or {}
+            target.finish(TARGET_SUCCEEDED)
+        else:
+            if target._addresses_out:
+                target._addresses_out.unlink(missing_ok=True)
+            target.finish(TARGET_FAILED, job.error or f"Deploy job {job.status}")
+
+
+# Global instance
+_orchestrator: Optional[DeploymentOrchestrator] = None
+
+
+def get_deployment_orchestrator() -> DeploymentOrchestrator:
+    """Get or create the global deployment orchestrator"""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = DeploymentOrchestrator()
+    return _orchestrator
@@ -0,0 +1,158 @@
+"""
+Deployment Result Pipeline
+Reads forge's broadcast record for a chain, confirms the contract creations with
+one batched receipt lookup and updates the address registry atomically
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, List
+
+try:
+    from .rpc_batch import batch_call, RpcBatchError
+except ImportError:
+    from rpc_batch import batch_call, RpcBatchError
+
+
+DEPLOY_SCRIPT_NAME = "deploy_all.s.sol"
+
+# Contract name in the broadcast -> key in deployments/**/addresses.json
+REGISTRY_KEYS = {
+    "SaraktDigitalID": "digitalID",
+    "SaraktTreasury": "treasury",
+    "SaraktLandV2": "land",
+    "DummyToken": "dummyToken",
+    "PlotRegistry1155": "plotRegistry",
+    "AccountRegistry": "accountRegistry",
+}
+
+
+@dataclass
+class ContractCreation:
+    """A contract created by a broadcast transaction"""
+    contract_name: str
+    address: str
+    tx_hash: Optional[str]
+    confirmed: bool = False
+
+
+@dataclass
+class DeploymentResult:
+    """Addresses produced by one forge script run"""
+    addresses: Dict[str, str]
+    creations: List[ContractCreation] = field(default_factory=list)
+    source: str = "broadcast"  # "broadcast" or "script_output"
+
+    @property
+    def unconfirmed(self) -> List[str]:
+        return [creation.contract_name for creation in self.creations if not creation.confirmed]
+
+
+def broadcast_path(project_root: Path, chain_id: int, script_name: str = DEPLOY_SCRIPT_NAME) -> Path:
+    """Forge's record of the latest broadcast of script_name to chain_id"""
+    return Path(project_root) / "broadcast" / script_name / str(chain_id) / "run-latest.json"
+
+
+def read_broadcast(path: Path) -> List[ContractCreation]:
+    """Contract creations in a forge broadcast file"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    creations = []
+    for tx in data.get("transactions", []):
+        if tx.get("transactionType") not in ("CREATE", "CREATE2"):
+            continue
+        address = tx.get("contractAddress")
+        if not address:
+            continue
+        creations.append(ContractCreation(
+            contract_name=tx.get("contractName") or "",
+            address=address,
+            tx_hash=tx.get("hash")
+        ))
+    return creations
+
+
+def confirm_creations(rpc_url: str, creations: List[ContractCreation]):
+    """Mark creations whose receipt succeeded and created the expected address (one batch call)"""
+    pending = [creation for creation in creations if creation.tx_hash]
+    if not pending:
+        return
+
+    receipts = batch_call(rpc_url, [("eth_getTransactionReceipt", [creation.tx_hash]) for creation in pending])
+    for creation, receipt in zip(pending, receipts):
+        creation.confirmed = bool(
+            receipt
+            and receipt.get("status") == "0x1"
+            and (receipt.get("contractAddress") or "").lower() == creation.address.lower()
+        )
+
+
+def collect_deployment(
+    project_root: Path,
+    chain_id: int,
+    rpc_url: str,
+    started_at: Optional[float] = None,
+    script_output: Optional[Path] = None,
+    script_name: str = DEPLOY_SCRIPT_NAME
+) -> DeploymentResult:
+    """
+    Resolve the addresses deployed by the latest forge script run
+
+    Args:
+        project_root: Foundry project root (holds broadcast/)
+        chain_id: Chain the script was broadcast to
+        rpc_url: Node used to confirm the creation receipts
+        started_at: time.time() before forge started; older broadcast files are ignored
+        script_output: Addresses file written by the script, used if there is no broadcast
+        script_name: Broadcast script file name
+
+    Raises:
+        Exception: If no deployed addresses can be resolved
+    """
+    path = broadcast_path(project_root, chain_id, script_name)
+    if path.exists() and (started_at is None or path.stat().st_mtime >= started_at):
+        creations = read_broadcast(path)
+        try:
+            confirm_creations(rpc_url, creations)
+        except RpcBatchError as e:
+            print(f"Warning: Could not confirm deployment receipts: {e}")
+
+        addresses = {
+            REGISTRY_KEYS[creation.contract_name]: creation.address
+            for creation in creations
+            if creation.confirmed and creation.contract_name in REGISTRY_KEYS
+        }
+        if addresses:
+            return DeploymentResult(addresses=addresses, creations=creations)
+
+    if script_output and script_output.exists():
+        with open(script_output, 'r') as f:
+            addresses = {name: address for name, address in json.load(f).items() if address}
+        if addresses:
+            return DeploymentResult(addresses=addresses, source="script_output")
+
+    raise Exception(
+        f"Deployment completed but no confirmed contract creations were found in {path}. Check forge output."
+    )
+
+
+def write_registry(addresses_file: Path, addresses: Dict[str, str], merge: bool = True) -> Dict[str, str]:
+    """Write an addresses.json atomically (readers never see a partial file)"""
+    registry: Dict[str, str] = {}
+    if merge and addresses_file.exists():
+        try:
+            with open(addresses_file, 'r') as f:
+                registry = json.load(f)
+        except (OSError, ValueError):
+            registry = {}
+    registry.update(addresses)
+
+    addresses_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = addresses_file.with_name(f".{addresses_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp_file, addresses_file)
+    return registry
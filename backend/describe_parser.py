@@ -0,0 +1,474 @@
+"""
+Avalanche CLI Output Parser
+Table-aware tokenizer and typed parsers for 'blockchain describe', 'subnet describe'
+and 'network status' output, plus readers for the CLI's JSON sidecar files
+"""
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List, TypedDict
+
+
+# Precompiled patterns
+_STATUS_LINE_RE = re.compile(r"^([A-Za-z][A-Za-z ]*?):\s*(.*)$")
+_INT_RE = re.compile(r"-?\d+")
+_URL_RE = re.compile(r"https?://\S+")
+_LOCAL_HOST_RE = re.compile(r"//(127\.0\.0\.1|localhost|0\.0\.0\.0)[:/]")
+
+# Network labels as printed in describe tables
+_NETWORK_LABELS = ("Local Network", "Fuji", "Mainnet", "Devnet", "Cluster")
+# 'subnet describe' historically reported shortened network names
+_SHORT_NETWORK_NAMES = {"Local Network": "Local"}
+
+_NOT_SET = ("", "n/a", "N/A", "-")
+
+
+class NodeInfo(TypedDict):
+    name: str
+    node_id: str
+    endpoint: str
+
+
+class PrecompileConfig(TypedDict):
+    admin_addresses: Optional[str]
+    manager_addresses: Optional[str]
+    enabled_addresses: Optional[str]
+
+
+class AllocationEntry(TypedDict):
+    description: str
+    address: Optional[str]
+    amount: Optional[str]
+
+
+class BlockchainDescribe(TypedDict):
+    name: str
+    vm_id: str
+    vm_version: str
+    validation: str
+    networks: Dict[str, Dict[str, str]]
+    icm: Dict[str, str]
+    token: Dict[str, str]
+    initial_allocation: List[AllocationEntry]
+    rpc_urls: Dict[str, str]
+    primary_nodes: List[NodeInfo]
+    l1_nodes: List[NodeInfo]
+    precompile_configs: Dict[str, PrecompileConfig]
+    wallet_connection: Dict[str, str]
+
+
+class SubnetDescribe(TypedDict):
+    name: Optional[str]
+    vm_id: Optional[str]
+    vm_version: Optional[str]
+    validation: Optional[str]
+    networks: Dict[str, Dict[str, str]]
+    icm: Dict[str, str]
+    token: Dict[str, str]
+    initial_allocation: List[AllocationEntry]
+
+
+class NetworkStatus(TypedDict):
+    is_up: bool
+    nodes: int
+    custom_vms: int
+    network_healthy: bool
+    custom_vms_healthy: bool
+    rpc_urls: Dict[str, str]
+    primary_nodes: List[NodeInfo]
+    l1_nodes: List[NodeInfo]
+
+
+@dataclass
+class TableRow:
+    """One data row of an ASCII table"""
+    section: str          # Upper-cased title of the enclosing table section ("" if none)
+    cells: List[str]      # Stripped cell values
+    group: str            # First cell, carried down from the previous row when blank
+
+
+@dataclass
+class TokenizedOutput:
+    """CLI output split into table rows and 'Key: value' status lines"""
+    rows: List[TableRow]
+    status: Dict[str, str]
+    sections: Dict[str, List[TableRow]]
+
+    def section(self, *keywords: str) -> List[TableRow]:
+        """Rows of every section whose title contains all keywords"""
+        matched: List[TableRow] = []
+        for title, rows in self.sections.items():
+            if all(keyword in title for keyword in keywords):
+                matched.extend(rows)
+        return matched
+
+
+def tokenize(output: str) -> TokenizedOutput:
+    """
+    Tokenize CLI output in a single pass
+
+    Table rows are split into cells. A row with a single cell is a section title
+    and applies to the rows that follow it. Rows with an empty first cell continue
+    the group of the previous row (e.g. the network a SubnetID belongs to).
+    """
+    rows: List[TableRow] = []
+    status: Dict[str, str] = {}
+    sections: Dict[str, List[TableRow]] = {}
+    section = ""
+    group = ""
+    # Rows only count inside a bordered table, which keeps ASCII-art banners out
+    in_table = False
+
+    for raw in output.splitlines():
+        line = raw.strip()
+        if not line:
+            in_table = False
+            continue
+
+        # Borders, including partial separators like "|    +-----+"
+        if line[0] == "+" or (line[0] == "|" and "+-" in line):
+            in_table = True
+            continue
+
+        if line[0] == "|" and line[-1] == "|" and len(line) > 1:
+            if not in_table:
+                continue
+            cells = [cell.strip() for cell in line[1:-1].split("|")]
+            if len(cells) == 1:
+                section = cells[0].upper()
+                group = ""
+                continue
+            if cells[0]:
+                group = cells[0]
+            row = TableRow(section=section, cells=cells, group=group)
+            rows.append(row)
+            sections.setdefault(section, []).append(row)
+            continue
+
+        in_table = False
+        match = _STATUS_LINE_RE.match(line)
+        if match:
+            status[match.group(1).strip()] = match.group(2).strip()
+
+    return TokenizedOutput(rows=rows, status=status, sections=sections)
+
+
+def _optional(value: str) -> Optional[str]:
+    return None if value in _NOT_SET else value
+
+
+def _to_int(value: Optional[str]) -> int:
+    if not value:
+        return 0
+    match = _INT_RE.search(value)
+    return int(match.group(0)) if match else 0
+
+
+def _is_header(cells: List[str]) -> bool:
+    """Column header rows are all upper case and carry no values"""
+    return all(cell == cell.upper() for cell in cells if cell) and not any(
+        cell.startswith(("NodeID-", "http", "0x")) for cell in cells
+    )
+
+
+def _parse_nodes(rows: List[TableRow]) -> List[NodeInfo]:
+    nodes: List[NodeInfo] = []
+    columns: Dict[str, int] = {}
+
+    for row in rows:
+        cells = row.cells
+        if _is_header(cells):
+            columns = {}
+            for index, title in enumerate(cells):
+                if "NODE ID" in title or title == "NODEID":
+                    columns["node_id"] = index
+                elif "ENDPOINT" in title or "URL" in title:
+                    columns["endpoint"] = index
+                elif title in ("NAME", "L1", "BLOCKCHAIN"):
+                    columns.setdefault("name", index)
+            continue
+
+        if columns:
+            def cell(key: str) -> str:
+                index = columns.get(key)
+                return cells[index] if index is not None and index < len(cells) else ""
+            node = NodeInfo(name=cell("name"), node_id=cell("node_id"), endpoint=cell("endpoint"))
+        elif len(cells) >= 3:
+            node = NodeInfo(name=cells[0], node_id=cells[1], endpoint=cells[2])
+        else:
+            continue
+
+        if node["node_id"] or node["endpoint"]:
+            nodes.append(node)
+
+    return nodes
+
+
+def _parse_rpc_urls(rows: List[TableRow]) -> Dict[str, str]:
+    rpc_urls: Dict[str, str] = {}
+    for row in rows:
+        for index in range(len(row.cells) - 1, -1, -1):
+            if _URL_RE.match(row.cells[index]):
+                location = row.cells[index - 1] if index > 0 else row.group
+                rpc_urls[(location or "default").lower()] = row.cells[index]
+                break
+    return rpc_urls
+
+
+def _parse_allocation(rows: List[TableRow]) -> List[AllocationEntry]:
+    allocation: List[AllocationEntry] = []
+    for row in rows:
+        if _is_header(row.cells):
+            continue
+        values = row.cells[1:]
+        if row.cells[0]:
+            allocation.append(AllocationEntry(
+                description=row.cells[0],
+                address=None,
+                amount=_optional(values[-1]) if len(values) >= 2 else None
+            ))
+        if not allocation:
+            continue
+        entry = allocation[-1]
+        # Key names, addresses and private keys are stacked in the middle column;
+        # only the 20-byte address is kept
+        for value in values[:-1] if len(values) >= 2 else values:
+            if value.startswith("0x") and len(value) == 42 and not entry["address"]:
+                entry["address"] = value
+    return allocation
+
+
+def _parse_networks(rows: List[TableRow], short_names: bool = False) -> Dict[str, Dict[str, str]]:
+    networks: Dict[str, Dict[str, str]] = {}
+    for row in rows:
+        if len(row.cells) < 3 or not row.group.startswith(_NETWORK_LABELS):
+            continue
+        name = _SHORT_NETWORK_NAMES.get(row.group, row.group) if short_names else row.group
+        key, value = row.cells[-2], row.cells[-1]
+        if key:
+            networks.setdefault(name, {})[key] = value
+    return networks
+
+
+def _parse_icm(rows: List[TableRow]) -> Dict[str, str]:
+    icm: Dict[str, str] = {}
+    for row in rows:
+        if len(row.cells) < 2:
+            continue
+        key, value = row.cells[-2], row.cells[-1]
+        if "Messenger" in key:
+            icm["messenger_address"] = value
+        elif "Registry" in key:
+            icm["registry_address"] = value
+    return icm
+
+
+def _key_value(rows: List[TableRow]) -> Dict[str, str]:
+    """Two-column rows as a {"snake_case_key": value} dict"""
+    return {
+        row.cells[0].lower().replace(" ", "_"): row.cells[1]
+        for row in rows
+        if len(row.cells) == 2 and row.cells[0]
+    }
+
+
+def _token_rows(tokens: TokenizedOutput) -> List[TableRow]:
+    """Rows of the TOKEN section (not the INITIAL TOKEN ALLOCATION section)"""
+    return [row for row in tokens.section("TOKEN") if "ALLOCATION" not in row.section]
+
+
+def _parse_json(output: str) -> Optional[Dict[str, Any]]:
+    """Return the decoded object when the CLI printed JSON instead of tables"""
+    text = output.lstrip()
+    if not text.startswith("{"):
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_blockchain_describe(output: str) -> BlockchainDescribe:
+    """Parse 'avalanche blockchain describe' output (tables or sidecar JSON)"""
+    data = _parse_json(output)
+    if data is not None:
+        return describe_from_sidecar(data)
+
+    tokens = tokenize(output)
+    parsed = BlockchainDescribe(
+        name="",
+        vm_id="",
+        vm_version="",
+        validation="",
+        networks={},
+        icm={},
+        token={},
+        initial_allocation=[],
+        rpc_urls={},
+        primary_nodes=[],
+        l1_nodes=[],
+        precompile_configs={},
+        wallet_connection={}
+    )
+
+    # The first section is titled with the blockchain name
+    info_rows = tokens.sections.get(tokens.rows[0].section, []) if tokens.rows else []
+    info = _key_value(info_rows)
+    parsed["name"] = info.get("name", "")
+    parsed["vm_id"] = info.get("vm_id", "")
+    parsed["vm_version"] = info.get("vm_version", "")
+    parsed["validation"] = info.get("validation", "")
+    parsed["networks"] = _parse_networks(info_rows)
+
+    parsed["icm"] = _parse_icm(tokens.section("ICM"))
+    parsed["token"] = _key_value(_token_rows(tokens))
+    parsed["initial_allocation"] = _parse_allocation(tokens.section("ALLOCATION"))
+    parsed["rpc_urls"] = _parse_rpc_urls(tokens.section("RPC URL"))
+    parsed["primary_nodes"] = _parse_nodes(tokens.section("PRIMARY NODES"))
+    parsed["l1_nodes"] = _parse_nodes(tokens.section("L1 NODES"))
+    parsed["wallet_connection"] = _key_value(tokens.section("WALLET CONNECTION"))
+
+    for row in tokens.section("PRECOMPILE"):
+        if len(row.cells) < 4 or not row.cells[0] or _is_header(row.cells):
+            continue
+        parsed["precompile_configs"][row.cells[0]] = PrecompileConfig(
+            admin_addresses=_optional(row.cells[1]),
+            manager_addresses=_optional(row.cells[2]),
+            enabled_addresses=_optional(row.cells[3])
+        )
+
+    return parsed
+
+
+def parse_subnet_describe(output: str) -> SubnetDescribe:
+    """Parse 'avalanche subnet describe' output"""
+    data = _parse_json(output)
+    if data is not None:
+        described = describe_from_sidecar(data)
+        return SubnetDescribe(
+            name=described["name"] or None,
+            vm_id=described["vm_id"] or None,
+            vm_version=described["vm_version"] or None,
+            validation=described["validation"] or None,
+            networks={
+                _SHORT_NETWORK_NAMES.get(name, name): values
+                for name, values in described["networks"].items()
+            },
+            icm=described["icm"],
+            token={key.replace("token_", ""): value for key, value in described["token"].items()},
+            initial_allocation=[]
+        )
+
+    tokens = tokenize(output)
+    info_rows = tokens.sections.get(tokens.rows[0].section, []) if tokens.rows else []
+    info = _key_value(info_rows)
+
+    token_rows = _token_rows(tokens)
+    return SubnetDescribe(
+        name=info.get("name"),
+        vm_id=info.get("vm_id") or info.get("vmid"),
+        vm_version=info.get("vm_version"),
+        validation=info.get("validation"),
+        networks=_parse_networks(info_rows, short_names=True),
+        icm=_parse_icm(tokens.section("ICM")),
+        token={key.replace("token_", ""): value for key, value in _key_value(token_rows).items()},
+        initial_allocation=_parse_allocation(tokens.section("ALLOCATION"))
+    )
+
+
+def parse_network_status(output: str) -> NetworkStatus:
+    """Parse 'avalanche network status' output"""
+    tokens = tokenize(output)
+    status = tokens.status
+
+    rpc_urls = _parse_rpc_urls(tokens.section("RPC URL"))
+    # Older CLI versions print a single "Localhost | <url>" row without a section title
+    if not rpc_urls:
+        for row in tokens.rows:
+            if any(cell.lower() == "localhost" for cell in row.cells):
+                rpc_urls.update(_parse_rpc_urls([row]))
+
+    return NetworkStatus(
+        is_up="Network is Up" in status or any(key.startswith("Network is Up") for key in status),
+        nodes=_to_int(status.get("Number of Nodes")),
+        custom_vms=_to_int(status.get("Number of Custom VMs") or status.get("Number of Blockchains")),
+        network_healthy=status.get("Network Healthy", "").lower() == "true",
+        custom_vms_healthy=(
+            status.get("Custom VMs Healthy") or status.get("Blockchains Healthy") or ""
+        ).lower() == "true",
+        rpc_urls=rpc_urls,
+        primary_nodes=_parse_nodes(tokens.section("PRIMARY NODES")),
+        l1_nodes=_parse_nodes(tokens.section("L1 NODES"))
+    )
+
+
+def describe_from_sidecar(sidecar: Dict[str, Any]) -> BlockchainDescribe:
+    """Build a describe result from a CLI sidecar.json (the CLI's own JSON record of a blockchain)"""
+    networks: Dict[str, Dict[str, str]] = {}
+    rpc_urls: Dict[str, str] = {}
+    icm: Dict[str, str] = {}
+
+    for network_name, network in (sidecar.get("Networks") or {}).items():
+        if not isinstance(network, dict):
+            continue
+        values: Dict[str, str] = {}
+        if sidecar.get("ChainID"):
+            values["ChainID"] = str(sidecar["ChainID"])
+        for key in ("SubnetID", "BlockchainID", "ValidatorManagerAddress"):
+            if network.get(key):
+                values[key] = str(network[key])
+
+        endpoints = network.get("RPCEndpoints") or []
+        if endpoints:
+            values["RPC Endpoint"] = endpoints[0]
+            for url in endpoints:
+                location = "localhost" if _LOCAL_HOST_RE.search(url) else network_name.lower()
+                rpc_urls.setdefault(location, url)
+
+        messenger = network.get("TeleporterMessengerAddress") or network.get("ICMMessengerAddress")
+        registry = network.get("TeleporterRegistryAddress") or network.get("ICMRegistryAddress")
+        if messenger:
+            icm["messenger_address"] = messenger
+        if registry:
+            icm["registry_address"] = registry
+
+        networks[network_name] = values
+
+    token: Dict[str, str] = {}
+    if sidecar.get("TokenName"):
+        token["token_name"] = sidecar["TokenName"]
+    if sidecar.get("TokenSymbol"):
+        token["token_symbol"] = sidecar["TokenSymbol"]
+
+    validation = "Proof Of Stake" if sidecar.get("PoS") else ("Proof Of Authority" if sidecar.get("PoA") else "")
+
+    return BlockchainDescribe(
+        name=sidecar.get("Name") or sidecar.get("Subnet") or "",
+        vm_id=sidecar.get("ImportedVMID") or sidecar.get("VMID") or "",
+        vm_version=sidecar.get("VMVersion") or "",
+        validation=validation,
+        networks=networks,
+        icm=icm,
+        token=token,
+        initial_allocation=[],
+        rpc_urls=rpc_urls,
+        primary_nodes=[],
+        l1_nodes=[],
+        precompile_configs={},
+        wallet_connection={}
+    )
+
+
+def load_sidecar(subnet_name: str, avalanche_home: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Read ~/.avalanche-cli/subnets/<name>/sidecar.json if present"""
+    home = avalanche_home or (Path.home() / ".avalanche-cli")
+    sidecar_file = home / "subnets" / subnet_name / "sidecar.json"
+    if not sidecar_file.exists():
+        return None
+    try:
+        data = json.loads(sidecar_file.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
@@ -2,6 +2,12 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Dict, List, Literal, Optional
 
+import numpy as np
+
+from economy_engine import get_economy_engine
+from seeding import draw_seed
+from treasury_simulator import simulate_inflation, CONTROLLER_CLAMP, DEFAULT_PERCENTILES
+
 # Simple in-memory state for prototyping; replace with Supabase/DB later
 _treasury_state = {
 	"planet": {
@@ -52,6 +58,27 @@ class InflationAdjustmentRequest(BaseModel):
 	current_utilization_ratio: float = Field(..., gt=0.0)
 
 
+# Upper bound on periods x scenarios per simulation request
+MAX_SIMULATION_STEPS = 10_000_000
+
+
+class InflationSimulationRequest(BaseModel):
+	# Growth plus the most negative controller bias must stay above -100%
+	target_growth_rate_annual: float = Field(..., gt=-1.0 + CONTROLLER_CLAMP, le=10.0, description="e.g. 0.02 = 2%")
+	initial_utilization_ratio: float = Field(1.0, gt=0.0)
+	initial_coverage_ratio: Optional[float] = Field(None, gt=0.0, description="Defaults to the planet's current coverage ratio")
+	periods: int = Field(120, ge=1, le=1200)
+	periods_per_year: int = Field(12, ge=1, le=365)
+	scenarios: int = Field(10_000, ge=1, le=200_000)
+	utilization_volatility: float = Field(0.1, ge=0.0, description="Annualized std. deviation of log utilization shocks")
+	mean_reversion: float = Field(0.1, ge=0.0, le=1.0, description="Per-period pull of utilization back towards 1.0")
+	feedback: float = Field(0.5, ge=0.0, description="Utilization drop per unit of growth above target")
+	reserve_return: float = Field(0.05, description="Expected annual return of the reserve basket")
+	reserve_volatility: float = Field(0.3, ge=0.0, description="Annualized volatility of the reserve basket")
+	percentiles: List[float] = Field(list(DEFAULT_PERCENTILES), min_length=1, max_length=20)
+	seed: Optional[int] = Field(None, ge=0, description="Seed for a reproducible run")
+
+
 @router.get("/currencies")
 def list_currencies():
 	return _treasury_state["currencies"]
@@ -96,3 +123,64 @@ def adjust_inflation(req: InflationAdjustmentRequest):
 	}
 
 
+@router.post("/treasury/simulate")
+def simulate_treasury(req: InflationSimulationRequest):
+	"""
+	Monte Carlo of the inflation controller over many periods and utilization scenarios,
+	returning percentile bands of growth, utilization and coverage ratio per period
+	"""
+	if req.periods * req.scenarios > MAX_SIMULATION_STEPS:
+		raise HTTPException(status_code=400, detail=f"periods x scenarios must be at most {MAX_SIMULATION_STEPS}")
+	if any(not 0 <= q <= 100 for q in req.percentiles):
+		raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+
+	planet = _treasury_state["planet"]
+	seed = draw_seed(req.seed)
+	result = simulate_inflation(
+		target_growth=req.target_growth_rate_annual,
+		initial_utilization=req.initial_utilization_ratio,
+		initial_coverage=req.initial_coverage_ratio or planet["coverage_ratio"],
+		periods=req.periods,
+		scenarios=req.scenarios,
+		periods_per_year=req.periods_per_year,
+		elastic=planet["inflation_mode"] == "elastic",
+		utilization_volatility=req.utilization_volatility,
+		mean_reversion=req.mean_reversion,
+		feedback=req.feedback,
+		reserve_return=req.reserve_return,
+		reserve_volatility=req.reserve_volatility,
+		percentiles=sorted(req.percentiles),
+		seed=seed,
+	)
+	# Extreme inputs can overflow; NaN/inf cannot be serialized as JSON
+	numbers = [result["final"]["probability_coverage_below_1"], result["final"]["probability_ever_below_1"]]
+	numbers += [value for name in ("coverage", "supply_multiple") for value in result["final"][name].values()]
+	numbers += [value for band in result["bands"].values() for values in band.values() for value in values]
+	if not np.isfinite(numbers).all():
+		raise HTTPException(status_code=400, detail="Simulation diverged; reduce growth, volatility or horizon")
+	result["inflation_mode"] = planet["inflation_mode"]
+	return result
+
+
+def _engine_or_503():
+	engine = get_economy_engine()
+	if engine is None:
+		raise HTTPException(status_code=503, detail="Supabase not configured")
+	return engine
+
+
+@router.get("/ticks/status")
+def economy_tick_status():
+	"""Scheduler state, last tick timings and write backlog"""
+	return _engine_or_503().stats()
+
+
+@router.post("/ticks/run")
+async def run_economy_tick():
+	"""Run one economy tick now, outside the schedule"""
+	engine = _engine_or_503()
+	try:
+		tick = await engine.run_tick()
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=f"Economy tick failed: {e}")
+	return {"success": True, "tick": tick, "backlog": engine.backlog}
@@ -0,0 +1,378 @@
+"""
+Background Job Runner
+Runs long CLI operations (Forge, Avalanche CLI) as tracked background processes
+with live stdout/stderr logs, cancellation and a per-subnet concurrency limit
+"""
+import os
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+# Limits (overridable from the environment)
+MAX_CONCURRENT_PER_SUBNET = int(os.getenv("JOB_MAX_CONCURRENT_PER_SUBNET", "1"))
+MAX_LOG_LINES = int(os.getenv("JOB_MAX_LOG_LINES", "5000"))
+MAX_FINISHED_JOBS = int(os.getenv("JOB_MAX_FINISHED_JOBS", "200"))
+
+# Seconds to wait for a cancelled process to exit before killing it
+CANCEL_GRACE_SECONDS = 5
+
+# Flags whose following argument must never be exposed through the API
+_SECRET_FLAGS = ("--private-key",)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def redact_argv(argv: List[str]) -> List[str]:
+    """Return a copy of argv with secret flag values masked"""
+    redacted = []
+    hide_next = False
+    for part in argv:
+        if hide_next:
+            redacted.append("***")
+            hide_next = False
+            continue
+        redacted.append(part)
+        if part in _SECRET_FLAGS:
+            hide_next = True
+    return redacted
+
+
+@dataclass
+class JobStep:
+    """A single process run as part of a job"""
+    argv: List[str]
+    cwd: Optional[Path] = None
+    env: Optional[Dict[str, str]] = None
+    timeout: Optional[int] = None
+    label: Optional[str] = None
+    # Called after the process exits successfully
+    on_success: Optional[Callable[[], None]] = None
+    # Held for the whole step (check, process and on_success), e.g. to share one build
+    lock: Optional[Any] = None
+    # Checked under the lock; when it returns True the process is not run
+    skip_if: Optional[Callable[[], bool]] = None
+
+
+class Job:
+    """A tracked background job made of one or more sequential process steps"""
+
+    def __init__(
+        self,
+        kind: str,
+        steps: List[JobStep],
+        subnet: Optional[str] = None,
+        concurrency_key: Optional[str] = None,
+        on_success: Optional[Callable[["Job"], Any]] = None
+    ):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.steps = steps
+        self.subnet = subnet
+        self.concurrency_key = concurrency_key or subnet or "default"
+        self.on_success = on_success
+
+        self.status = JOB_QUEUED
+        self.current_step: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+        self._cancel_requested = False
+        self._process: Optional[subprocess.Popen] = None
+        self._cond = threading.Condition()
+        self._logs: deque = deque(maxlen=MAX_LOG_LINES)
+        self._next_seq = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested
+
+    def log(self, stream: str, line: str):
+        """Append a log line and wake up any waiting readers"""
+        with self._cond:
+            self._logs.append({
+                "seq": self._next_seq,
+                "stream": stream,
+                "line": line.rstrip("\n"),
+                "ts": _now(),
+            })
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def read_logs(self, offset: int = 0, limit: int = 500) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read log lines starting at sequence number `offset`
+
+        Returns:
+            (entries, next_offset) - pass next_offset back to continue reading.
+            Lines older than the retained window are silently skipped.
+        """
+        with self._cond:
+            entries = [entry for entry in self._logs if entry["seq"] >= offset][:limit]
+            next_offset = entries[-1]["seq"] + 1 if entries else max(offset, self._first_seq())
+            return entries, next_offset
+
+    def wait_for_logs(self, offset: int, timeout: float = 15.0) -> bool:
+        """Block until there are logs at or after `offset` or the job finishes"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._next_seq <= offset and not self.finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def _first_seq(self) -> int:
+        return self._logs[0]["seq"] if self._logs else self._next_seq
+
+    def _set_status(self, status: str, error: Optional[str] = None):
+        with self._cond:
+            self.status = status
+            if error:
+                self.error = error
+            if status == JOB_RUNNING and not self.started_at:
+                self.started_at = _now()
+            if status in FINISHED_STATES:
+                self.finished_at = _now()
+                self._process = None
+            self._cond.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "subnet": self.subnet,
+            "status": self.status,
+            "finished": self.finished,
+            "steps": [
+                {"label": step.label, "command": redact_argv(step.argv)}
+                for step in self.steps
+            ],
+            "current_step": self.current_step,
+            "returncode": self.returncode,
+            "error": self.error,
+            "result": self.result,
+            "log_lines": self._next_seq,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Starts, tracks and cancels background jobs"""
+
+    def __init__(self, max_concurrent_per_subnet: int = MAX_CONCURRENT_PER_SUBNET):
+        self.max_concurrent_per_subnet = max(1, max_concurrent_per_subnet)
+        self._jobs: Dict[str, Job] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        steps: List[JobStep],
+        subnet: Optional[str] = None,
+        concurrency_key: Optional[str] = None,
+        on_success: Optional[Callable[[Job], Any]] = None
+    ) -> Job:
+        """
+        Queue a job and start it in the background
+
+        Args:
+            kind: Job type shown to clients (e.g. "subnet_deploy")
+            steps: Processes to run in order; the job fails on the first non-zero exit
+            subnet: Subnet the job operates on (used for filtering and concurrency)
+            concurrency_key: Overrides the key used for the concurrency limit
+            on_success: Called with the job after all steps succeed; its return value
+                becomes job.result
+        """
+        if not steps:
+            raise ValueError("A job needs at least one step")
+
+        job = Job(kind, steps, subnet=subnet, concurrency_key=concurrency_key, on_success=on_success)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune_finished()
+
+        thread = threading.Thread(target=self._run, args=(job,), name=f"job-{job.id[:8]}", daemon=True)
+        thread.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, subnet: Optional[str] = None, status: Optional[str] = None) -> List[Job]:
+        jobs = list(self._jobs.values())
+        if subnet:
+            jobs = [job for job in jobs if job.subnet == subnet]
+        if status:
+            jobs = [job for job in jobs if job.status == status]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start, running processes are terminated"""
+        job = self.get(job_id)
+        if not job or job.finished:
+            return job
+
+        job._cancel_requested = True
+        process = job._process
+        if process and process.poll() is None:
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        return job
+
+    def _slot(self, key: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_concurrent_per_subnet)
+            return self._slots[key]
+
+    def _prune_finished(self):
+        finished = [job for job in self._jobs.values() if job.finished]
+        if len(finished) <= MAX_FINISHED_JOBS:
+            return
+        finished.sort(key=lambda job: job.finished_at or "")
+        for job in finished[:len(finished) - MAX_FINISHED_JOBS]:
+            self._jobs.pop(job.id, None)
+
+    def _run(self, job: Job):
+        slot = self._slot(job.concurrency_key)
+
+        # Wait for a free slot for this subnet, giving up if cancelled while queued
+        while not slot.acquire(timeout=0.5):
+            if job.cancel_requested:
+                job._set_status(JOB_CANCELLED, "Cancelled before start")
+                return
+
+        try:
+            if job.cancel_requested:
+                job._set_status(JOB_CANCELLED, "Cancelled before start")
+                return
+
+            job._set_status(JOB_RUNNING)
+            for index, step in enumerate(job.steps):
+                job.current_step = index
+                if step.lock is not None:
+                    # Wait for the step's lock, giving up if cancelled meanwhile
+                    while not step.lock.acquire(timeout=0.5):
+                        if job.cancel_requested:
+                            job._set_status(JOB_CANCELLED, "Cancelled by request")
+                            return
+                try:
+                    if step.skip_if and step.skip_if():
+                        job.log("system", f"Skipping {step.label or 'step'}: already up to date")
+                        continue
+                    job.log("system", f"$ {' '.join(redact_argv(step.argv))}")
+                    returncode = self._run_step(job, step)
+                    job.returncode = returncode
+
+                    if job.cancel_requested:
+                        job._set_status(JOB_CANCELLED, "Cancelled by request")
+                        return
+                    if returncode != 0:
+                        job._set_status(JOB_FAILED, f"Step {index + 1} exited with code {returncode}")
+                        return
+                    if step.on_success:
+                        step.on_success()
+                finally:
+                    if step.lock is not None:
+                        step.lock.release()
+
+            if job.on_success:
+                job.result = job.on_success(job)
+            job._set_status(JOB_SUCCEEDED)
+        except subprocess.TimeoutExpired as e:
+            job._set_status(JOB_FAILED, f"Command timed out after {e.timeout}s")
+        except Exception as e:
+            job._set_status(JOB_FAILED, str(e))
+        finally:
+            slot.release()
+
+    def _run_step(self, job: Job, step: JobStep) -> int:
+        process = subprocess.Popen(
+            step.argv,
+            cwd=str(step.cwd) if step.cwd else None,
+            env=step.env,
+            # Avalanche CLI and forge can prompt; with no terminal a prompt fails fast instead of hanging
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        job._process = process
+
+        readers = [
+            threading.Thread(target=self._pump, args=(job, process.stdout, "stdout"), daemon=True),
+            threading.Thread(target=self._pump, args=(job, process.stderr, "stderr"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        deadline = time.monotonic() + step.timeout if step.timeout else None
+        cancel_deadline = None
+        while process.poll() is None:
+            if job.cancel_requested and cancel_deadline is None:
+                process.terminate()
+                cancel_deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+            if cancel_deadline and time.monotonic() > cancel_deadline:
+                process.kill()
+            if deadline and time.monotonic() > deadline and not job.cancel_requested:
+                process.kill()
+                process.wait()
+                raise subprocess.TimeoutExpired(step.argv, step.timeout)
+            time.sleep(0.2)
+
+        for reader in readers:
+            reader.join(timeout=5)
+        return process.returncode
+
+    @staticmethod
+    def _pump(job: Job, pipe, stream: str):
+        try:
+            for line in iter(pipe.readline, ""):
+                job.log(stream, line)
+        finally:
+            pipe.close()
+
+
+# Global instance
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the global job manager instance"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
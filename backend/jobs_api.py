@@ -0,0 +1,103 @@
+"""
+Background Jobs API
+Status, log polling, live log streaming (SSE) and cancellation for long-running CLI jobs
+"""
+import json
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+
+from job_runner import get_job_manager, Job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = get_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("")
+async def list_jobs(subnet: Optional[str] = None, status: Optional[str] = None):
+    """List tracked jobs, newest first"""
+    jobs = get_job_manager().list(subnet=subnet, status=status)
+    return {
+        "success": True,
+        "jobs": [job.to_dict() for job in jobs],
+        "count": len(jobs)
+    }
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Get job status and result"""
+    job = _get_job_or_404(job_id)
+    return {"success": True, "job": job.to_dict()}
+
+
+@router.get("/{job_id}/logs")
+async def get_job_logs(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Sequence number of the first line to return"),
+    limit: int = Query(500, ge=1, le=5000)
+):
+    """
+    Poll job logs incrementally
+    Pass the returned next_offset as offset on the next call to only receive new lines.
+    """
+    job = _get_job_or_404(job_id)
+    logs, next_offset = job.read_logs(offset, limit)
+    return {
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "finished": job.finished,
+        "logs": logs,
+        "next_offset": next_offset
+    }
+
+
+@router.get("/{job_id}/stream")
+async def stream_job_logs(job_id: str, offset: int = Query(0, ge=0)):
+    """Stream job logs as Server-Sent Events until the job finishes"""
+    job = _get_job_or_404(job_id)
+
+    async def event_stream():
+        next_offset = offset
+        while True:
+            # Check before reading so lines logged just before completion are not lost
+            finished = job.finished
+            logs, next_offset = job.read_logs(next_offset)
+            for entry in logs:
+                yield f"id: {entry['seq']}\nevent: log\ndata: {json.dumps(entry)}\n\n"
+
+            if finished and not logs:
+                yield f"event: end\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+                return
+
+            if not logs:
+                has_output = await run_in_threadpool(job.wait_for_logs, next_offset, 15.0)
+                if not has_output:
+                    # Keep proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    _get_job_or_404(job_id)
+    job = get_job_manager().cancel(job_id)
+    return {
+        "success": True,
+        "job": job.to_dict(),
+        "message": "Job already finished" if job.finished else "Cancellation requested"
+    }
@@ -0,0 +1,186 @@
+"""
+Portfolio Manager Leaderboard
+Approved managers held in memory with live follower counts, kept sorted by each
+ranking metric so pages and ranks are served without touching the database
+"""
+import asyncio
+import bisect
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Full rebuild interval, catching changes made outside the API
+LEADERBOARD_REFRESH_INTERVAL = float(os.getenv("LEADERBOARD_REFRESH_INTERVAL", "300"))
+
+# Ranking name -> manager column (all ranked highest first)
+LEADERBOARD_METRICS = {
+    "roi": "roi_annualized",
+    "sharpe": "sharpe_ratio",
+    "followers": "total_followers",
+}
+
+# Rows per request when loading from PostgREST
+_LOAD_PAGE = 1000
+
+# Sorts after every wallet address, for bisecting past an exact (value, id)
+_MAX_WALLET = "\U0010ffff"
+
+
+def _metric(row: Dict[str, Any], column: str) -> float:
+    try:
+        return float(row.get(column) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ManagerLeaderboard:
+    """Sorted, incrementally maintained view of the approved portfolio managers"""
+
+    def __init__(self, refresh_interval: float = LEADERBOARD_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._managers: Dict[str, Dict[str, Any]] = {}
+        # metric -> ascending list of (-value, id, wallet)
+        self._order: Dict[str, List[Tuple[float, str, str]]] = {metric: [] for metric in LEADERBOARD_METRICS}
+        self._keys: Dict[str, Dict[str, Tuple[float, str, str]]] = {metric: {} for metric in LEADERBOARD_METRICS}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    # Loading
+
+    async def ensure_loaded(self, supabase):
+        """Build from the database on first use and after the refresh interval"""
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_interval:
+                return
+            managers = await _load_all(
+                lambda: supabase.table("portfolio_managers").select("*").eq("approval_status", "approved")
+            )
+            followers = await _load_all(
+                lambda: supabase.table("portfolio_followers").select("id, manager_wallet").eq("active", True)
+            )
+            counts: Dict[str, int] = {}
+            for follower in followers:
+                counts[follower["manager_wallet"]] = counts.get(follower["manager_wallet"], 0) + 1
+
+            self._managers.clear()
+            for metric in LEADERBOARD_METRICS:
+                self._order[metric] = []
+                self._keys[metric] = {}
+            for manager in managers:
+                manager["total_followers"] = counts.get(manager["wallet_address"], 0)
+                self._managers[manager["wallet_address"]] = manager
+                for metric, column in LEADERBOARD_METRICS.items():
+                    key = (-_metric(manager, column), str(manager["id"]), manager["wallet_address"])
+                    self._order[metric].append(key)
+                    self._keys[metric][manager["wallet_address"]] = key
+            for metric in LEADERBOARD_METRICS:
+                self._order[metric].sort()
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a rebuild on the next request"""
+        self._loaded_at = None
+
+    # Incremental maintenance
+
+    def upsert(self, manager: Dict[str, Any]):
+        """Apply a changed manager row (dropping it if no longer approved)"""
+        if self._loaded_at is None:
+            return
+        wallet = manager["wallet_address"]
+        current = self._managers.get(wallet)
+        if manager.get("approval_status") != "approved":
+            self._remove(wallet)
+            return
+        row = dict(manager)
+        # Follower counts are maintained here, not read from the row
+        row["total_followers"] = current["total_followers"] if current else 0
+        self._remove(wallet)
+        self._insert(row)
+
+    def set_followers(self, wallet: str, count: int):
+        """Apply a manager's current active follower count"""
+        current = self._managers.get(wallet)
+        if current is None:
+            return
+        row = dict(current)
+        row["total_followers"] = max(0, int(count))
+        self._remove(wallet)
+        self._insert(row)
+
+    def followers_of(self, wallet: str) -> Optional[int]:
+        manager = self._managers.get(wallet)
+        return None if manager is None else manager["total_followers"]
+
+    def _insert(self, row: Dict[str, Any]):
+        wallet = row["wallet_address"]
+        self._managers[wallet] = row
+        for metric, column in LEADERBOARD_METRICS.items():
+            key = (-_metric(row, column), str(row["id"]), wallet)
+            bisect.insort(self._order[metric], key)
+            self._keys[metric][wallet] = key
+
+    def _remove(self, wallet: str):
+        if self._managers.pop(wallet, None) is None:
+            return
+        for metric in LEADERBOARD_METRICS:
+            key = self._keys[metric].pop(wallet)
+            order = self._order[metric]
+            del order[bisect.bisect_left(order, key)]
+
+    # Reads
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def rank(self, metric: str, wallet: str) -> int:
+        return bisect.bisect_left(self._order[metric], self._keys[metric][wallet]) + 1
+
+    def page(self, metric: str, after: Optional[Tuple[float, str]], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Managers ranked by metric, starting after the (value, id) of the previous page
+
+        Returns the page (each row with its rank under every metric) and whether
+        more rows follow.
+        """
+        order = self._order[metric]
+        start = 0
+        if after is not None:
+            # Past every key <= (-value, id, <any wallet>)
+            start = bisect.bisect_right(order, (-float(after[0]), str(after[1]), _MAX_WALLET))
+        keys = order[start:start + limit]
+        rows = []
+        for offset, (_, _, wallet) in enumerate(keys):
+            row = dict(self._managers[wallet])
+            row["ranks"] = {
+                name: start + offset + 1 if name == metric else self.rank(name, wallet)
+                for name in LEADERBOARD_METRICS
+            }
+            rows.append(row)
+        return rows, start + limit < len(order)
+
+
+async def _load_all(make_query: Callable[[], Any]) -> List[Dict[str, Any]]:
+    # PostgREST caps rows per response, so read in id order a page at a time
+    rows: List[Dict[str, Any]] = []
+    while True:
+        query = make_query().order("id").range(len(rows), len(rows) + _LOAD_PAGE - 1)
+        batch = (await query.execute()).data or []
+        rows.extend(batch)
+        if len(batch) < _LOAD_PAGE:
+            return rows
+
+
+# Global instance
+_leaderboard: Optional[ManagerLeaderboard] = None
+
+
+def get_manager_leaderboard() -> ManagerLeaderboard:
+    """Get or create the manager leaderboard"""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = ManagerLeaderboard()
+    return _leaderboard
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 
 try:
-	from services.supabase_service import supabase
+	from services.supabase_async import supabase
 except Exception:
 	supabase = None
 
+from pagination import page_query, page_result, select_columns, total_count, project, encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from leaderboard import get_manager_leaderboard, LEADERBOARD_METRICS
+
 router = APIRouter(prefix="/managers", tags=["managers"])
 
 def require_supabase():
@@ -14,33 +17,86 @@ def require_supabase():
 		raise HTTPException(status_code=503, detail="Supabase not configured. Set SUPABASE_URL and SUPABASE_SERVICE_KEY.")
 
 @router.get("")
-def list_managers(status: str = "approved"):
+async def list_managers(
+	status: str = "approved",
+	sort: str = Query("roi", description="Ranking: roi, sharpe or followers"),
+	cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+	limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+	fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+	include_count: bool = Query(False, description="Also return the total number of matching rows"),
+):
 	require_supabase()
+	if sort not in LEADERBOARD_METRICS:
+		raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(LEADERBOARD_METRICS)}")
+	sort_column = LEADERBOARD_METRICS[sort]
 	try:
-		q = supabase.table("portfolio_managers").select("*")
-		if status:
-			q = q.eq("approval_status", status)
-		res = q.order("roi_annualized", desc=True).execute()
-		return {"managers": res.data or []}
+		if status == "approved":
+			# The marketplace listing is served from the in-memory leaderboard
+			leaderboard = get_manager_leaderboard()
+			await leaderboard.ensure_loaded(supabase)
+			managers, has_more = leaderboard.page(sort, decode_cursor(cursor) if cursor else None, limit)
+			next_cursor = encode_cursor(managers[-1], sort_column) if has_more and managers else None
+			if fields:
+				managers = [{**project(row, fields), "ranks": row["ranks"]} for row in managers]
+			response = {"managers": managers, "next_cursor": next_cursor}
+			if include_count:
+				response["total"] = len(leaderboard)
+			return response
+
+		def filtered(query):
+			return query.eq("approval_status", status) if status else query
+
+		q = filtered(supabase.table("portfolio_managers").select(select_columns(fields, sort_column=sort_column)))
+		# Highest first; id breaks ties so pages never overlap
+		res = await page_query(q, cursor, limit, sort_column=sort_column, desc=True).execute()
+		managers, next_cursor = page_result(res.data or [], limit, sort_column=sort_column)
+		response = {"managers": managers, "next_cursor": next_cursor}
+		if include_count:
+			response["total"] = await total_count(filtered(supabase.table("portfolio_managers").select("id", count="exact")))
+		return response
+	except HTTPException:
+		raise
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{wallet_address}/rank")
+async def get_manager_rank(wallet_address: str):
+	"""Leaderboard position of one approved manager under every ranking"""
+	require_supabase()
+	try:
+		leaderboard = get_manager_leaderboard()
+		await leaderboard.ensure_loaded(supabase)
+		if leaderboard.followers_of(wallet_address) is None:
+			raise HTTPException(status_code=404, detail="Manager not on the leaderboard")
+		return {
+			"wallet_address": wallet_address,
+			"ranks": {name: leaderboard.rank(name, wallet_address) for name in LEADERBOARD_METRICS},
+			"total_followers": leaderboard.followers_of(wallet_address),
+			"of": len(leaderboard),
+		}
+	except HTTPException:
+		raise
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/approve")
-def approve_manager(wallet_address: str, verified: bool = True):
+async def approve_manager(wallet_address: str, verified: bool = True):
 	require_supabase()
 	try:
 		now = datetime.now(timezone.utc).isoformat()
-		res = supabase.table("portfolio_managers").update({
+		res = await supabase.table("portfolio_managers").update({
 			"approval_status": "approved",
 			"verified": verified,
 			"approved_at": now,
 		}).eq("wallet_address", wallet_address).execute()
+		for manager in res.data or []:
+			get_manager_leaderboard().upsert(manager)
 		return {"updated": len(res.data or []), "managers": res.data or []}
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/seed")
-def seed_managers():
+async def seed_managers():
 	require_supabase()
 	try:
 		samples = [
@@ -65,9 +121,71 @@ def seed_managers():
 				"management_fee_percent": 1.5,
 			},
 		]
-		supabase.table("portfolio_managers").upsert(samples).execute()
+		await supabase.table("portfolio_managers").upsert(samples).execute()
+		get_manager_leaderboard().invalidate()
 		return {"seeded": len(samples)}
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
 
+
+@router.post("/{wallet_address}/followers")
+async def follow_manager(
+	wallet_address: str,
+	follower_wallet: str,
+	allocation_amount: float = 0,
+	copy_percent: float = 100,
+):
+	"""Start (or resume) copying a manager"""
+	require_supabase()
+	try:
+		existing = await supabase.table("portfolio_followers").select("id, active").eq(
+			"follower_wallet", follower_wallet
+		).eq("manager_wallet", wallet_address).execute()
+		was_active = bool(existing.data and existing.data[0].get("active"))
+
+		res = await supabase.table("portfolio_followers").upsert({
+			"follower_wallet": follower_wallet,
+			"manager_wallet": wallet_address,
+			"allocation_amount": allocation_amount,
+			"copy_percent": copy_percent,
+			"active": True,
+		}, on_conflict="follower_wallet,manager_wallet").execute()
+
+		if not was_active:
+			await _record_follower_change(wallet_address)
+		return {"follower": (res.data or [None])[0], "total_followers": get_manager_leaderboard().followers_of(wallet_address)}
+	except HTTPException:
+		raise
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/{wallet_address}/followers/{follower_wallet}")
+async def unfollow_manager(wallet_address: str, follower_wallet: str):
+	"""Stop copying a manager"""
+	require_supabase()
+	try:
+		res = await supabase.table("portfolio_followers").update({"active": False}).eq(
+			"follower_wallet", follower_wallet
+		).eq("manager_wallet", wallet_address).eq("active", True).execute()
+
+		if res.data:
+			await _record_follower_change(wallet_address)
+		return {"updated": len(res.data or []), "total_followers": get_manager_leaderboard().followers_of(wallet_address)}
+	except HTTPException:
+		raise
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=str(e))
+
+async def _record_follower_change(wallet_address: str):
+	# Recount rather than apply a delta: a leaderboard rebuild running alongside
+	# the follower write may already have counted it
+	res = await supabase.table("portfolio_followers").select("id", count="exact").eq(
+		"manager_wallet", wallet_address
+	).eq("active", True).limit(1).execute()
+	count = res.count or 0
+	leaderboard = get_manager_leaderboard()
+	await leaderboard.ensure_loaded(supabase)
+	leaderboard.set_followers(wallet_address, count)
+	# Keep the stored column in step for other readers of the table
+	await supabase.table("portfolio_managers").update({"total_followers": count}).eq("wallet_address", wallet_address).execute()
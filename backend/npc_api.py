@@ -1,13 +1,20 @@
-from fastapi import APIRouter, HTTPException
+import json
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
-import random
-import uuid
+
+import numpy as np
+
+from pagination import decode_cursor, encode_cursor, project, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from npc_store import get_npc_store
+from seeding import draw_seed
 
 router = APIRouter(prefix="/npcs", tags=["npcs"])
 
-# In-memory NPC registry for prototype
-_npcs: Dict[str, Dict] = {}
+# NPCs serialized per chunk of an NDJSON export
+STREAM_CHUNK = 1000
 
 
 class NPCSpawnRequest(BaseModel):
@@ -20,48 +27,122 @@ class NPCTraitUpdate(BaseModel):
 	skill_delta: float = 0.0
 	loyalty_delta: float = 0.0
 	personality_hint: Optional[str] = None
+	employer: Optional[str] = Field(None, description="Assign an employer ('' to clear)")
 
 
-def _random_personality() -> str:
-	return random.choice(["curious", "stoic", "rebellious", "empathetic", "analytical"])
-
-
-def _spawn_npc(cohort: Optional[str]) -> Dict:
-	npc_id = str(uuid.uuid4())
-	npc = {
-		"id": npc_id,
-		"cohort": cohort or "child",
-		"skill": 0.0,
-		"loyalty": 0.0,
-		"personality": _random_personality(),
-		"age": 0,
-	}
-	_npcs[npc_id] = npc
-	return npc
+class NPCTickRequest(BaseModel):
+	ticks: int = Field(1, ge=1, le=1000)
+	seed: Optional[int] = Field(None, ge=0, description="Seed for a reproducible run")
+	cohort: Optional[str] = Field(None, description="Only evolve this cohort")
+	personality: Optional[str] = Field(None, description="Only evolve this personality")
+	years: int = Field(1, ge=0, le=100, description="Age added per tick")
+	skill_growth: float = Field(0.05, ge=0, description="Mean skill gained per tick")
+	loyalty_volatility: float = Field(0.02, ge=0, le=1, description="Std. deviation of loyalty drift per tick")
 
 
 @router.post("/spawn")
 def spawn_npcs(req: NPCSpawnRequest):
-	created = []
-	for _ in range(req.count):
-		created.append(_spawn_npc(req.cohort))
-	return {"created": created, "total": len(_npcs)}
+	store = get_npc_store()
+	try:
+		rows = store.spawn(req.count, req.cohort)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	return {"created": store.rows(rows), "total": len(store)}
 
 
 @router.get("/")
-def list_npcs():
-	return {"npcs": list(_npcs.values())}
+def list_npcs(
+	cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+	limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+	fields: Optional[str] = Query(None, description="Comma-separated attributes to return"),
+	include_count: bool = Query(False, description="Also return the number of matching NPCs"),
+	cohort: Optional[str] = None,
+	personality: Optional[str] = None,
+	employer: Optional[str] = Query(None, description="Employer name ('' for unemployed)"),
+	min_skill: Optional[float] = None,
+	max_skill: Optional[float] = None,
+	min_loyalty: Optional[float] = None,
+	max_loyalty: Optional[float] = None,
+	min_age: Optional[int] = Query(None, ge=0),
+	max_age: Optional[int] = Query(None, ge=0),
+	format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson streams every match, one NPC per line"),
+):
+	# Pages follow spawn order; the cursor is the last NPC ID of the previous page
+	store = get_npc_store()
+	after = None
+	if cursor:
+		after = store.row_of(str(decode_cursor(cursor)[1]))
+		if after is None:
+			raise HTTPException(status_code=400, detail="Invalid cursor")
+	filters = dict(
+		cohort=cohort, personality=personality, employer=employer,
+		min_skill=min_skill, max_skill=max_skill, min_loyalty=min_loyalty, max_loyalty=max_loyalty,
+		min_age=min_age, max_age=max_age
+	)
+
+	if format == "ndjson":
+		rows = store.query(after=after, **filters)
+
+		def export():
+			for start in range(0, len(rows), STREAM_CHUNK):
+				chunk = store.rows(rows[start:start + STREAM_CHUNK])
+				yield "".join(json.dumps(project(npc, fields)) + "\n" for npc in chunk)
+
+		return StreamingResponse(export(), media_type="application/x-ndjson")
+
+	if include_count:
+		matching = store.query(after=None, **filters)
+		rows = matching[np.searchsorted(matching, after, side="right"):] if after is not None else matching
+		rows = rows[:limit + 1]
+	else:
+		rows = store.query(after=after, limit=limit + 1, **filters)
+	page = [project(npc, fields) for npc in store.rows(rows[:limit])]
+	next_cursor = encode_cursor(store.rows(rows[limit - 1:limit])[0], "id") if len(rows) > limit else None
+	response = {"npcs": page, "next_cursor": next_cursor}
+	if include_count:
+		response["total"] = len(matching)
+	return response
+
+
+@router.get("/stats")
+def npc_stats():
+	"""Population size, memory footprint and trait distribution"""
+	return get_npc_store().stats()
 
 
 @router.post("/evolve")
 def evolve_npc(update: NPCTraitUpdate):
-	npc = _npcs.get(update.npc_id)
-	if not npc:
+	store = get_npc_store()
+	row = store.row_of(update.npc_id)
+	if row is None:
 		raise HTTPException(status_code=404, detail="NPC not found")
-	npc["skill"] = max(0.0, npc["skill"] + update.skill_delta)
-	npc["loyalty"] = min(1.0, max(0.0, npc["loyalty"] + update.loyalty_delta))
-	if update.personality_hint:
-		npc["personality"] = update.personality_hint
-	return {"npc": npc}
-
-
+	try:
+		store.evolve(row, update.skill_delta, update.loyalty_delta, update.personality_hint, update.employer)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	return {"npc": store.rows([row])[0]}
+
+
+@router.post("/tick")
+def tick_npcs(req: NPCTickRequest):
+	"""Age and evolve the whole population (or one cohort/personality) for a number of ticks"""
+	store = get_npc_store()
+	seed = draw_seed(req.seed)
+	rng = np.random.default_rng(seed)
+	rows = None
+	if req.cohort is not None or req.personality is not None:
+		rows = store.query(cohort=req.cohort, personality=req.personality)
+	timings = [
+		store.tick(rng, rows, years=req.years, skill_growth=req.skill_growth, loyalty_volatility=req.loyalty_volatility)
+		for _ in range(req.ticks)
+	]
+	stats = store.stats()
+	return {
+		"seed": seed,
+		"ticks": req.ticks,
+		"updated": timings[0]["updated"],
+		"tick_ms": [timing["elapsed_ms"] for timing in timings],
+		"total_ms": round(sum(timing["elapsed_ms"] for timing in timings), 3),
+		"mean_skill": stats["mean_skill"],
+		"mean_loyalty": stats["mean_loyalty"],
+	}
@@ -0,0 +1,364 @@
+"""
+Columnar NPC Store
+Struct-of-arrays NPC population: one NumPy column per attribute, small integer
+codes for cohort, personality and employer, a sorted UUID index and per-category
+row indexes, so millions of NPCs fit in tens of MB and filters run vectorized
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+BASE_PERSONALITIES = ["curious", "stoic", "rebellious", "empathetic", "analytical"]
+DEFAULT_COHORT = "child"
+
+# New rows are matched by a linear scan until this many accumulate, then the index is re-sorted
+_UNSORTED_LIMIT = int(os.getenv("NPC_INDEX_UNSORTED_LIMIT", "4096"))
+_INITIAL_CAPACITY = 1024
+
+# Personality -> (skill growth multiplier, loyalty drift per tick); others get (1.0, 0.0)
+PERSONALITY_TICK_MODIFIERS = {
+    "curious": (1.2, 0.0),
+    "stoic": (0.9, 0.005),
+    "rebellious": (1.0, -0.01),
+    "empathetic": (0.9, 0.01),
+    "analytical": (1.3, 0.0),
+}
+
+# Attribute -> (dtype, fill value)
+_COLUMNS = {
+    "skill": (np.float32, 0.0),
+    "loyalty": (np.float32, 0.0),
+    "age": (np.uint32, 0),
+    "cohort": (np.uint8, 0),
+    "personality": (np.uint8, 0),
+    "employer": (np.uint16, 0),
+}
+
+# Categorical columns with a secondary index (rows grouped by code)
+CATEGORY_COLUMNS = ("cohort", "personality", "employer")
+
+
+class Vocabulary:
+    """String <-> integer code mapping for a categorical column"""
+
+    def __init__(self, values: Optional[List[str]] = None, limit: int = 256):
+        self.limit = limit
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for value in values or []:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            if len(self.values) >= self.limit:
+                raise ValueError(f"Too many distinct values (at most {self.limit})")
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+
+def _uuid4_bytes(count: int) -> np.ndarray:
+    """count random version-4 UUIDs as 16-byte rows"""
+    raw = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw.view("S16").reshape(count)
+
+
+def _uuid_key(npc_id: str) -> Optional[bytes]:
+    try:
+        # NumPy "S" scalars drop trailing NUL bytes, so compare in that form
+        return uuid.UUID(npc_id).bytes.rstrip(b"\0")
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+class NPCStore:
+    """NPC population held as parallel NumPy columns, rows in spawn order"""
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._lock = threading.RLock()
+        self._size = 0
+        self._ids = np.empty(capacity, dtype="S16")
+        self._columns = {name: np.full(capacity, fill, dtype=dtype) for name, (dtype, fill) in _COLUMNS.items()}
+        self.cohorts = Vocabulary([DEFAULT_COHORT])
+        self.personalities = Vocabulary(BASE_PERSONALITIES)
+        # Code 0 is "no employer"
+        self.employers = Vocabulary([""], limit=65536)
+        # Category column -> write count, and the (write count, rows by code, code offsets) index built at it
+        self._versions = {name: 0 for name in CATEGORY_COLUMNS}
+        self._indexes: Dict[str, Any] = {}
+        # Sorted UUIDs of rows [0, _sorted_upto) and their row numbers
+        self._sorted_ids = np.empty(0, dtype="S16")
+        self._sorted_rows = np.empty(0, dtype=np.int32)
+        self._sorted_upto = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Live view of one column over the populated rows"""
+        if name == "id":
+            return self._ids[:self._size]
+        return self._columns[name][:self._size]
+
+    # Writes
+
+    def spawn(self, count: int, cohort: Optional[str] = None) -> slice:
+        """Append count NPCs with random personalities; returns their row range"""
+        with self._lock:
+            cohort_code = self.cohorts.code(cohort or DEFAULT_COHORT)
+            start, end = self._size, self._size + count
+            self._reserve(end)
+            self._ids[start:end] = _uuid4_bytes(count)
+            for name, (_, fill) in _COLUMNS.items():
+                self._columns[name][start:end] = fill
+            self._columns["cohort"][start:end] = cohort_code
+            self._columns["personality"][start:end] = np.random.randint(0, len(BASE_PERSONALITIES), size=count)
+            self._size = end
+            for name in CATEGORY_COLUMNS:
+                self._versions[name] += 1
+            # The unsorted tail may grow with the population, keeping merges amortized O(log n)
+            if self._size - self._sorted_upto > max(_UNSORTED_LIMIT, self._sorted_upto // 8):
+                self._reindex()
+            return slice(start, end)
+
+    def evolve(
+        self,
+        row: int,
+        skill_delta: float = 0.0,
+        loyalty_delta: float = 0.0,
+        personality: Optional[str] = None,
+        employer: Optional[str] = None,
+    ):
+        """Apply trait changes to one NPC (skill >= 0, loyalty within [0, 1]; employer "" clears it)"""
+        with self._lock:
+            skill = self._columns["skill"]
+            loyalty = self._columns["loyalty"]
+            skill[row] = max(0.0, float(skill[row]) + skill_delta)
+            loyalty[row] = min(1.0, max(0.0, float(loyalty[row]) + loyalty_delta))
+            if personality:
+                self._columns["personality"][row] = self.personalities.code(personality)
+                self._versions["personality"] += 1
+            if employer is not None:
+                self._columns["employer"][row] = self.employers.code(employer)
+                self._versions["employer"] += 1
+
+    def tick(
+        self,
+        rng: np.random.Generator,
+        rows=None,
+        years: int = 1,
+        skill_growth: float = 0.05,
+        loyalty_volatility: float = 0.02,
+    ) -> Dict[str, Any]:
+        """
+        Advance NPCs one cycle as a single vectorized update
+
+        Every selected NPC ages by years, gains exponentially distributed skill
+        (mean skill_growth, scaled by personality) and has its loyalty drift by
+        a personality bias plus Gaussian noise, clipped to [0, 1].
+
+        Args:
+            rng: Random generator; the same seed and population give the same result
+            rows: Row numbers to update (index array or slice), default all
+        """
+        with self._lock:
+            started = time.perf_counter()
+            target = slice(0, self._size) if rows is None else rows
+            personality = self._columns["personality"][:self._size][target]
+            count = len(personality)
+            affinity, bias = self._personality_modifiers()
+
+            age = self._columns["age"][:self._size]
+            skill = self._columns["skill"][:self._size]
+            loyalty = self._columns["loyalty"][:self._size]
+            age[target] += np.uint32(years)
+            skill[target] += (rng.exponential(skill_growth, count) * affinity[personality]).astype(np.float32)
+            loyalty[target] = np.clip(
+                loyalty[target] + bias[personality] + rng.normal(0.0, loyalty_volatility, count),
+                0.0, 1.0
+            ).astype(np.float32)
+            return {"updated": count, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+    def _personality_modifiers(self):
+        # Lookup tables indexed by personality code
+        size = len(self.personalities.values)
+        affinity = np.ones(size, dtype=np.float64)
+        bias = np.zeros(size, dtype=np.float64)
+        for code, name in enumerate(self.personalities.values):
+            affinity[code], bias[code] = PERSONALITY_TICK_MODIFIERS.get(name, (1.0, 0.0))
+        return affinity, bias
+
+    def _reserve(self, size: int):
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        ids = np.empty(capacity, dtype="S16")
+        ids[:self._size] = self._ids[:self._size]
+        self._ids = ids
+        for name, (dtype, fill) in _COLUMNS.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            column[:self._size] = self._columns[name][:self._size]
+            self._columns[name] = column
+
+    def _reindex(self):
+        # Sort only the new rows and merge them into the existing index
+        tail = self._ids[self._sorted_upto:self._size]
+        order = np.argsort(tail, kind="stable")
+        positions = np.searchsorted(self._sorted_ids, tail[order])
+        self._sorted_ids = np.insert(self._sorted_ids, positions, tail[order])
+        self._sorted_rows = np.insert(self._sorted_rows, positions, (order + self._sorted_upto).astype(np.int32))
+        self._sorted_upto = self._size
+
+    def _postings(self, name: str, code: int) -> np.ndarray:
+        """Ascending rows whose category column equals code, from the (re)built index"""
+        index = self._indexes.get(name)
+        if index is None or index[0] != self._versions[name]:
+            codes = self.column(name)
+            # Stable, so rows stay in spawn order within each code
+            order = np.argsort(codes, kind="stable").astype(np.int32)
+            offsets = np.searchsorted(codes[order], np.arange(int(codes.max(initial=0)) + 2))
+            index = (self._versions[name], order, offsets)
+            self._indexes[name] = index
+        _, order, offsets = index
+        if code + 1 >= len(offsets):
+            return order[:0]
+        return order[offsets[code]:offsets[code + 1]]
+
+    # Reads
+
+    def row_of(self, npc_id: str) -> Optional[int]:
+        """Row number of an NPC, or None"""
+        key = _uuid_key(npc_id)
+        if key is None:
+            return None
+        with self._lock:
+            position = int(np.searchsorted(self._sorted_ids, key))
+            if position < len(self._sorted_ids) and self._sorted_ids[position] == key:
+                return int(self._sorted_rows[position])
+            recent = np.flatnonzero(self._ids[self._sorted_upto:self._size] == key)
+            return int(recent[0]) + self._sorted_upto if len(recent) else None
+
+    def rows(self, rows) -> List[Dict[str, Any]]:
+        """NPCs at rows (a slice, index array or boolean mask) as dicts"""
+        with self._lock:
+            ids = self._ids[:self._size][rows]
+            skill = np.round(self._columns["skill"][:self._size][rows].astype(np.float64), 6).tolist()
+            loyalty = np.round(self._columns["loyalty"][:self._size][rows].astype(np.float64), 6).tolist()
+            age = self._columns["age"][:self._size][rows].tolist()
+            cohort = self._columns["cohort"][:self._size][rows].tolist()
+            personality = self._columns["personality"][:self._size][rows].tolist()
+            employer = self._columns["employer"][:self._size][rows].tolist()
+        return [
+            {
+                "id": str(uuid.UUID(bytes=raw.ljust(16, b"\0"))),
+                "cohort": self.cohorts.values[cohort[i]],
+                "skill": skill[i],
+                "loyalty": loyalty[i],
+                "personality": self.personalities.values[personality[i]],
+                "age": age[i],
+                "employer": self.employers.values[employer[i]] or None,
+            }
+            for i, raw in enumerate(ids.tolist())
+        ]
+
+    def get(self, npc_id: str) -> Optional[Dict[str, Any]]:
+        row = self.row_of(npc_id)
+        return None if row is None else self.rows([row])[0]
+
+    def query(
+        self,
+        cohort: Optional[str] = None,
+        personality: Optional[str] = None,
+        employer: Optional[str] = None,
+        min_skill: Optional[float] = None,
+        max_skill: Optional[float] = None,
+        min_loyalty: Optional[float] = None,
+        max_loyalty: Optional[float] = None,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Row numbers matching every given condition, in spawn order
+
+        Category filters are answered from the secondary indexes (smallest
+        first) and range filters are then applied to those rows only.
+
+        Args:
+            employer: Employer name, or "" for NPCs without one
+            after: Only rows after this row number (keyset pagination)
+            limit: At most this many rows
+        """
+        with self._lock:
+            candidates = None
+            categories = (("cohort", self.cohorts, cohort), ("personality", self.personalities, personality),
+                          ("employer", self.employers, employer))
+            postings = []
+            for name, vocabulary, value in categories:
+                if value is not None:
+                    code = vocabulary.find(value)
+                    if code is None:
+                        return np.empty(0, dtype=np.int32)
+                    postings.append(self._postings(name, code))
+            for rows in sorted(postings, key=len):
+                candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+            if candidates is None:
+                candidates = np.arange(self._size, dtype=np.int32)
+            if after is not None:
+                candidates = candidates[np.searchsorted(candidates, after, side="right"):]
+
+            mask = None
+            for name, low, high in (("skill", min_skill, max_skill), ("loyalty", min_loyalty, max_loyalty), ("age", min_age, max_age)):
+                for bound, compare in ((low, np.greater_equal), (high, np.less_equal)):
+                    if bound is not None:
+                        matches = compare(self._columns[name][candidates], bound)
+                        mask = matches if mask is None else mask & matches
+            if mask is not None:
+                candidates = candidates[mask]
+            return candidates if limit is None else candidates[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cohort_counts = np.bincount(self.column("cohort"), minlength=len(self.cohorts.values))
+            personality_counts = np.bincount(self.column("personality"), minlength=len(self.personalities.values))
+            employed = int(np.count_nonzero(self.column("employer")))
+            return {
+                "total": self._size,
+                "capacity": len(self._ids),
+                "bytes": self._ids.nbytes + sum(c.nbytes for c in self._columns.values())
+                         + self._sorted_ids.nbytes + self._sorted_rows.nbytes
+                         + sum(order.nbytes + offsets.nbytes for _, order, offsets in self._indexes.values()),
+                "cohorts": {v: int(n) for v, n in zip(self.cohorts.values, cohort_counts) if n},
+                "personalities": {v: int(n) for v, n in zip(self.personalities.values, personality_counts) if n},
+                "employed": employed,
+                "employers": len(self.employers.values) - 1,
+                "mean_skill": float(self.column("skill").mean()) if self._size else 0.0,
+                "mean_loyalty": float(self.column("loyalty").mean()) if self._size else 0.0,
+            }
+
+
+# Global instance
+_npc_store: Optional[NPCStore] = None
+
+
+def get_npc_store() -> NPCStore:
+    """Get or create the NPC population store"""
+    global _npc_store
+    if _npc_store is None:
+        _npc_store = NPCStore()
+    return _npc_store
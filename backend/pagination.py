@@ -0,0 +1,102 @@
+"""
+Keyset Pagination and Field Projection
+Helpers for list endpoints: opaque cursors over (sort column, id), a `fields=`
+projection passed through to PostgREST, and optional total counts
+"""
+import base64
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def encode_cursor(row: Dict[str, Any], sort_column: str) -> str:
+    """Opaque cursor pointing just past row"""
+    raw = json.dumps([row.get(sort_column), row.get("id")], default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """(sort value, id) of the last row of the previous page"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort_value, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def select_columns(fields: Optional[str], sort_column: str = "created_at", extra: Tuple[str, ...] = ()) -> str:
+    """
+    PostgREST select list for a comma-separated fields= parameter
+
+    The sort column and id are always included so the next cursor can be built,
+    along with any extra columns the endpoint itself reads.
+    """
+    if not fields:
+        return "*"
+    columns = [name.strip() for name in fields.split(",") if name.strip()]
+    invalid = [name for name in columns if not _FIELD_NAME.match(name)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid field name(s): {', '.join(invalid)}")
+    for required in ("id", sort_column, *extra):
+        if required not in columns:
+            columns.append(required)
+    return ",".join(dict.fromkeys(columns))
+
+
+def page_query(query, cursor: Optional[str], limit: int, sort_column: str = "created_at", desc: bool = False):
+    """
+    Restrict a PostgREST query to the page after cursor
+
+    Rows are ordered by (sort_column, id) so ties in the sort column page stably;
+    one extra row is fetched to tell whether another page follows.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        op = "lt" if desc else "gt"
+        query = query.or_(
+            f"{sort_column}.{op}.{_literal(sort_value)},"
+            f"and({sort_column}.eq.{_literal(sort_value)},id.{op}.{_literal(row_id)})"
+        )
+    return query.order(sort_column, desc=desc).order("id", desc=desc).limit(limit + 1)
+
+
+async def total_count(query) -> Optional[int]:
+    """
+    Number of rows a filtered query matches across all pages
+
+    query carries the endpoint's filters but not page_query's cursor, and is
+    selected with count="exact"; only one row is fetched.
+    """
+    return (await query.limit(1).execute()).count
+
+
+def page_result(rows: List[Dict[str, Any]], limit: int, sort_column: str = "created_at") -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim the look-ahead row and build the next cursor"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], sort_column)
+
+
+def project(row: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """fields= projection for rows that do not come from PostgREST"""
+    if not fields:
+        return row
+    return {name: row[name] for name in select_columns(fields, "id").split(",") if name in row}
+
+
+def _literal(value: Any) -> str:
+    # Quote values that contain PostgREST syntax characters (timestamps contain ':' and '+')
+    text = "null" if value is None else str(value)
+    if any(char in text for char in ',.:()" +'):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
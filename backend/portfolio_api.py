@@ -4,6 +4,9 @@ from typing import Dict, List, Optional
 import math
 import json
 
+from portfolio_projection import project_portfolios, DEFAULT_PERCENTILES
+from seeding import draw_seed
+
 router = APIRouter(prefix="/portfolio", tags=["portfolio"])
 
 # Prototype portfolios by wallet and type (wallet -> type -> portfolio)
@@ -11,7 +14,7 @@ _portfolios: Dict[str, Dict[str, Dict]] = {}
 
 # Try to import Supabase service
 try:
-    from services.supabase_service import supabase
+    from services.supabase_async import supabase
     HAS_SUPABASE = supabase is not None
 except:
     HAS_SUPABASE = False
@@ -39,8 +42,34 @@ class ProjectionRequest(BaseModel):
 	expected_annual_return: float = Field(0.07, ge=-1.0, le=5.0)
 
 
+class BatchProjectionRequest(BaseModel):
+	wallets: Optional[List[str]] = Field(None, max_length=10000, description="Wallets to project")
+	manager_wallet: Optional[str] = Field(None, description="Project every active follower of this manager instead")
+	years: int = Field(5, ge=1, le=50)
+	expected_annual_return: Optional[float] = Field(None, gt=-1.0, le=5.0, description="Defaults to the manager's ROI, else 0.07")
+	annual_volatility: Optional[float] = Field(None, ge=0.0, le=5.0, description="Defaults to ROI / Sharpe for a manager, else 0.15")
+	contribution_volatility: float = Field(0.1, ge=0.0, le=2.0, description="Year-to-year std. deviation of contribution levels")
+	paths: int = Field(1000, ge=10, le=5000)
+	percentiles: List[float] = Field(list(DEFAULT_PERCENTILES), min_length=1, max_length=20)
+	seed: Optional[int] = Field(None, ge=0, description="Seed for a reproducible run")
+
+
+# Followers read per request when projecting a manager's followers
+_FOLLOWER_PAGE = 1000
+
+
+def _wallet_inputs(wallet: str):
+	"""(holdings cost basis, monthly contribution) summed over a wallet's portfolios"""
+	monthly = 0.0
+	holdings_value = 0.0
+	for portfolio_type, portfolio in _portfolios.get(wallet, {}).items():
+		monthly += portfolio.get("recurring_investment_monthly", 0.0)
+		holdings_value += sum(h.get("cost_basis", 0.0) for h in portfolio.get("holdings", []))
+	return holdings_value, monthly
+
+
 @router.post("/upsert")
-def upsert_portfolio(p: PortfolioUpsert):
+async def upsert_portfolio(p: PortfolioUpsert):
 	portfolio_type = p.portfolio_type or "primary"
 	if p.wallet not in _portfolios:
 		_portfolios[p.wallet] = {}
@@ -54,7 +83,7 @@ def upsert_portfolio(p: PortfolioUpsert):
 			portfolio_data["holdings"] = json.dumps(portfolio_data.get("holdings", []))
 			portfolio_data["metadata"] = json.dumps(portfolio_data.get("metadata", {}))
 			
-			supabase.table("portfolios").upsert({
+			await supabase.table("portfolios").upsert({
 				"wallet": p.wallet,
 				"portfolio_type": portfolio_type,
 				"holdings": portfolio_data["holdings"],
@@ -70,14 +99,14 @@ def upsert_portfolio(p: PortfolioUpsert):
 
 
 @router.get("/{wallet}")
-def get_portfolio(wallet: str, portfolio_type: Optional[str] = None):
+async def get_portfolio(wallet: str, portfolio_type: Optional[str] = None):
 	"""Get portfolio(s) for a wallet. If portfolio_type is specified, returns that portfolio. Otherwise returns all portfolios."""
 	# Try to load from Supabase first if available
 	if HAS_SUPABASE:
 		try:
 			if portfolio_type:
 				# Load specific portfolio type
-				result = supabase.table("portfolios").select("*").eq("wallet", wallet).eq("portfolio_type", portfolio_type).execute()
+				result = await supabase.table("portfolios").select("*").eq("wallet", wallet).eq("portfolio_type", portfolio_type).execute()
 				if result.data and len(result.data) > 0:
 					portfolio_data = result.data[0]
 					# Parse JSON fields
@@ -89,7 +118,7 @@ def get_portfolio(wallet: str, portfolio_type: Optional[str] = None):
 					_portfolios[wallet][portfolio_type] = portfolio_data
 			else:
 				# Load all portfolios for this wallet
-				result = supabase.table("portfolios").select("*").eq("wallet", wallet).execute()
+				result = await supabase.table("portfolios").select("*").eq("wallet", wallet).execute()
 				if result.data:
 					wallet_portfolios = {}
 					for row in result.data:
@@ -133,13 +162,8 @@ def get_loan_eligibility(wallet: str):
 @router.post("/project")
 def project_portfolio(req: ProjectionRequest):
 	"""Project portfolio value across all portfolio types"""
-	wallet_portfolios = _portfolios.get(req.wallet, {})
 	# Aggregate across all portfolio types
-	monthly = 0.0
-	holdings_value = 0.0
-	for portfolio_type, portfolio in wallet_portfolios.items():
-		monthly += portfolio.get("recurring_investment_monthly", 0.0)
-		holdings_value += sum(h.get("cost_basis", 0.0) for h in portfolio.get("holdings", []))
+	holdings_value, monthly = _wallet_inputs(req.wallet)
 
 	# Compound monthly contributions at expected annual return
 	r = req.expected_annual_return
@@ -158,3 +182,72 @@ def project_portfolio(req: ProjectionRequest):
 	}
 
 
+@router.post("/project/batch")
+async def project_portfolio_batch(req: BatchProjectionRequest):
+	"""
+	Monte Carlo projection for many wallets, or all active followers of a manager
+
+	All portfolios share the simulated market paths; each has its own stochastic
+	contributions. Returns terminal value percentiles per wallet and combined.
+	"""
+	if bool(req.wallets) == bool(req.manager_wallet):
+		raise HTTPException(status_code=400, detail="Provide either wallets or manager_wallet")
+	if any(not 0 <= q <= 100 for q in req.percentiles):
+		raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+
+	expected_return = req.expected_annual_return
+	volatility = req.annual_volatility
+	if req.manager_wallet:
+		if not HAS_SUPABASE:
+			raise HTTPException(status_code=503, detail="Supabase not configured")
+		manager = await supabase.table("portfolio_managers").select("roi_annualized, sharpe_ratio").eq("wallet_address", req.manager_wallet).execute()
+		if not manager.data:
+			raise HTTPException(status_code=404, detail="Manager not found")
+		roi = float(manager.data[0].get("roi_annualized") or 0)
+		sharpe = float(manager.data[0].get("sharpe_ratio") or 0)
+		if expected_return is None:
+			# Same bounds as expected_annual_return (a return of -100% or worse has no log growth rate)
+			if not -1.0 < roi <= 5.0:
+				raise HTTPException(status_code=400, detail=f"Manager ROI {roi} is outside the projectable range; pass expected_annual_return")
+			expected_return = roi
+		if volatility is None and roi > 0 and sharpe > 0:
+			volatility = min(roi / sharpe, 5.0)
+		followers = []
+		while True:
+			query = supabase.table("portfolio_followers").select("id, follower_wallet, allocation_amount, copy_percent").eq("manager_wallet", req.manager_wallet).eq("active", True)
+			if followers:
+				query = query.gt("id", followers[-1]["id"])
+			batch = (await query.order("id").limit(_FOLLOWER_PAGE).execute()).data or []
+			followers.extend(batch)
+			if len(batch) < _FOLLOWER_PAGE:
+				break
+		wallets = [follower["follower_wallet"] for follower in followers]
+		# A follower's stake is the copied share of their allocation, plus their own contributions
+		initial = [float(f.get("allocation_amount") or 0) * float(f.get("copy_percent") or 0) / 100 for f in followers]
+		monthly = [_wallet_inputs(wallet)[1] for wallet in wallets]
+	else:
+		wallets = list(dict.fromkeys(req.wallets))
+		inputs = [_wallet_inputs(wallet) for wallet in wallets]
+		initial = [holdings for holdings, _ in inputs]
+		monthly = [contribution for _, contribution in inputs]
+
+	expected_return = 0.07 if expected_return is None else expected_return
+	volatility = 0.15 if volatility is None else volatility
+	seed = draw_seed(req.seed)
+	result = await project_portfolios(
+		initial, monthly, req.years, expected_return, volatility,
+		contribution_volatility=req.contribution_volatility,
+		paths=req.paths,
+		percentiles=sorted(req.percentiles),
+		seed=seed,
+	)
+	for wallet, start, contribution, projection in zip(wallets, initial, monthly, result["portfolios"]):
+		projection.update({"wallet": wallet, "initial_value": round(start, 2), "monthly_contribution": contribution})
+	result.update({
+		"manager_wallet": req.manager_wallet,
+		"years": req.years,
+		"expected_annual_return": expected_return,
+		"annual_volatility": volatility,
+		"seed": seed,
+	})
+	return result
@@ -0,0 +1,167 @@
+"""
+Batch Portfolio Projection
+Monte Carlo projections for many portfolios at once. All portfolios share one
+set of simulated market paths (as followers of one manager would); each
+portfolio adds its own stochastic contribution stream. Portfolios are
+simulated in fixed-size chunks with per-chunk seeds, so results are the same
+whether chunks run inline or on the process pool used for large batches.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+# Portfolios per chunk (the unit of work and of seeding), fewer when a chunk
+# would need more than PROJECTION_CHUNK_DRAWS contribution draws
+PROJECTION_CHUNK = int(os.getenv("PROJECTION_CHUNK", "256"))
+PROJECTION_CHUNK_DRAWS = int(os.getenv("PROJECTION_CHUNK_DRAWS", "2000000"))
+# Portfolio x path x year draws above which chunks go to the process pool
+PROJECTION_POOL_THRESHOLD = int(os.getenv("PROJECTION_POOL_THRESHOLD", "20000000"))
+# Pool size (defaults to the CPU count)
+PROJECTION_WORKERS = int(os.getenv("PROJECTION_WORKERS", "0")) or None
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def market_paths(years: int, paths: int, expected_return: float, volatility: float, rng: np.random.Generator):
+    """
+    Growth factors of the shared market paths
+
+    Returns (growth, contribution_growth): total growth of a unit invested at
+    the start, per path, and per path and year the growth of one unit
+    contributed each month of that year until the horizon.
+    """
+    months = years * 12
+    drift = np.log1p(expected_return) / 12 - 0.5 * volatility ** 2 / 12
+    log_returns = drift + volatility / np.sqrt(12) * rng.standard_normal((paths, months))
+    # Growth from the end of month m to the horizon
+    remaining = np.exp(np.cumsum(log_returns[:, ::-1], axis=1)[:, ::-1])
+    growth = remaining[:, 0]
+    after = np.concatenate([remaining[:, 1:], np.ones((paths, 1))], axis=1)
+    contribution_growth = after.reshape(paths, years, 12).sum(axis=2)
+    return growth, contribution_growth
+
+
+def _project_chunk(
+    initial: np.ndarray,
+    monthly: np.ndarray,
+    growth: np.ndarray,
+    contribution_growth: np.ndarray,
+    contribution_volatility: float,
+    seed: np.random.SeedSequence,
+    percentiles: np.ndarray,
+):
+    # Runs in pool workers: module-level and NumPy-only arguments
+    rng = np.random.default_rng(seed)
+    values = initial[:, None] * growth[None, :]
+    if contribution_volatility > 0 and monthly.any():
+        # Contribution level follows a lognormal random walk from year to year
+        portfolios, (paths, years) = len(initial), contribution_growth.shape
+        shocks = contribution_volatility * rng.standard_normal((portfolios, paths, years)) - 0.5 * contribution_volatility ** 2
+        level = np.exp(np.cumsum(shocks, axis=2) - shocks[:, :, :1])
+        values += monthly[:, None] * np.einsum("npy,py->np", level, contribution_growth)
+    else:
+        values += monthly[:, None] * contribution_growth.sum(axis=1)[None, :]
+    contributed = initial + monthly * contribution_growth.shape[1] * 12
+    return (
+        np.percentile(values, percentiles, axis=1).T,
+        values.mean(axis=1),
+        (values < contributed[:, None]).mean(axis=1),
+        values.sum(axis=0),
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Forking a server that already runs event-loop and HTTP threads can deadlock the children
+        _pool = ProcessPoolExecutor(max_workers=PROJECTION_WORKERS, mp_context=multiprocessing.get_context("forkserver"))
+    return _pool
+
+
+def shutdown_projection_pool():
+    """Stop the worker processes (call on application shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def project_portfolios(
+    initial: Sequence[float],
+    monthly: Sequence[float],
+    years: int,
+    expected_return: float,
+    volatility: float,
+    contribution_volatility: float = 0.1,
+    paths: int = 1000,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Terminal value distributions for portfolios with the given starting values
+    and monthly contributions
+
+    Returns:
+        Per-portfolio percentiles, mean and probability of ending below the
+        amount contributed, plus percentiles of the combined value, in input order
+    """
+    started = time.perf_counter()
+    initial = np.asarray(initial, dtype=np.float64)
+    monthly = np.asarray(monthly, dtype=np.float64)
+    q = np.asarray(percentiles, dtype=np.float64)
+    root = np.random.SeedSequence(seed)
+    market_seed, chunk_root = root.spawn(2)
+
+    growth, contribution_growth = market_paths(years, paths, expected_return, volatility, np.random.default_rng(market_seed))
+    chunk = max(1, min(PROJECTION_CHUNK, PROJECTION_CHUNK_DRAWS // (paths * years)))
+    bounds = list(range(0, len(initial), chunk))
+    chunk_seeds = chunk_root.spawn(len(bounds))
+    jobs = [
+        (initial[start:start + chunk], monthly[start:start + chunk], growth, contribution_growth,
+         contribution_volatility, chunk_seed, q)
+        for start, chunk_seed in zip(bounds, chunk_seeds)
+    ]
+
+    draws = len(initial) * paths * years
+    pooled = draws > PROJECTION_POOL_THRESHOLD and len(jobs) > 1
+    results = None
+    if pooled:
+        loop = asyncio.get_running_loop()
+        try:
+            pool = _get_pool()
+            results = await asyncio.gather(*(loop.run_in_executor(pool, _project_chunk, *job) for job in jobs))
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and finish this batch in a thread
+            shutdown_projection_pool()
+            pooled = False
+    if results is None:
+        # Small batches are cheaper than shipping arrays to other processes
+        results = await asyncio.to_thread(lambda: [_project_chunk(*job) for job in jobs])
+
+    labels = [f"p{value:g}" for value in q]
+    total = sum((result[3] for result in results), np.zeros(paths))
+    portfolios = []
+    for chunk_percentiles, means, below, _ in results:
+        for row, mean, probability in zip(chunk_percentiles.tolist(), means.tolist(), below.tolist()):
+            portfolios.append({
+                "percentiles": dict(zip(labels, [round(value, 2) for value in row])),
+                "mean": round(mean, 2),
+                "probability_below_contributed": round(probability, 4),
+            })
+    return {
+        "portfolios": portfolios,
+        "combined": dict(zip(labels, np.round(np.percentile(total, q), 2).tolist())),
+        "paths": paths,
+        "draws": draws,
+        "process_pool": pooled,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
@@ -0,0 +1,117 @@
+"""
+Read-Through Query Cache
+Bounded, TTL-expiring in-process cache for database reads that change rarely.
+Entries record the tables they were read from so writes can invalidate them.
+"""
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple, FrozenSet
+
+
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "30"))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1024"))
+
+
+class QueryCache:
+    """LRU cache with per-entry expiry and table-level invalidation"""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES, ttl: float = QUERY_CACHE_TTL):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        # key -> (expires_at, tables, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, FrozenSet[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by invalidate() so a read that started before a write is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], tables: Iterable[str]) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss
+
+        Values are copied on the way in and out, so callers may mutate what they get.
+        Exceptions from loader propagate and nothing is cached.
+        """
+        hit, value, generation = self._lookup(key)
+        if hit:
+            return value
+
+        value = loader()
+
+        self._store(key, value, tables, generation)
+        return value
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], tables: Iterable[str]) -> Any:
+        """get_or_load for an async loader (concurrent misses may each load once)"""
+        hit, value, generation = self._lookup(key)
+        if hit:
+            return value
+
+        value = await loader()
+
+        self._store(key, value, tables, generation)
+        return value
+
+    def invalidate(self, *tables: str):
+        """Drop entries read from any of tables (all entries when none are given)"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if not tables:
+                self._entries.clear()
+                return
+            stale = [key for key, (_, entry_tables, _) in self._entries.items() if entry_tables.intersection(tables)]
+            for key in stale:
+                del self._entries[key]
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any, int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, copy.deepcopy(entry[2]), self._generation
+            self.misses += 1
+            return False, None, self._generation
+
+    def _store(self, key: Hashable, value: Any, tables: Iterable[str], generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Global instance for celestial (star system / planet) reads
+_celestial_cache: Optional[QueryCache] = None
+
+
+def get_celestial_cache() -> QueryCache:
+    """Get or create the star system / planet query cache"""
+    global _celestial_cache
+    if _celestial_cache is None:
+        _celestial_cache = QueryCache()
+    return _celestial_cache
@@ -0,0 +1,76 @@
+"""
+JSON-RPC Batching
+Sends many JSON-RPC calls to a node in a single HTTP round trip
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+
+# Calls per HTTP request; nodes reject very large batches
+MAX_BATCH_SIZE = 500
+DEFAULT_TIMEOUT = 15.0
+
+_clients: Dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+class RpcBatchError(Exception):
+    """The node rejected the batch as a whole"""
+
+
+def _client(rpc_url: str) -> httpx.Client:
+    """Keep-alive client per RPC endpoint"""
+    with _clients_lock:
+        client = _clients.get(rpc_url)
+        if client is None:
+            client = httpx.Client(timeout=DEFAULT_TIMEOUT)
+            _clients[rpc_url] = client
+        return client
+
+
+def batch_call(
+    rpc_url: str,
+    calls: List[Tuple[str, List[Any]]],
+    timeout: float = DEFAULT_TIMEOUT
+) -> List[Optional[Any]]:
+    """
+    Execute JSON-RPC calls in batches
+
+    Args:
+        rpc_url: Node HTTP endpoint
+        calls: (method, params) pairs
+        timeout: Seconds per HTTP request
+
+    Returns:
+        One result per call, in order. Calls that returned an error are None.
+
+    Raises:
+        RpcBatchError: If the node rejects a batch or is unreachable
+    """
+    results: List[Optional[Any]] = [None] * len(calls)
+
+    for start in range(0, len(calls), MAX_BATCH_SIZE):
+        chunk = calls[start:start + MAX_BATCH_SIZE]
+        payload = [
+            {"jsonrpc": "2.0", "id": start + index, "method": method, "params": params}
+            for index, (method, params) in enumerate(chunk)
+        ]
+        try:
+            response = _client(rpc_url).post(rpc_url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise RpcBatchError(f"Batch request to {rpc_url} failed: {e}")
+
+        if not isinstance(data, list):
+            error = data.get("error") if isinstance(data, dict) else data
+            raise RpcBatchError(f"Node rejected batch request: {error}")
+
+        for item in data:
+            call_id = item.get("id")
+            if isinstance(call_id, int) and 0 <= call_id < len(results) and "error" not in item:
+                results[call_id] = item.get("result")
+
+    return results
@@ -0,0 +1,12 @@
+"""
+Simulation Seeds
+Seeds for the NumPy-based simulations, so every run can be replayed
+"""
+from typing import Optional
+
+import numpy as np
+
+
+def draw_seed(seed: Optional[int] = None) -> int:
+    """The given seed, or a fresh one to return with the results when none was given"""
+    return seed if seed is not None else int(np.random.SeedSequence().generate_state(1)[0])
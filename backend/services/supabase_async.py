@@ -0,0 +1,340 @@
+"""
+Async Supabase data access
+A non-blocking PostgREST client with the same fluent API as supabase-py
+(`await supabase.table("x").select("*").eq("id", 1).execute()`), sharing one
+pooled HTTP/2 connection set with request timeouts and retries.
+"""
+import asyncio
+import importlib.util
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+try:
+    from config import SUPABASE_URL, SUPABASE_KEY
+except ImportError:
+    SUPABASE_URL = os.getenv("SUPABASE_URL")
+    SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "2"))
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+
+# "supabase" (PostgREST over HTTP) or "sqlite" (embedded, see supabase_sqlite)
+DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "supabase").lower()
+
+# Statuses worth retrying: the gateway or database was briefly unavailable
+_RETRY_STATUSES = {502, 503, 504}
+_RETRY_BACKOFF = 0.25
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class SupabaseError(Exception):
+    """PostgREST rejected a request"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None, details: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.details = details
+
+
+class APIResponse:
+    """Result of a query: rows in data, and the total row count when requested"""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _format_value(value: Any) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    return str(value)
+
+
+def _quote(value: Any) -> str:
+    """Quote list members that would break PostgREST's in.(...) syntax"""
+    text = _format_value(value)
+    if any(char in text for char in ',()" '):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
+
+
+class AsyncQuery:
+    """One PostgREST request, built fluently and sent by execute()"""
+
+    def __init__(self, client: "AsyncSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._method = "GET"
+        self._params: List[Tuple[str, str]] = []
+        self._json: Any = None
+        self._prefer: List[str] = []
+        self._orders: List[str] = []
+        self._count = False
+
+    # Operations
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "AsyncQuery":
+        self._method = "GET"
+        self._params.append(("select", columns))
+        if count:
+            self._prefer.append(f"count={count}")
+            self._count = True
+        return self
+
+    def insert(self, data: Any) -> "AsyncQuery":
+        self._method = "POST"
+        self._json = data
+        self._prefer.append("return=representation")
+        self._add_columns(data)
+        return self
+
+    def upsert(self, data: Any, on_conflict: Optional[str] = None, ignore_duplicates: bool = False) -> "AsyncQuery":
+        self._method = "POST"
+        self._json = data
+        self._prefer.append("return=representation")
+        self._prefer.append("resolution=ignore-duplicates" if ignore_duplicates else "resolution=merge-duplicates")
+        if on_conflict:
+            self._params.append(("on_conflict", on_conflict))
+        self._add_columns(data)
+        return self
+
+    def update(self, data: Dict[str, Any]) -> "AsyncQuery":
+        self._method = "PATCH"
+        self._json = data
+        self._prefer.append("return=representation")
+        return self
+
+    def delete(self) -> "AsyncQuery":
+        self._method = "DELETE"
+        self._prefer.append("return=representation")
+        return self
+
+    # Filters and modifiers
+
+    def eq(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "AsyncQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "AsyncQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "AsyncQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "AsyncQuery":
+        self._params.append((column, f"in.({','.join(_quote(value) for value in values)})"))
+        return self
+
+    def or_(self, filters: str) -> "AsyncQuery":
+        """Match any of comma-separated PostgREST filters, e.g. "a.eq.1,b.gt.2" """
+        self._params.append(("or", f"({filters})"))
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None) -> "AsyncQuery":
+        order = f"{column}.{'desc' if desc else 'asc'}"
+        if nullsfirst is not None:
+            order += ".nullsfirst" if nullsfirst else ".nullslast"
+        self._orders.append(order)
+        return self
+
+    def limit(self, size: int) -> "AsyncQuery":
+        self._params.append(("limit", str(size)))
+        return self
+
+    def range(self, start: int, end: int) -> "AsyncQuery":
+        self._params.append(("offset", str(start)))
+        self._params.append(("limit", str(end - start + 1)))
+        return self
+
+    async def execute(self) -> APIResponse:
+        params = list(self._params)
+        if self._orders:
+            params.append(("order", ",".join(self._orders)))
+        headers = {"Prefer": ",".join(self._prefer)} if self._prefer else {}
+
+        response = await self._client.request(
+            self._method,
+            f"/{self._table}",
+            params=params,
+            json=self._json,
+            headers=headers,
+            # A plain insert may have been applied if the response was lost
+            retry_unsent_only=self._method == "POST" and "resolution=" not in headers.get("Prefer", "")
+        )
+        return APIResponse(
+            data=response.json() if response.content else [],
+            count=_content_range_total(response) if self._count else None
+        )
+
+    def _filter(self, column: str, operator: str, value: Any) -> "AsyncQuery":
+        self._params.append((column, f"{operator}.{_format_value(value)}"))
+        return self
+
+    def _add_columns(self, data: Any):
+        # Bulk writes need the union of keys so rows with missing keys get defaults
+        if isinstance(data, list) and data:
+            columns = sorted({key for row in data for key in row})
+            self._params.append(("columns", ",".join(columns)))
+
+
+def _content_range_total(response: httpx.Response) -> Optional[int]:
+    content_range = response.headers.get("content-range", "")
+    total = content_range.rsplit("/", 1)[-1]
+    return int(total) if total.isdigit() else None
+
+
+class AsyncSupabase:
+    """Pooled async PostgREST client for one Supabase project"""
+
+    def __init__(self, url: str, key: str, timeout: float = SUPABASE_TIMEOUT, max_retries: int = SUPABASE_MAX_RETRIES):
+        self.rest_url = f"{url.rstrip('/')}/rest/v1"
+        self.max_retries = max_retries
+        self._http = httpx.AsyncClient(
+            base_url=self.rest_url,
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_CONNECTIONS
+            ),
+            http2=_HTTP2
+        )
+
+    def table(self, name: str) -> AsyncQuery:
+        return AsyncQuery(self, name)
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None, idempotent: bool = False) -> "AsyncRpc":
+        """
+        Call a Postgres function
+
+        Failed responses are only retried when idempotent is set (functions that
+        read, or write the same result when repeated); otherwise a function the
+        database already ran could be applied twice.
+        """
+        return AsyncRpc(self, function, params or {}, idempotent)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[List[Tuple[str, str]]] = None,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        retry_unsent_only: bool = False
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transient failures with backoff
+
+        Raises:
+            SupabaseError: If PostgREST returns an error or the request keeps failing
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(method, path, params=params, json=json, headers=headers)
+            except httpx.TransportError as e:
+                # Connection failures mean the request never reached the server
+                unsent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if attempt >= self.max_retries or (retry_unsent_only and not unsent):
+                    raise SupabaseError(f"Supabase request failed: {e}") from e
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt >= self.max_retries or retry_unsent_only:
+                    if response.is_error:
+                        raise _error_from(response)
+                    return response
+
+            attempt += 1
+            await asyncio.sleep(_RETRY_BACKOFF * (2 ** (attempt - 1)))
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+class AsyncRpc:
+    """Call of a Postgres function exposed by PostgREST"""
+
+    def __init__(self, client: AsyncSupabase, function: str, params: Dict[str, Any], idempotent: bool = False):
+        self._client = client
+        self._function = function
+        self._params = params
+        self._idempotent = idempotent
+
+    async def execute(self) -> APIResponse:
+        response = await self._client.request(
+            "POST",
+            f"/rpc/{self._function}",
+            json=self._params,
+            retry_unsent_only=not self._idempotent
+        )
+        return APIResponse(data=response.json() if response.content else None)
+
+
+def _error_from(response: httpx.Response) -> SupabaseError:
+    try:
+        body = response.json()
+    except ValueError:
+        body = {"message": response.text}
+    if not isinstance(body, dict):
+        body = {"message": str(body)}
+    return SupabaseError(
+        body.get("message") or f"HTTP {response.status_code}",
+        status_code=response.status_code,
+        code=body.get("code"),
+        details=body.get("details") or body.get("hint")
+    )
+
+
+def create_async_client(url: Optional[str], key: Optional[str]) -> Optional[AsyncSupabase]:
+    """
+    Client for url/key, or None when Supabase is not configured
+
+    DATABASE_BACKEND=sqlite selects the embedded SQLite stand-in instead
+    (SQLITE_DB_PATH, in-memory by default).
+    """
+    if DATABASE_BACKEND == "sqlite":
+        try:
+            from services.supabase_sqlite import create_sqlite_client
+        except ImportError:
+            from .supabase_sqlite import create_sqlite_client
+        return create_sqlite_client()
+    if not url or not key:
+        return None
+    return AsyncSupabase(url, key)
+
+
+# Shared instance (None when Supabase is not configured)
+supabase: Optional[AsyncSupabase] = create_async_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+async def close_supabase():
+    """Release pooled connections (call on application shutdown)"""
+    if supabase is not None:
+        await supabase.aclose()
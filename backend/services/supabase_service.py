@@ -1,70 +1,176 @@
+import asyncio
 import os
 from typing import Optional
 from fastapi import HTTPException
 
-# Optional Supabase integration
-supabase = None
+# Optional Supabase integration (async client; None when not configured)
 try:
-    from supabase import create_client
-    
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_KEY")
-    
-    if url and key:
-        supabase = create_client(url, key)
+    from services.supabase_async import supabase, SupabaseError
 except ImportError:
-    # Supabase not installed
-    pass
-except Exception as e:
-    print(f"Warning: Could not initialize Supabase: {e}")
+    from .supabase_async import supabase, SupabaseError
 
-def upsert_plot(wallet, token_id, metadata):
-    """Upsert plot data to Supabase"""
+# Plots per bulk upsert request, and how many requests a bulk write keeps in flight
+PLOT_UPSERT_CHUNK = int(os.getenv("PLOT_UPSERT_CHUNK", "500"))
+PLOT_UPSERT_CONCURRENCY = int(os.getenv("PLOT_UPSERT_CONCURRENCY", "4"))
+
+PLOT_ZONES = ("residential", "business", "industrial")
+MAX_PLOT_ID = 10000
+
+def _require_supabase():
     if not supabase:
         raise HTTPException(
             status_code=503,
             detail="Supabase service not configured. Set SUPABASE_URL and SUPABASE_SERVICE_KEY in environment."
         )
-    
+
+def _flatten_attributes(metadata):
+    """Merge ERC-721 `attributes` ({trait_type, value} pairs) into the top level"""
+    flat = {}
+    for attribute in metadata.get("attributes") or []:
+        if isinstance(attribute, dict) and attribute.get("trait_type"):
+            flat[attribute["trait_type"]] = attribute.get("value")
+    flat.update({k: v for k, v in metadata.items() if k != "attributes"})
+    return flat
+
+def _as_int(value, field):
+    try:
+        if isinstance(value, str) and value.lower().startswith("0x"):
+            # Alchemy returns token ids as hex strings
+            return int(value, 16)
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer, got {value!r}")
+
+def normalize_plot(wallet, token_id, metadata):
+    """
+    Map NFT metadata onto a plots row
+
+    Raises:
+        ValueError: If the metadata cannot satisfy the plots table constraints
+    """
+    metadata = _flatten_attributes(metadata or {})
+
+    plot_id = _as_int(metadata.get("plotId") or token_id, "plot id")
+    if not 0 <= plot_id < MAX_PLOT_ID:
+        raise ValueError(f"plot id {plot_id} is outside 0-{MAX_PLOT_ID - 1}")
+
+    zone_type = str(metadata.get("zoneType") or metadata.get("zone") or "residential").lower()
+    if zone_type not in PLOT_ZONES:
+        raise ValueError(f"unknown zone type {zone_type!r}")
+
+    building_stage = _as_int(metadata.get("building_stage") or 0, "building_stage")
+    if not 0 <= building_stage <= 3:
+        raise ValueError(f"building_stage {building_stage} is outside 0-3")
+
+    plot_data = {
+        "id": plot_id,
+        "owner_wallet": metadata.get("owner") or wallet,
+        "zone_type": zone_type,
+        "coord_x": _as_int(metadata.get("coord_x") or metadata.get("x") or 0, "coord_x"),
+        "coord_y": _as_int(metadata.get("coord_y") or metadata.get("y") or 0, "coord_y"),
+        "building_stage": building_stage,
+        "production_rate": metadata.get("production_rate") or 0,
+        "metadata_cid": metadata.get("metadata_cid") or None,
+        "workers": metadata.get("workers") or [],
+    }
+
+    # Leave columns without a value untouched on existing rows
+    return {k: v for k, v in plot_data.items() if v is not None}
+
+async def upsert_plot(wallet, token_id, metadata):
+    """Upsert plot data to Supabase"""
+    _require_supabase()
+
+    try:
+        plot_data = normalize_plot(wallet, token_id, metadata)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid plot metadata: {str(e)}")
+
     try:
-        # Extract plot data from metadata if available
-        plot_id = metadata.get("plotId") or token_id
-        owner_wallet = metadata.get("owner") or wallet
-        zone_type = metadata.get("zoneType") or metadata.get("zone") or "residential"
-        
-        # Prepare plot data for Supabase schema
-        plot_data = {
-            "id": int(plot_id) if isinstance(plot_id, (int, str)) and str(plot_id).isdigit() else None,
-            "owner_wallet": owner_wallet,
-            "zone_type": zone_type,
-            "coord_x": metadata.get("coord_x") or metadata.get("x") or 0,
-            "coord_y": metadata.get("coord_y") or metadata.get("y") or 0,
-            "building_stage": metadata.get("building_stage") or 0,
-            "production_rate": metadata.get("production_rate") or 0,
-            "metadata_cid": metadata.get("metadata_cid") or None,
-            "workers": metadata.get("workers") or [],
-        }
-        
-        # Remove None values to avoid schema issues
-        plot_data = {k: v for k, v in plot_data.items() if v is not None}
-        
         # Upsert to plots table
-        supabase.table("plots").upsert(plot_data, on_conflict="id").execute()
+        await supabase.table("plots").upsert(plot_data, on_conflict="id").execute()
         
         # Also save full metadata to a separate table or as JSON if needed
         # The metadata contains purchase info, deed, etc.
-        return {"success": True, "plot_id": plot_id}
+        return {"success": True, "plot_id": plot_data["id"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error upserting plot: {str(e)}")
 
-def get_plots_for_wallet(wallet):
+async def upsert_plots(wallet, items):
+    """
+    Bulk upsert plots, PLOT_UPSERT_CHUNK rows per request
+
+    items is an iterable of (token_id, metadata). Rows that fail normalization or
+    are rejected by the database are reported individually instead of failing the
+    whole batch. Returns {"upserted": n, "failed": [{"token_id", "error"}, ...]}.
+    """
+    _require_supabase()
+
+    failed = []
+    rows = {}
+    token_ids = {}
+    for token_id, metadata in items:
+        try:
+            row = normalize_plot(wallet, token_id, metadata)
+        except ValueError as e:
+            failed.append({"token_id": token_id, "error": str(e)})
+            continue
+        # One statement cannot upsert the same id twice; the last occurrence wins
+        rows[row["id"]] = row
+        token_ids[row["id"]] = token_id
+
+    # PostgREST fills columns missing from a row with defaults, so only rows with
+    # the same columns share a request (keeps e.g. an absent metadata_cid intact)
+    groups = {}
+    for row in rows.values():
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    chunks = [
+        group[start:start + PLOT_UPSERT_CHUNK]
+        for group in groups.values()
+        for start in range(0, len(group), PLOT_UPSERT_CHUNK)
+    ]
+
+    semaphore = asyncio.Semaphore(max(1, PLOT_UPSERT_CONCURRENCY))
+
+    async def write(chunk):
+        async with semaphore:
+            return await _upsert_plot_chunk(chunk)
+
+    upserted = 0
+    for written, errors in await asyncio.gather(*(write(chunk) for chunk in chunks)):
+        upserted += written
+        failed.extend({"token_id": token_ids[row["id"]], "error": error} for row, error in errors)
+
+    return {"upserted": upserted, "failed": failed}
+
+async def _upsert_plot_chunk(chunk):
+    """Write one chunk; if the database rejects it, bisect to find the bad rows"""
+    try:
+        await supabase.table("plots").upsert(chunk, on_conflict="id").execute()
+        return len(chunk), []
+    except SupabaseError as e:
+        # Only a constraint/validation error (4xx) is specific to some rows
+        rejected = e.status_code is not None and 400 <= e.status_code < 500
+        if not rejected or len(chunk) == 1:
+            return 0, [(row, str(e)) for row in chunk]
+    except Exception as e:
+        return 0, [(row, str(e)) for row in chunk]
+
+    middle = len(chunk) // 2
+    (left_written, left_errors), (right_written, right_errors) = await asyncio.gather(
+        _upsert_plot_chunk(chunk[:middle]),
+        _upsert_plot_chunk(chunk[middle:])
+    )
+    return left_written + right_written, left_errors + right_errors
+
+async def get_plots_for_wallet(wallet):
     """Get plots for a wallet from Supabase"""
     if not supabase:
         # Return empty list if Supabase not configured
         return []
     
     try:
-        result = supabase.table("plots").select("*").eq("wallet", wallet).execute()
+        result = await supabase.table("plots").select("*").eq("wallet", wallet).execute()
         return result.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching plots: {str(e)}")
@@ -0,0 +1,888 @@
+"""
+Embedded SQLite data access
+A local stand-in for Supabase implementing the PostgREST subset the routers use
+(`await supabase.table("x").select("*").eq("id", 1).order("name").execute()`).
+The schema is built from supabase/migrations: tables, defaults, checks, foreign
+keys, indexes and updated_at triggers are translated; policies, functions and
+seed data are not.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from services.supabase_async import APIResponse, SupabaseError
+except ImportError:
+    from .supabase_async import APIResponse, SupabaseError
+
+
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", ":memory:")
+SQLITE_MIGRATIONS_DIR = os.getenv(
+    "SQLITE_MIGRATIONS_DIR",
+    str(Path(__file__).resolve().parents[2] / "supabase" / "migrations")
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# Schema model
+
+@dataclass
+class Column:
+    name: str
+    # text, integer, real, bool, json, uuid or timestamp
+    kind: str
+    # Constant, or a zero-argument callable for volatile defaults (now(), gen_random_uuid())
+    default: Any = None
+    unique: bool = False
+
+
+@dataclass
+class ForeignKey:
+    name: str
+    table: str
+    column: str
+    ref_table: str
+    ref_column: str
+
+
+@dataclass
+class Table:
+    name: str
+    columns: Dict[str, Column] = field(default_factory=dict)
+    primary_key: List[str] = field(default_factory=list)
+    foreign_keys: List[ForeignKey] = field(default_factory=list)
+    # Emulates the update_updated_at_column() trigger
+    touch_updated_at: bool = False
+
+    def is_unique(self, column: str) -> bool:
+        return self.primary_key == [column] or self.columns[column].unique
+
+
+_TYPE_RE = re.compile(
+    r"(timestamp\s+with(?:out)?\s+time\s+zone|double\s+precision|character\s+varying|\w+)\s*(\([\d\s,]+\))?\s*(\[\])?",
+    re.I
+)
+
+_KINDS = {
+    "uuid": "uuid",
+    "boolean": "bool", "bool": "bool",
+    "int": "integer", "integer": "integer", "int4": "integer", "int8": "integer",
+    "bigint": "integer", "smallint": "integer", "serial": "integer", "bigserial": "integer",
+    "numeric": "real", "decimal": "real", "real": "real", "float": "real", "float8": "real",
+    "double precision": "real",
+    "json": "json", "jsonb": "json",
+    "timestamptz": "timestamp", "timestamp": "timestamp", "date": "timestamp",
+    "timestamp with time zone": "timestamp", "timestamp without time zone": "timestamp",
+}
+
+_SQL_TYPES = {"integer": "INTEGER", "bool": "INTEGER", "real": "REAL"}
+
+
+def _kind(type_name: str, is_array: bool) -> str:
+    if is_array:
+        return "json"
+    return _KINDS.get(re.sub(r"\s+", " ", type_name.lower()), "text")
+
+
+def _mask_strings(text: str) -> str:
+    """Blank out quoted contents so keyword searches don't match inside literals"""
+    return re.sub(r"'(?:[^']|'')*'", lambda m: "'" + "_" * (len(m.group(0)) - 2) + "'", text)
+
+
+def _split_top(text: str, sep: str = ",") -> List[str]:
+    """Split on sep outside parentheses and quotes"""
+    parts, depth, quote, current = [], 0, None, []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == sep and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _balanced(text: str, start: int) -> int:
+    """Index just past the parenthesis group opening at text[start]"""
+    depth = 0
+    for index in range(start, len(text)):
+        if text[index] == "(":
+            depth += 1
+        elif text[index] == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return len(text)
+
+
+def _split_statements(sql: str) -> List[str]:
+    """Split a migration into statements, dropping comments and keeping $$ bodies whole"""
+    statements, current, index = [], [], 0
+    while index < len(sql):
+        char = sql[index]
+        if sql.startswith("--", index):
+            index = sql.find("\n", index)
+            if index < 0:
+                break
+            continue
+        if char == "'":
+            end = index + 1
+            while end < len(sql):
+                if sql[end] == "'" and sql[end + 1:end + 2] != "'":
+                    break
+                end += 2 if sql[end] == "'" else 1
+            current.append(sql[index:end + 1])
+            index = end + 1
+            continue
+        dollar = re.match(r"\$\w*\$", sql[index:])
+        if dollar:
+            end = sql.find(dollar.group(0), index + len(dollar.group(0)))
+            end = len(sql) if end < 0 else end + len(dollar.group(0))
+            current.append(sql[index:end])
+            index = end
+            continue
+        if char == ";":
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        index += 1
+    statements.append("".join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def _parse_default(expr: str, kind: str) -> Any:
+    expr = re.sub(r"::[\w\s]+(\[\])?$", "", expr.strip()).strip()
+    lowered = expr.lower()
+    if lowered in ("gen_random_uuid()", "uuid_generate_v4()"):
+        return lambda: str(uuid.uuid4())
+    if lowered in ("now()", "current_timestamp", "timezone('utc'::text, now())"):
+        return _now
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered == "null":
+        return None
+    array = re.match(r"array\[(.*)\]$", expr, re.I | re.S)
+    if array:
+        return [_parse_default(item, "text") for item in _split_top(array.group(1))]
+    if expr.startswith("'") and expr.endswith("'"):
+        text = expr[1:-1].replace("''", "'")
+        if kind == "json":
+            return json.loads(text)
+        return text
+    try:
+        return int(expr)
+    except ValueError:
+        pass
+    try:
+        return float(expr)
+    except ValueError:
+        return None
+
+
+_COLUMN_END = re.compile(r"\s+(not\s+null|null|check|unique|references|primary\s+key|constraint|default)\b", re.I)
+
+
+class SchemaBuilder:
+    """Translates migration DDL into SQLite and records the schema model"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.tables: Dict[str, Table] = {}
+        self.enums: set = set()
+
+    def apply_file(self, path: Path, execute: bool):
+        for statement in _split_statements(path.read_text()):
+            self.apply(statement, execute)
+
+    def apply(self, statement: str, execute: bool):
+        text = re.sub(r"\bpublic\.", "", statement.strip())
+        head = re.sub(r"\s+", " ", text[:80]).lower()
+
+        if head.startswith("create table"):
+            self._create_table(text, execute)
+        elif head.startswith("alter table") and re.search(r"\badd\s+column\b", text, re.I):
+            self._add_columns(text, execute)
+        elif re.match(r"create (unique )?index", head):
+            self._create_index(text, execute)
+        elif head.startswith("create type") and " as enum" in head:
+            self.enums.add(text.split()[2].lower())
+        elif head.startswith("create trigger") and "update_updated_at_column" in text.lower():
+            match = re.search(r"\bon\s+(\w+)", text, re.I)
+            if match and match.group(1) in self.tables:
+                self.tables[match.group(1)].touch_updated_at = True
+        # Policies, RLS, functions, comments and seed data have no SQLite counterpart
+
+    def _create_table(self, text: str, execute: bool):
+        match = re.match(r"create\s+table\s+(if\s+not\s+exists\s+)?(\w+)\s*\(", text, re.I)
+        name = match.group(2)
+        if name in self.tables:
+            return
+        body = text[match.end():text.rfind(")")]
+
+        table = Table(name=name)
+        definitions = []
+        for item in _split_top(body):
+            lowered = item.lower()
+            if re.match(r"(unique|primary\s+key|check|constraint|foreign\s+key)\b", lowered):
+                if lowered.startswith("primary"):
+                    table.primary_key = [c.strip() for c in item[item.index("(") + 1:item.rindex(")")].split(",")]
+                elif lowered.startswith("unique"):
+                    columns = [c.strip() for c in item[item.index("(") + 1:item.rindex(")")].split(",")]
+                    if len(columns) == 1:
+                        table.columns[columns[0]].unique = True
+                if not lowered.startswith("foreign") and "::" not in item:
+                    definitions.append(item)
+                continue
+            column, definition = self._column(name, item, table)
+            table.columns[column.name] = column
+            definitions.append(definition)
+
+        self.tables[name] = table
+        if execute:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(definitions)})")
+
+    def _column(self, table_name: str, item: str, table: Optional[Table], in_alter: bool = False) -> Tuple[Column, str]:
+        name, rest = item.split(None, 1)
+        type_match = _TYPE_RE.match(rest)
+        type_name = type_match.group(1)
+        kind = "text" if type_name.lower() in self.enums else _kind(type_name, bool(type_match.group(3)))
+        rest = rest[type_match.end():]
+        masked = _mask_strings(rest)
+
+        column = Column(name=name, kind=kind)
+        parts = [name, _SQL_TYPES.get(kind, "TEXT")]
+
+        default = re.search(r"\bdefault\s+", masked, re.I)
+        if default:
+            end = _COLUMN_END.search(masked, default.end())
+            column.default = _parse_default(rest[default.end():end.start() if end else len(rest)], kind)
+        if re.search(r"\bprimary\s+key\b", masked, re.I):
+            parts.append("PRIMARY KEY")
+            if table is not None:
+                table.primary_key = [name]
+        if re.search(r"\bnot\s+null\b", masked, re.I) and not in_alter:
+            parts.append("NOT NULL")
+        if re.search(r"\bunique\b", masked, re.I):
+            column.unique = True
+            if not in_alter:
+                parts.append("UNIQUE")
+        check = re.search(r"\bcheck\s*\(", masked, re.I)
+        if check and not in_alter:
+            clause = rest[check.start():_balanced(rest, check.end() - 1)]
+            if "::" not in clause and "any(" not in clause.lower():
+                parts.append(clause)
+        reference = re.search(r"\breferences\s+(\w+)\s*(?:\((\w+)\))?((?:\s+on\s+(?:delete|update)\s+(?:cascade|set\s+null|restrict|no\s+action))*)", rest, re.I)
+        if reference:
+            ref_column = reference.group(2) or "id"
+            if table is not None:
+                table.foreign_keys.append(ForeignKey(
+                    name=f"{table_name}_{name}_fkey", table=table_name, column=name,
+                    ref_table=reference.group(1), ref_column=ref_column
+                ))
+            if not in_alter:
+                parts.append(f"REFERENCES {reference.group(1)}({ref_column}){reference.group(3) or ''}")
+
+        return column, " ".join(parts)
+
+    def _add_columns(self, text: str, execute: bool):
+        match = re.match(r"alter\s+table\s+(?:if\s+exists\s+)?(?:only\s+)?(\w+)\s+", text, re.I)
+        table = self.tables.get(match.group(1))
+        if table is None:
+            return
+        for clause in _split_top(text[match.end():]):
+            add = re.match(r"add\s+column\s+(if\s+not\s+exists\s+)?(.*)$", clause, re.I | re.S)
+            if not add:
+                continue
+            column, definition = self._column(table.name, add.group(2), table, in_alter=True)
+            if column.name in table.columns:
+                continue
+            table.columns[column.name] = column
+            if not execute:
+                continue
+            self.conn.execute(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+            if column.unique:
+                self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table.name}_{column.name}_key ON {table.name} ({column.name})")
+            if column.default is not None and not callable(column.default):
+                # Postgres backfills existing rows with the default
+                self.conn.execute(f"UPDATE {table.name} SET {column.name} = ?", (_encode(column, column.default),))
+
+    def _create_index(self, text: str, execute: bool):
+        match = re.match(
+            r"create\s+(unique\s+)?index\s+(?:concurrently\s+)?(?:if\s+not\s+exists\s+)?(\w+)\s+on\s+(?:only\s+)?(\w+)\s*(?:using\s+\w+\s*)?\((.*)\)\s*(where\s+.*)?$",
+            text, re.I | re.S
+        )
+        if not match or match.group(3) not in self.tables or not execute:
+            return
+        unique, name, table, columns, where = match.groups()
+        if "::" in columns or "(" in columns:
+            # Expression indexes (casts, functions) are Postgres-specific
+            return
+        self.conn.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({columns}) {where or ''}"
+        )
+
+
+# Value conversion
+
+def _encode(column: Optional[Column], value: Any) -> Any:
+    if column is None:
+        return value
+    if column.kind == "json" or isinstance(value, (dict, list)):
+        return None if value is None else json.dumps(value)
+    if column.kind == "bool" and isinstance(value, str):
+        return 1 if value.lower() == "true" else 0
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _decode(table: Table, row: sqlite3.Row) -> Dict[str, Any]:
+    decoded = {}
+    for key in row.keys():
+        value = row[key]
+        column = table.columns.get(key)
+        if value is not None and column is not None:
+            if column.kind == "json":
+                value = json.loads(value)
+            elif column.kind == "bool":
+                value = bool(value)
+        decoded[key] = value
+    return decoded
+
+
+# Queries
+
+_COMPARISONS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def _parse_logic(filters: str) -> List[Any]:
+    """PostgREST logic tree: "a.eq.1,and(b.gt.2,c.is.null)" -> nested tuples"""
+    nodes = []
+    for item in _split_top(filters):
+        group = re.match(r"(not\.)?(and|or)\((.*)\)$", item, re.S)
+        if group:
+            nodes.append((group.group(2), _parse_logic(group.group(3)), bool(group.group(1))))
+            continue
+        column, operator, value = item.split(".", 2)
+        negate = operator == "not"
+        if negate:
+            operator, value = value.split(".", 1)
+        if operator == "in":
+            value = [_unquote(v) for v in _split_top(value.strip()[1:-1])]
+        else:
+            value = _unquote(value)
+        nodes.append(("filter", (column, operator, value), negate))
+    return nodes
+
+
+class SqliteQuery:
+    """One query against the embedded database, built like AsyncQuery"""
+
+    def __init__(self, client: "SqliteSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._operation = "select"
+        self._columns = "*"
+        self._data: Any = None
+        self._on_conflict: Optional[str] = None
+        self._ignore_duplicates = False
+        self._filters: List[Any] = []
+        self._orders: List[Tuple[str, bool, Optional[bool]]] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+        self._count = False
+
+    # Operations
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "SqliteQuery":
+        self._operation = "select"
+        self._columns = columns
+        self._count = bool(count)
+        return self
+
+    def insert(self, data: Any) -> "SqliteQuery":
+        self._operation = "insert"
+        self._data = data
+        return self
+
+    def upsert(self, data: Any, on_conflict: Optional[str] = None, ignore_duplicates: bool = False) -> "SqliteQuery":
+        self._operation = "upsert"
+        self._data = data
+        self._on_conflict = on_conflict
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, data: Dict[str, Any]) -> "SqliteQuery":
+        self._operation = "update"
+        self._data = data
+        return self
+
+    def delete(self) -> "SqliteQuery":
+        self._operation = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def eq(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "SqliteQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "SqliteQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "SqliteQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "SqliteQuery":
+        return self._filter(column, "in", list(values))
+
+    def or_(self, filters: str) -> "SqliteQuery":
+        """Match any of comma-separated PostgREST filters, e.g. "a.eq.1,b.gt.2" """
+        self._filters.append(("or", _parse_logic(filters), False))
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None) -> "SqliteQuery":
+        self._orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int) -> "SqliteQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int) -> "SqliteQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    async def execute(self) -> APIResponse:
+        # Queries take microseconds, so they run inline rather than on a thread
+        return self._client.run(self._execute)
+
+    def _filter(self, column: str, operator: str, value: Any) -> "SqliteQuery":
+        self._filters.append(("filter", (column, operator, value), False))
+        return self
+
+    # Execution
+
+    def _execute(self, conn: sqlite3.Connection) -> APIResponse:
+        table = self._client.get_table(self._table)
+        if self._operation == "select":
+            return self._select(conn, table)
+        if self._operation in ("insert", "upsert"):
+            return APIResponse(data=self._write(conn, table))
+        if self._operation == "update":
+            return APIResponse(data=self._update(conn, table))
+        return APIResponse(data=self._delete(conn, table))
+
+    def _select(self, conn: sqlite3.Connection, table: Table) -> APIResponse:
+        where, params = self._where(table)
+        sql = f"SELECT * FROM {table.name}{where}{self._order_sql(table)}"
+        if self._limit is not None or self._offset:
+            sql += f" LIMIT {int(self._limit) if self._limit is not None else -1}"
+            if self._offset:
+                sql += f" OFFSET {int(self._offset)}"
+        rows = [_decode(table, row) for row in conn.execute(sql, params)]
+
+        count = None
+        if self._count:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table.name}{where}", params).fetchone()[0]
+        return APIResponse(data=self._client.shape(conn, table, rows, self._columns), count=count)
+
+    def _write(self, conn: sqlite3.Connection, table: Table) -> List[Dict[str, Any]]:
+        rows = self._data if isinstance(self._data, list) else [self._data]
+        if not rows:
+            return []
+        # A bulk write covers the union of keys (PostgREST's columns=), a single row only its own
+        given = list(dict.fromkeys(key for row in rows for key in row))
+        self._check_columns(table, given)
+
+        conflict = [c.strip() for c in self._on_conflict.split(",")] if self._on_conflict else table.primary_key
+        written = []
+        for row in rows:
+            values = {key: row.get(key, self._default(table.columns[key])) for key in given}
+            for column in table.columns.values():
+                if column.name not in values and column.default is not None:
+                    values[column.name] = self._default(column)
+            columns = list(values)
+            sql = (
+                f"INSERT INTO {table.name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            if self._operation == "upsert":
+                updates = [key for key in given if key not in conflict]
+                if self._ignore_duplicates or not updates:
+                    sql += f" ON CONFLICT ({', '.join(conflict)}) DO NOTHING"
+                else:
+                    if table.touch_updated_at and "updated_at" not in updates:
+                        # The insert half already carries now() from the column default
+                        updates.append("updated_at")
+                    sql += (
+                        f" ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET "
+                        + ", ".join(f"{key} = excluded.{key}" for key in updates)
+                    )
+            sql += " RETURNING *"
+            params = [_encode(table.columns[key], values[key]) for key in columns]
+            written.extend(_decode(table, result) for result in conn.execute(sql, params))
+        return written
+
+    def _update(self, conn: sqlite3.Connection, table: Table) -> List[Dict[str, Any]]:
+        values = dict(self._data)
+        self._check_columns(table, values)
+        if table.touch_updated_at and "updated_at" not in values:
+            values["updated_at"] = _now()
+        where, params = self._where(table)
+        assignments = ", ".join(f"{key} = ?" for key in values)
+        sql = f"UPDATE {table.name} SET {assignments}{where} RETURNING *"
+        encoded = [_encode(table.columns[key], value) for key, value in values.items()]
+        return [_decode(table, row) for row in conn.execute(sql, encoded + params)]
+
+    def _delete(self, conn: sqlite3.Connection, table: Table) -> List[Dict[str, Any]]:
+        where, params = self._where(table)
+        return [_decode(table, row) for row in conn.execute(f"DELETE FROM {table.name}{where} RETURNING *", params)]
+
+    @staticmethod
+    def _default(column: Column) -> Any:
+        return column.default() if callable(column.default) else column.default
+
+    def _check_columns(self, table: Table, columns: Iterable[str]):
+        for key in columns:
+            if key not in table.columns:
+                raise SupabaseError(
+                    f"Could not find the '{key}' column of '{table.name}' in the schema cache",
+                    status_code=400, code="PGRST204"
+                )
+
+    def _where(self, table: Table) -> Tuple[str, List[Any]]:
+        if not self._filters:
+            return "", []
+        sql, params = self._logic("and", self._filters, table)
+        return f" WHERE {sql}", params
+
+    def _logic(self, joiner: str, nodes: List[Any], table: Table) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for kind, payload, negate in nodes:
+            if kind == "filter":
+                clause, clause_params = self._condition(table, *payload)
+            else:
+                clause, clause_params = self._logic(kind, payload, table)
+            clauses.append(f"NOT ({clause})" if negate else clause)
+            params.extend(clause_params)
+        return "(" + f" {joiner.upper()} ".join(clauses) + ")", params
+
+    def _condition(self, table: Table, column_name: str, operator: str, value: Any) -> Tuple[str, List[Any]]:
+        column = table.columns.get(column_name)
+        if column is None:
+            raise SupabaseError(f"column {table.name}.{column_name} does not exist", status_code=400, code="42703")
+        if operator in _COMPARISONS:
+            return f"{column_name} {_COMPARISONS[operator]} ?", [_encode(column, value)]
+        if operator == "in":
+            if not value:
+                return "0", []
+            return f"{column_name} IN ({', '.join('?' for _ in value)})", [_encode(column, v) for v in value]
+        if operator == "is":
+            text = str(value).lower() if value is not None else "null"
+            if text == "null":
+                return f"{column_name} IS NULL", []
+            return f"{column_name} IS ?", [1 if text == "true" else 0]
+        if operator in ("like", "ilike"):
+            pattern = str(value).replace("*", "%")
+            if operator == "ilike":
+                return f"{column_name} LIKE ?", [pattern]
+            # LIKE ignores case in SQLite; GLOB is the case-sensitive match
+            glob = re.sub(r"[\[\]*?]", lambda m: f"[{m.group(0)}]", pattern).replace("%", "*").replace("_", "?")
+            return f"{column_name} GLOB ?", [glob]
+        raise SupabaseError(f"Operator '{operator}' is not supported by the SQLite backend", status_code=400, code="PGRST100")
+
+    def _order_sql(self, table: Table) -> str:
+        if not self._orders:
+            return ""
+        terms = []
+        for column, desc, nullsfirst in self._orders:
+            if column not in table.columns:
+                raise SupabaseError(f"column {table.name}.{column} does not exist", status_code=400, code="42703")
+            # Postgres sorts NULLs as the largest value; SQLite as the smallest
+            if nullsfirst is None:
+                nullsfirst = desc
+            terms.append(f"{column} {'DESC' if desc else 'ASC'} NULLS {'FIRST' if nullsfirst else 'LAST'}")
+        return " ORDER BY " + ", ".join(terms)
+
+
+class SqliteRpc:
+    """Call of a Python implementation of a Postgres function"""
+
+    def __init__(self, client: "SqliteSupabase", function: str, params: Dict[str, Any]):
+        self._client = client
+        self._function = function
+        self._params = params
+
+    async def execute(self) -> APIResponse:
+        implementation = RPC_FUNCTIONS.get(self._function)
+        if implementation is None:
+            raise SupabaseError(
+                f"Could not find the function {self._function} in the schema cache",
+                status_code=404, code="PGRST202"
+            )
+        return self._client.run(lambda conn: APIResponse(data=implementation(self._client, conn, **self._params)))
+
+
+# Postgres functions the API calls through rpc(), reimplemented for SQLite
+RPC_FUNCTIONS: Dict[str, Callable[..., Any]] = {}
+
+
+def register_rpc(name: str):
+    """Register a Python implementation of the Postgres function name"""
+    def decorator(function):
+        RPC_FUNCTIONS[name] = function
+        return function
+    return decorator
+
+
+def _apply_balances(client: "SqliteSupabase", conn: sqlite3.Connection, table: str, rows: List[Dict[str, Any]]) -> int:
+    updated = 0
+    for row in rows:
+        cursor = conn.execute(
+            f"UPDATE {table} SET native_balance = ?, updated_at = ? WHERE id = ?",
+            (row.get("native_balance"), row.get("updated_at") or _now(), row["id"])
+        )
+        updated += cursor.rowcount
+    return updated
+
+
+@register_rpc("apply_star_system_balances")
+def _apply_star_system_balances(client, conn, p_rows):
+    return _apply_balances(client, conn, "star_systems", p_rows)
+
+
+@register_rpc("apply_planet_balances")
+def _apply_planet_balances(client, conn, p_rows):
+    return _apply_balances(client, conn, "planets", p_rows)
+
+
+@register_rpc("account_subtree")
+def _account_subtree(client, conn, p_roots, p_max_depth=32):
+    # Same result as the Postgres function; each edge source is its own recursive
+    # step so both are walked through their parent index
+    rows = conn.execute(
+        """
+        WITH RECURSIVE tree(account_id, parent_account_id, depth) AS (
+            SELECT value, NULL, 0 FROM json_each(?)
+            UNION
+            SELECT a.id, a.parent_id, t.depth + 1
+            FROM tree t JOIN accounts a ON a.parent_id = t.account_id
+            WHERE t.depth < ?
+            UNION
+            SELECT s.child_account_id, s.parent_account_id, t.depth + 1
+            FROM tree t JOIN sub_accounts s ON s.parent_account_id = t.account_id
+            WHERE t.depth < ?
+        ),
+        shortest AS (
+            SELECT account_id, parent_account_id, MIN(depth) AS depth
+            FROM tree
+            GROUP BY account_id
+        )
+        SELECT s.account_id, s.parent_account_id, s.depth,
+               a.name, a.type, a.wallet_address,
+               COALESCE(b.xbgl_balance, 0) AS xbgl_balance, COALESCE(b.chaos_balance, 0) AS chaos_balance,
+               COALESCE(b.sc_balance, 0) AS sc_balance, COALESCE(b.avax_balance, 0) AS avax_balance
+        FROM shortest s
+        JOIN accounts a ON a.id = s.account_id
+        LEFT JOIN account_balances b ON b.account_id = s.account_id
+        ORDER BY s.depth, a.created_at, s.account_id
+        """,
+        (json.dumps(list(p_roots)), p_max_depth, p_max_depth)
+    )
+    return [dict(row) for row in rows]
+
+
+class SqliteSupabase:
+    """Embedded database exposing the AsyncSupabase interface"""
+
+    def __init__(self, path: str = SQLITE_DB_PATH, migrations_dir: str = SQLITE_MIGRATIONS_DIR):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self.schema = SchemaBuilder(self._conn)
+        self._migrate(Path(migrations_dir))
+
+    def _migrate(self, migrations_dir: Path):
+        """Build the schema model from every migration, executing those not yet applied"""
+        self._conn.execute("CREATE TABLE IF NOT EXISTS _migrations (name TEXT PRIMARY KEY, applied_at TEXT)")
+        applied = {row[0] for row in self._conn.execute("SELECT name FROM _migrations")}
+        for path in sorted(migrations_dir.glob("*.sql")):
+            execute = path.name not in applied
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self.schema.apply_file(path, execute)
+                    if execute:
+                        self._conn.execute("INSERT INTO _migrations VALUES (?, ?)", (path.name, _now()))
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+    def table(self, name: str) -> SqliteQuery:
+        return SqliteQuery(self, name)
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None, idempotent: bool = False) -> SqliteRpc:
+        # idempotent only affects HTTP retries; local calls are never retried
+        return SqliteRpc(self, function, params or {})
+
+    def get_table(self, name: str) -> Table:
+        table = self.schema.tables.get(name)
+        if table is None:
+            raise SupabaseError(
+                f"Could not find the table '{name}' in the schema cache",
+                status_code=404, code="PGRST205"
+            )
+        return table
+
+    def run(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run operation in one transaction, mapping SQLite errors to SupabaseError"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                result = operation(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except sqlite3.IntegrityError as e:
+                self._conn.execute("ROLLBACK")
+                message = str(e)
+                if message.startswith("UNIQUE"):
+                    raise SupabaseError(f"duplicate key value violates unique constraint ({message})", status_code=409, code="23505")
+                if message.startswith("FOREIGN KEY"):
+                    raise SupabaseError(f"violates foreign key constraint ({message})", status_code=409, code="23503")
+                if message.startswith("NOT NULL"):
+                    raise SupabaseError(f"null value violates not-null constraint ({message})", status_code=400, code="23502")
+                raise SupabaseError(f"violates check constraint ({message})", status_code=400, code="23514")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                raise SupabaseError(str(e), status_code=400)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # Select lists and embedded resources
+
+    def shape(self, conn: sqlite3.Connection, table: Table, rows: List[Dict[str, Any]], columns: str) -> List[Dict[str, Any]]:
+        """Apply a PostgREST select list, resolving embeds like alias:table!fkey(*)"""
+        if columns.strip() == "*" or not rows:
+            return rows
+        plain: List[Tuple[str, str]] = []
+        embeds = []
+        for item in _split_top(columns):
+            embed = re.match(r"(?:(\w+):)?(\w+)(?:!(\w+))?\s*\((.*)\)$", item, re.S)
+            if embed:
+                embeds.append(embed.groups())
+                continue
+            alias, _, name = item.rpartition(":")
+            name = name.split("::")[0].strip()
+            plain.append((alias or name, name))
+
+        shaped = []
+        for row in rows:
+            if any(name == "*" for _, name in plain):
+                out = dict(row)
+            else:
+                out = {alias: row.get(name) for alias, name in plain}
+            shaped.append(out)
+
+        for alias, target, hint, sub_columns in embeds:
+            values = self._embed(conn, table, rows, target, hint, sub_columns)
+            for out, value in zip(shaped, values):
+                out[alias or target] = value
+        return shaped
+
+    def _embed(self, conn: sqlite3.Connection, table: Table, rows: List[Dict[str, Any]], target_name: str, hint: Optional[str], columns: str) -> List[Any]:
+        target = self.get_table(target_name)
+        candidates = [
+            (fk, "many_to_one") for fk in table.foreign_keys if fk.ref_table == target.name
+        ] + [
+            (fk, "one_to_many") for fk in target.foreign_keys if fk.ref_table == table.name
+        ]
+        if hint:
+            candidates = [(fk, direction) for fk, direction in candidates if hint in (fk.name, fk.column)]
+        if len(candidates) != 1:
+            raise SupabaseError(
+                f"Could not embed '{target.name}' from '{table.name}': "
+                f"{'no' if not candidates else 'more than one'} relationship found",
+                status_code=400, code="PGRST200" if not candidates else "PGRST201"
+            )
+        fk, direction = candidates[0]
+
+        if direction == "many_to_one":
+            local, remote = fk.column, fk.ref_column
+        else:
+            local, remote = fk.ref_column, fk.column
+        keys = list({row.get(local) for row in rows if row.get(local) is not None})
+        related: Dict[Any, List[Dict[str, Any]]] = {}
+        if keys:
+            sql = f"SELECT * FROM {target.name} WHERE {remote} IN ({', '.join('?' for _ in keys)})"
+            matches = [_decode(target, row) for row in conn.execute(sql, keys)]
+            for match, shaped in zip(matches, self.shape(conn, target, matches, columns)):
+                related.setdefault(match[remote], []).append(shaped)
+
+        single = direction == "many_to_one" or target.is_unique(fk.column)
+        results = []
+        for row in rows:
+            found = related.get(row.get(local), [])
+            results.append((found[0] if found else None) if single else found)
+        return results
+
+    async def aclose(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_sqlite_client(path: str = SQLITE_DB_PATH) -> SqliteSupabase:
+    """Embedded client with the schema from supabase/migrations applied"""
+    return SqliteSupabase(path)
@@ -5,6 +5,8 @@ Automatically deploys contracts to subnets and stores ABIs and addresses per sub
 import os
 import json
 import subprocess
+import time
+import uuid
 from pathlib import Path
 from web3 import Web3
 from eth_account import Account
@@ -20,9 +22,18 @@ except ImportError:
 try:
     from .cli_detector import get_cli_detector, is_forge_available
     from .subnet_interaction import create_subnet_interactor
+    from .build_cache import get_build_cache
+    from .job_runner import Job, JobStep
+    from .deployment_results import collect_deployment, write_registry
 except ImportError:
     from cli_detector import get_cli_detector, is_forge_available
     from subnet_interaction import create_subnet_interactor
+    from build_cache import get_build_cache
+    from job_runner import Job, JobStep
+    from deployment_results import collect_deployment, write_registry
+
+# Contracts whose ABIs are exported per subnet
+ABI_CONTRACTS = ["SaraktDigitalID", "SaraktTreasury", "SaraktLandV2", "DummyToken"]
 
 
 class SubnetContractManager:
@@ -83,10 +94,13 @@ class SubnetContractManager:
         
         # CLI detector for Forge operations
         self.cli_detector = get_cli_detector()
+        self.build_cache = get_build_cache(self.project_root)
         
         # Addresses file for this subnet
         self.addresses_file = self.deployments_dir / "addresses.json"
         self.load_addresses()
+        # Set when deploy steps are built for a background job
+        self._job_started_at: Optional[float] = None
     
     def load_addresses(self) -> Dict[str, str]:
         """Load deployment addresses from file for this subnet"""
@@ -98,9 +112,8 @@ class SubnetContractManager:
         return self.addresses
     
     def save_addresses(self):
-        """Save deployment addresses to file for this subnet"""
-        with open(self.addresses_file, 'w') as f:
-            json.dump(self.addresses, f, indent=2)
+        """Save deployment addresses to file for this subnet (atomically)"""
+        write_registry(self.addresses_file, self.addresses, merge=False)
         print(f"Addresses saved to {self.addresses_file}")
     
     def check_contract_deployed(self, address: str) -> bool:
@@ -115,22 +128,22 @@ class SubnetContractManager:
             return False
     
     def compile_contracts(self) -> bool:
-        """Compile Solidity contracts using Foundry"""
+        """Compile Solidity contracts using Foundry (skipped when sources are unchanged)"""
         if not is_forge_available():
             raise Exception("Foundry (forge) not found. Please install Foundry.")
         
         try:
-            result = self.cli_detector.execute_forge_command(
-                "build",
-                cwd=self.project_root,
-                timeout=120
-            )
+            # Shared with concurrent deployments to other subnets
+            result = self.build_cache.ensure_built(timeout=120)
             
-            if result.returncode != 0:
+            if not result.success:
                 print(f"Compilation error: {result.stderr}")
                 return False
             
-            print("Contracts compiled successfully")
+            if result.cached:
+                print("Contracts up to date, skipping compilation")
+            else:
+                print("Contracts compiled successfully")
             return True
         except subprocess.TimeoutExpired:
             raise Exception("Contract compilation timed out")
@@ -139,24 +152,7 @@ class SubnetContractManager:
     
     def extract_abi(self, contract_name: str) -> Optional[Dict]:
         """Extract ABI from compiled contract"""
-        # Try multiple paths for ABI location
-        possible_paths = [
-            self.project_root / "out" / contract_name / f"{contract_name}.sol" / f"{contract_name}.json",
-            self.project_root / "out" / f"{contract_name}.sol" / f"{contract_name}.json",
-            self.project_root / "out" / contract_name / f"{contract_name}.json",
-        ]
-        
-        for abi_path in possible_paths:
-            if abi_path.exists():
-                try:
-                    with open(abi_path, 'r') as f:
-                        artifact = json.load(f)
-                        return artifact.get("abi")
-                except Exception as e:
-                    print(f"Error extracting ABI from {abi_path}: {e}")
-                    continue
-        
-        return None
+        return self.build_cache.get_abi(contract_name)
     
     def save_abi(self, contract_name: str, abi: Dict):
         """Save ABI to backend/abi/{subnet_name} directory"""
@@ -176,13 +172,7 @@ class SubnetContractManager:
         
         # 2. Extract and save ABIs
         print("\nStep 2: Extracting ABIs...")
-        contracts_to_abi = ["SaraktDigitalID", "SaraktTreasury", "SaraktLandV2", "DummyToken"]
-        abis = {}
-        for contract_name in contracts_to_abi:
-            abi = self.extract_abi(contract_name)
-            if abi:
-                self.save_abi(contract_name, abi)
-                abis[contract_name] = abi
+        self.export_abis()
         
         # 3. Deploy using Foundry script
         print(f"\nStep 3: Deploying contracts to subnet '{self.subnet_name}'...")
@@ -195,24 +185,14 @@ class SubnetContractManager:
             raise Exception("deploy_all.s.sol script not found")
         
         try:
-            # Prepare private key for Forge (needs to be hex string)
-            private_key_for_forge = self.private_key
-            if not private_key_for_forge.startswith("0x"):
-                # Try to convert if it's an integer string
-                try:
-                    int_key = int(private_key_for_forge)
-                    private_key_for_forge = hex(int_key)
-                except:
-                    # If not, assume it's already hex without 0x prefix
-                    private_key_for_forge = f"0x{private_key_for_forge}"
-            
-            # Set environment variable for Forge script
-            env = os.environ.copy()
-            env["PRIVATE_KEY"] = str(int(private_key_for_forge, 16)) if private_key_for_forge.startswith("0x") else private_key_for_forge
+            private_key_for_forge = self._forge_private_key()
+            script_output = self._new_script_output()
+            env = self._forge_env(private_key_for_forge, script_output)
             
             print(f"Deploying to: {self.rpc_url}")
             print(f"Deployer: {self.deployer.address}")
             
+            started_at = time.time()
             result = self.cli_detector.execute_forge_command(
                 "script",
                 args=[
@@ -234,20 +214,9 @@ class SubnetContractManager:
             
             print("Deployment transaction submitted!")
             
-            # 4. Parse deployment addresses from output and forge deployment files
-            print("\nStep 4: Extracting deployment addresses...")
-            self._extract_addresses_from_forge_output(result.stdout)
-            
-            # Also check forge deployment directory for addresses
-            self._extract_addresses_from_forge_deployments()
-            
-            # Wait a moment for file to be written
-            import time
-            time.sleep(2)
-            self.load_addresses()
-            
-            if not self.addresses:
-                raise Exception("Deployment completed but addresses were not extracted. Check forge output.")
+            # 4. Resolve addresses from forge's broadcast record for this chain
+            print("\nStep 4: Confirming deployment...")
+            self.record_deployment(script_output, started_at)
             
             print(f"\n✓ Contracts deployed successfully to subnet '{self.subnet_name}'!")
             print("Deployed Addresses:")
@@ -261,114 +230,96 @@ class SubnetContractManager:
         except Exception as e:
             raise Exception(f"Deployment failed: {str(e)}")
     
-    def _extract_addresses_from_forge_output(self, output: str):
-        """Extract addresses from forge script output"""
-        lines = output.split('\n')
-        for line in lines:
-            # Look for deployed at: patterns
-            if "deployed at:" in line.lower() or "deployed:" in line.lower():
-                parts = line.split(":")
-                if len(parts) >= 2:
-                    address = parts[-1].strip()
-                    # Clean up address (remove any trailing characters)
-                    address = address.split()[0] if address else ""
-                    if address.startswith("0x") and len(address) == 42:
-                        # Try to match contract name from line
-                        line_lower = line.lower()
-                        if "digitalid" in line_lower or "saraktdigitalid" in line_lower:
-                            self.addresses["digitalID"] = address
-                        elif "treasury" in line_lower or "sarakttreasury" in line_lower:
-                            self.addresses["treasury"] = address
-                        elif "land" in line_lower or "saraktland" in line_lower:
-                            self.addresses["land"] = address
-                        elif "dummytoken" in line_lower or ("dummy" in line_lower and "token" in line_lower):
-                            self.addresses["dummyToken"] = address
-                
-                # Also check for console.log patterns: "ContractName deployed at: 0x..."
-                if "deployed" in line_lower:
-                    # Try to find contract name before "deployed"
-                    for contract_pattern in [
-                        ("saraktdigitalid", "digitalID"),
-                        ("sarakttreasury", "treasury"),
-                        ("saraktlandv2", "land"),
-                        ("saraktland", "land"),
-                        ("dummytoken", "dummyToken")
-                    ]:
-                        if contract_pattern[0] in line_lower:
-                            # Extract address (should be after "deployed at:" or ":")
-                            address_match = None
-                            if "0x" in line:
-                                import re
-                                addresses = re.findall(r'0x[a-fA-F0-9]{40}', line)
-                                if addresses:
-                                    self.addresses[contract_pattern[1]] = addresses[-1]  # Use last address found
-                                    break
+    def _forge_private_key(self) -> str:
+        """Private key formatted for Forge (hex string)"""
+        private_key_for_forge = self.private_key
+        if not private_key_for_forge.startswith("0x"):
+            # Try to convert if it's an integer string
+            try:
+                int_key = int(private_key_for_forge)
+                private_key_for_forge = hex(int_key)
+            except:
+                # If not, assume it's already hex without 0x prefix
+                private_key_for_forge = f"0x{private_key_for_forge}"
+        return private_key_for_forge
+    
+    def _forge_env(self, private_key_for_forge: str, addresses_out: Path) -> Dict[str, str]:
+        """Environment for deploy_all.s.sol: deployer key and this subnet's output file"""
+        env = os.environ.copy()
+        env["PRIVATE_KEY"] = str(int(private_key_for_forge, 16)) if private_key_for_forge.startswith("0x") else private_key_for_forge
+        env["DEPLOYMENTS_FILE"] = str(addresses_out)
+        return env
     
-    def _extract_addresses_from_forge_deployments(self):
-        """Extract addresses from forge deployment JSON files"""
-        # Forge stores deployments in broadcast/{script_name}/{chain_id}/run-latest.json
-        broadcast_dir = self.project_root / "broadcast"
-        if not broadcast_dir.exists():
+    def _new_script_output(self) -> Path:
+        # One file per run, so concurrent deployments cannot read each other's output
+        return self.deployments_dir / f".addresses.{uuid.uuid4().hex}.json"
+    
+    def export_abis(self):
+        """Save ABIs for this subnet unless they were already exported from the current build"""
+        # Saved ABIs embed the RPC URL, so a new URL also needs a fresh export
+        if self.build_cache.abis_current(self.abi_dir, variant=self.rpc_url):
+            print("ABIs up to date, skipping extraction")
             return
         
-        # Find the latest deployment
-        script_name = "deploy_all.s.sol"
-        chain_id = self.w3.eth.chain_id
+        for contract_name in ABI_CONTRACTS:
+            abi = self.extract_abi(contract_name)
+            if abi:
+                self.save_abi(contract_name, abi)
+        self.build_cache.mark_abis_current(self.abi_dir, variant=self.rpc_url)
+    
+    def build_deploy_steps(self, addresses_out: Path) -> List[JobStep]:
+        """
+        deploy_all.s.sol as a background job step for this subnet
         
-        deployment_file = broadcast_dir / script_name / str(chain_id) / "run-latest.json"
-        if not deployment_file.exists():
-            # Try alternative paths
-            for alt_file in broadcast_dir.rglob("run-latest.json"):
-                if script_name in str(alt_file):
-                    deployment_file = alt_file
-                    break
+        complete_deployment records the addresses once the job succeeds, falling back
+        to addresses_out (written by the script) if forge left no broadcast record.
+        """
+        script_path = self.project_root / "scripts" / "deploy_all.s.sol"
+        if not script_path.exists():
+            raise Exception("deploy_all.s.sol script not found")
         
-        if deployment_file.exists():
-            try:
-                with open(deployment_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Extract addresses from transactions
-                transactions = data.get("transactions", [])
-                for tx in transactions:
-                    if tx.get("transaction_type") == "CREATE" or tx.get("contractName"):
-                        contract_name = tx.get("contract_name") or tx.get("contractName") or ""
-                        address = tx.get("contract_address") or tx.get("contractAddress") or ""
-                        
-                        if address:
-                            contract_name_lower = contract_name.lower()
-                            if "digitalid" in contract_name_lower:
-                                self.addresses["digitalID"] = address
-                            elif "treasury" in contract_name_lower:
-                                self.addresses["treasury"] = address
-                            elif "land" in contract_name_lower:
-                                self.addresses["land"] = address
-                            elif "dummytoken" in contract_name_lower or ("dummy" in contract_name_lower and "token" in contract_name_lower):
-                                self.addresses["dummyToken"] = address
-                
-                # Also check receipts
-                receipts = data.get("receipts", [])
-                for receipt in receipts:
-                    contract_name = receipt.get("contract_name") or receipt.get("contractName") or ""
-                    address = receipt.get("contract_address") or receipt.get("contractAddress") or ""
-                    
-                    if address:
-                        contract_name_lower = contract_name.lower()
-                        if "digitalid" in contract_name_lower:
-                            self.addresses["digitalID"] = address
-                        elif "treasury" in contract_name_lower:
-                            self.addresses["treasury"] = address
-                        elif "land" in contract_name_lower:
-                            self.addresses["land"] = address
-                        elif "dummytoken" in contract_name_lower or ("dummy" in contract_name_lower and "token" in contract_name_lower):
-                            self.addresses["dummyToken"] = address
-                
-                # Save addresses
-                if self.addresses:
-                    self.save_addresses()
-                    
-            except Exception as e:
-                print(f"Warning: Could not parse forge deployment file: {e}")
+        self._job_started_at = time.time()
+        
+        private_key_for_forge = self._forge_private_key()
+        return [
+            JobStep(
+                self.cli_detector.forge_command_argv("script", [
+                    str(script_path),
+                    "--rpc-url", self.rpc_url,
+                    "--private-key", private_key_for_forge,
+                    "--broadcast",
+                    "-vv"
+                ]),
+                cwd=self.project_root,
+                env=self._forge_env(private_key_for_forge, addresses_out),
+                timeout=600,
+                label=f"deploy {self.subnet_name}"
+            )
+        ]
+    
+    def record_deployment(self, script_output: Path, started_at: Optional[float] = None) -> Dict[str, str]:
+        """Confirm the latest deploy_all broadcast to this subnet and update addresses.json"""
+        try:
+            result = collect_deployment(
+                self.project_root,
+                self.w3.eth.chain_id,
+                self.rpc_url,
+                started_at=started_at,
+                script_output=script_output
+            )
+        finally:
+            script_output.unlink(missing_ok=True)
+        
+        if result.unconfirmed:
+            print(f"Warning: unconfirmed contract creations: {', '.join(result.unconfirmed)}")
+        self.addresses = write_registry(self.addresses_file, result.addresses)
+        return self.addresses
+    
+    def complete_deployment(self, addresses_out: Path, job: Optional[Job] = None) -> Dict[str, str]:
+        """Publish the addresses of a finished deploy job and export this subnet's ABIs"""
+        self.record_deployment(addresses_out, self._job_started_at)
+        self.export_abis()
+        return self.addresses
     
     def get_deployment_info(self) -> Dict:
         """Get complete deployment information for this subnet"""
@@ -5,6 +5,8 @@ Automatically uses detected Forge and Avalanche CLI to interact with subnets
 import os
 import json
 import subprocess
+import threading
+import time
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Tuple
 from web3 import Web3
@@ -12,6 +14,8 @@ from eth_account import Account
 
 from cli_detector import get_cli_detector, is_forge_available, is_avalanche_cli_available
 from avalanche_key_loader import get_avalanche_cli_home, find_funded_account_key
+from job_runner import JobStep
+from build_cache import get_build_cache
 
 # Try to import from avalanche-cli module (may not be available)
 try:
@@ -31,6 +35,15 @@ except ImportError:
         return rpc, key
 
 
+# Seconds a pooled interactor is reused before its configuration is rediscovered
+INTERACTOR_POOL_TTL = int(os.getenv("INTERACTOR_POOL_TTL", "300"))
+# Seconds a connected Web3 client is reused before its connection is checked again
+WEB3_RECHECK_SECONDS = 10
+
+# Environment variables that feed _auto_discover_config
+_CONFIG_ENV_VARS = ("VITE_AVALANCHE_RPC", "AVALANCHE_RPC", "PRIVATE_KEY")
+
+
 class SubnetInteractor:
     """Interacts with subnets using automatically detected CLI tools"""
     
@@ -39,6 +52,8 @@ class SubnetInteractor:
         self.detector = get_cli_detector()
         self.rpc_url: Optional[str] = None
         self.private_key: Optional[str] = None
+        self._web3: Optional[Web3] = None
+        self._web3_checked_at = 0.0
         self._auto_discover_config()
     
     def _auto_discover_config(self):
@@ -124,17 +139,24 @@ class SubnetInteractor:
         return self.private_key
     
     def get_web3_instance(self) -> Optional[Web3]:
-        """Get Web3 instance connected to the subnet"""
+        """Get Web3 instance connected to the subnet (reused across calls)"""
         if not self.rpc_url:
             return None
         
+        now = time.monotonic()
+        if self._web3 is not None and now - self._web3_checked_at < WEB3_RECHECK_SECONDS:
+            return self._web3
+        
         try:
-            w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            w3 = self._web3 or Web3(Web3.HTTPProvider(self.rpc_url))
             if w3.is_connected():
+                self._web3 = w3
+                self._web3_checked_at = now
                 return w3
         except Exception:
             pass
         
+        self._web3 = None
         return None
     
     def get_account(self) -> Optional[Account]:
@@ -176,21 +198,10 @@ class SubnetInteractor:
             }
         
         try:
-            # Format private key for Forge
-            private_key = self.private_key
-            if not private_key.startswith("0x"):
-                private_key = f"0x{private_key}"
-            
             # Execute forge script
             result = self.detector.execute_forge_command(
                 "script",
-                args=[
-                    str(script_path),
-                    "--rpc-url", self.rpc_url,
-                    "--private-key", private_key,
-                    "--broadcast",
-                    "-vv"
-                ],
+                args=self._forge_script_args(script_path),
                 cwd=project_root,
                 timeout=600
             )
@@ -219,6 +230,57 @@ class SubnetInteractor:
                 "error": str(e)
             }
     
+    def _forge_private_key(self) -> str:
+        """Private key formatted for Forge"""
+        private_key = self.private_key
+        if not private_key.startswith("0x"):
+            private_key = f"0x{private_key}"
+        return private_key
+    
+    def _forge_script_args(self, script_path: Path) -> List[str]:
+        """Arguments for broadcasting a forge script to this subnet"""
+        return [
+            str(script_path),
+            "--rpc-url", self.rpc_url,
+            "--private-key", self._forge_private_key(),
+            "--broadcast",
+            "-vv"
+        ]
+    
+    def build_deploy_steps(self, project_root: Path, script_path: Path = None) -> List[JobStep]:
+        """
+        Build the compile (if needed) + deploy steps for running a deployment as a background job
+        
+        Raises:
+            RuntimeError: If Forge, the RPC URL, the private key or the script is missing
+        """
+        if not is_forge_available():
+            raise RuntimeError("Forge is not installed or not in PATH")
+        
+        if not self.rpc_url or not self.private_key:
+            raise RuntimeError("RPC URL or private key not configured")
+        
+        if script_path is None:
+            script_path = project_root / "scripts" / "deploy_all.s.sol"
+        
+        if not script_path.exists():
+            raise RuntimeError(f"Deployment script not found: {script_path}")
+        
+        # deploy_all.s.sol reads the deployer key from PRIVATE_KEY
+        env = os.environ.copy()
+        env["PRIVATE_KEY"] = self._forge_private_key()
+        
+        compile_step = get_build_cache(project_root).compile_step(timeout=120)
+        return ([compile_step] if compile_step else []) + [
+            JobStep(
+                self.detector.forge_command_argv("script", self._forge_script_args(script_path)),
+                cwd=project_root,
+                env=env,
+                timeout=600,
+                label="deploy"
+            ),
+        ]
+    
     def compile_contracts(self, project_root: Path) -> Dict[str, Any]:
         """Compile contracts using Forge"""
         if not is_forge_available():
@@ -228,16 +290,13 @@ class SubnetInteractor:
             }
         
         try:
-            result = self.detector.execute_forge_command(
-                "build",
-                cwd=project_root,
-                timeout=120
-            )
+            result = get_build_cache(project_root).ensure_built(timeout=120)
             
-            if result.returncode == 0:
+            if result.success:
                 return {
                     "success": True,
-                    "output": result.stdout
+                    "output": result.stdout if not result.cached else "Contracts up to date, skipping compilation",
+                    "cached": result.cached
                 }
             else:
                 return {
@@ -497,10 +556,107 @@ class SubnetInteractor:
         return status
 
 
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _config_fingerprint(subnet_name: str) -> Tuple:
+    """Inputs of _auto_discover_config; a change means the pooled interactor is stale"""
+    avalanche_home = get_avalanche_cli_home()
+    subnet_dir = avalanche_home / "subnets" / subnet_name
+    return (
+        tuple(os.getenv(name) for name in _CONFIG_ENV_VARS),
+        _mtime(subnet_dir),
+        _mtime(subnet_dir / "sidecar.json"),
+        _mtime(avalanche_home / "key"),
+    )
+
+
+class SubnetInteractorPool:
+    """
+    Keeps one ready SubnetInteractor per subnet
+    
+    Interactors are rebuilt when the environment or the subnet's Avalanche CLI
+    files change, or after INTERACTOR_POOL_TTL seconds.
+    """
+    
+    def __init__(self, ttl: int = INTERACTOR_POOL_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Tuple, float, SubnetInteractor]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, subnet_name: str = None) -> SubnetInteractor:
+        """Return a pooled interactor, discovering configuration only when needed"""
+        subnet_name = subnet_name or os.getenv("AVALANCHE_SUBNET_NAME", "ChaosStarNetwork")
+        fingerprint = _config_fingerprint(subnet_name)
+        
+        entry = self._entries.get(subnet_name)
+        if entry and self._is_fresh(entry, fingerprint):
+            self.hits += 1
+            return entry[2]
+        
+        # One discovery per subnet at a time; concurrent callers wait and reuse it
+        with self._subnet_lock(subnet_name):
+            entry = self._entries.get(subnet_name)
+            if entry and self._is_fresh(entry, fingerprint):
+                self.hits += 1
+                return entry[2]
+            
+            self.misses += 1
+            interactor = SubnetInteractor(subnet_name)
+            self._entries[subnet_name] = (fingerprint, time.monotonic(), interactor)
+            return interactor
+    
+    def invalidate(self, subnet_name: str = None):
+        """Drop one pooled interactor, or all of them"""
+        with self._lock:
+            if subnet_name:
+                self._entries.pop(subnet_name, None)
+            else:
+                self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subnets": sorted(self._entries.keys()),
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl": self.ttl,
+        }
+    
+    def _is_fresh(self, entry: Tuple[Tuple, float, SubnetInteractor], fingerprint: Tuple) -> bool:
+        cached_fingerprint, created_at, _ = entry
+        return cached_fingerprint == fingerprint and time.monotonic() - created_at < self.ttl
+    
+    def _subnet_lock(self, subnet_name: str) -> threading.Lock:
+        with self._lock:
+            if subnet_name not in self._locks:
+                self._locks[subnet_name] = threading.Lock()
+            return self._locks[subnet_name]
+
+
+# Global instance
+_interactor_pool: Optional[SubnetInteractorPool] = None
+
+
+def get_interactor_pool() -> SubnetInteractorPool:
+    """Get or create the global interactor pool"""
+    global _interactor_pool
+    if _interactor_pool is None:
+        _interactor_pool = SubnetInteractorPool()
+    return _interactor_pool
+
+
 # Convenience functions
 def create_subnet_interactor(subnet_name: str = None) -> SubnetInteractor:
-    """Create a subnet interactor instance"""
-    return SubnetInteractor(subnet_name)
+    """Get a ready subnet interactor from the pool"""
+    return get_interactor_pool().get(subnet_name)
 
 
 def auto_detect_and_interact(subnet_name: str = None) -> Dict[str, Any]:
@@ -510,7 +666,7 @@ def auto_detect_and_interact(subnet_name: str = None) -> Dict[str, Any]:
     Returns:
         Dictionary with detection and interaction status
     """
-    interactor = SubnetInteractor(subnet_name)
+    interactor = create_subnet_interactor(subnet_name)
     return interactor.get_status()
 
 
@@ -0,0 +1,102 @@
+"""
+Treasury and Inflation Simulator
+Monte Carlo runs of the elastic inflation controller: thousands of utilization
+paths advanced together as NumPy arrays, one vectorized step per period, with
+percentile bands of growth, utilization and reserve coverage per period
+"""
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+# Controller gain and clamp, as in /economy/treasury/adjust-inflation
+CONTROLLER_GAIN = 0.5
+CONTROLLER_CLAMP = 0.05
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def controller_bias(utilization: np.ndarray) -> np.ndarray:
+    """Growth bias for each utilization ratio (> 1 inflates, < 1 deflates)"""
+    return np.clip((utilization - 1.0) * CONTROLLER_GAIN, -CONTROLLER_CLAMP, CONTROLLER_CLAMP)
+
+
+def simulate_inflation(
+    target_growth: float,
+    initial_utilization: float,
+    initial_coverage: float,
+    periods: int,
+    scenarios: int,
+    periods_per_year: int = 12,
+    elastic: bool = True,
+    utilization_volatility: float = 0.1,
+    mean_reversion: float = 0.1,
+    feedback: float = 0.5,
+    reserve_return: float = 0.05,
+    reserve_volatility: float = 0.3,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run the inflation controller over periods for many utilization scenarios
+
+    Each period, per scenario:
+    - growth = target_growth + controller_bias(utilization) (annual; no bias when not elastic)
+    - money supply grows by growth / periods_per_year, reserves by a lognormal
+      return, and coverage = reserves / supply
+    - log utilization mean-reverts towards 1, falls with growth above target
+      (feedback) and takes a Gaussian shock
+
+    Returns:
+        Per-period percentile bands for growth, utilization and coverage, plus
+        end-of-horizon summaries
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / periods_per_year
+    q = np.asarray(percentiles, dtype=np.float64)
+
+    log_utilization = np.full(scenarios, np.log(initial_utilization))
+    coverage = np.full(scenarios, float(initial_coverage))
+    cumulative_growth = np.zeros(scenarios)
+    below_par = np.zeros(scenarios, dtype=bool)
+    reserve_drift = (reserve_return - 0.5 * reserve_volatility ** 2) * dt
+    reserve_shock = reserve_volatility * np.sqrt(dt)
+
+    bands = {name: np.empty((periods, len(q))) for name in ("growth", "utilization", "coverage")}
+    for period in range(periods):
+        utilization = np.exp(log_utilization)
+        growth = target_growth + controller_bias(utilization) if elastic else np.full(scenarios, target_growth)
+        supply_step = np.log1p(growth) * dt
+        coverage *= np.exp(reserve_drift + reserve_shock * rng.standard_normal(scenarios) - supply_step)
+        cumulative_growth += supply_step
+        below_par |= coverage < 1.0
+        log_utilization += (
+            -mean_reversion * log_utilization
+            - feedback * (growth - target_growth)
+            + utilization_volatility * np.sqrt(dt) * rng.standard_normal(scenarios)
+        )
+
+        bands["growth"][period] = np.percentile(growth, q)
+        bands["utilization"][period] = np.percentile(utilization, q)
+        bands["coverage"][period] = np.percentile(coverage, q)
+
+    labels = [f"p{value:g}" for value in q]
+    return {
+        "periods": periods,
+        "scenarios": scenarios,
+        "periods_per_year": periods_per_year,
+        "seed": seed,
+        "bands": {
+            name: {label: np.round(values[:, i], 6).tolist() for i, label in enumerate(labels)}
+            for name, values in bands.items()
+        },
+        "final": {
+            "coverage": dict(zip(labels, np.round(np.percentile(coverage, q), 6).tolist())),
+            "supply_multiple": dict(zip(labels, np.round(np.percentile(np.exp(cumulative_growth), q), 6).tolist())),
+            "probability_coverage_below_1": float(np.mean(coverage < 1.0)),
+            "probability_ever_below_1": float(np.mean(below_par)),
+        },
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
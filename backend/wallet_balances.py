@@ -0,0 +1,142 @@
+"""
+Batched Wallet Balances
+Native coin and CSN token balances for many wallets in one JSON-RPC round trip,
+reused until the chain moves to a new block
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from web3 import Web3
+
+try:
+    from .rpc_batch import batch_call, RpcBatchError
+    from .config import CSN_TOKEN_ADDRESS
+except ImportError:
+    from rpc_batch import batch_call, RpcBatchError
+    from config import CSN_TOKEN_ADDRESS
+
+
+# Within this window balances are answered without asking the node for the block number
+BALANCE_MIN_INTERVAL = float(os.getenv("WALLET_BALANCE_MIN_INTERVAL", "1"))
+
+_BALANCE_OF = Web3.to_hex(Web3.keccak(text="balanceOf(address)")[:4])
+_DECIMALS = Web3.to_hex(Web3.keccak(text="decimals()")[:4])
+
+
+@dataclass
+class WalletBalance:
+    """Raw on-chain balances of one wallet"""
+    address: str
+    # None when the node returned an error for this wallet (never cached)
+    native_wei: Optional[int] = None
+    # None when the token call failed (no token contract on this chain)
+    csn_raw: Optional[int] = None
+
+
+@dataclass
+class BalanceSnapshot:
+    """Wallet balances at one block"""
+    block_number: int
+    csn_decimals: int = 18
+    wallets: Dict[str, WalletBalance] = field(default_factory=dict)
+    checked_at: float = field(default_factory=time.monotonic)
+
+
+# (rpc_url, token) -> latest snapshot; wallets accumulate while the block is unchanged
+_snapshots: Dict[Tuple[str, str], BalanceSnapshot] = {}
+_token_decimals: Dict[Tuple[str, str], int] = {}
+_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+def _to_int(result: Optional[str]) -> Optional[int]:
+    if not result or result == "0x":
+        return None
+    return int(result, 16)
+
+
+def format_units(raw: int, decimals: int = 18) -> str:
+    """Integer token amount as a decimal string"""
+    return str((Decimal(raw) / (Decimal(10) ** decimals)).normalize()) if raw else "0"
+
+
+def _fetch(rpc_url: str, token: str, wallets: Iterable[str], block: str, with_decimals: bool) -> Tuple[Dict[str, WalletBalance], Optional[int]]:
+    wallets = list(wallets)
+    calls = []
+    for wallet in wallets:
+        calls.append(("eth_getBalance", [wallet, block]))
+        calls.append(("eth_call", [{"to": token, "data": _BALANCE_OF + wallet[2:].lower().rjust(64, "0")}, block]))
+    if with_decimals:
+        calls.append(("eth_call", [{"to": token, "data": _DECIMALS}, block]))
+
+    results = batch_call(rpc_url, calls)
+    balances = {}
+    for index, wallet in enumerate(wallets):
+        balances[wallet] = WalletBalance(
+            address=wallet,
+            native_wei=_to_int(results[2 * index]),
+            csn_raw=_to_int(results[2 * index + 1])
+        )
+    decimals = _to_int(results[-1]) if with_decimals else None
+    return balances, decimals
+
+
+def fetch_wallet_balances(rpc_url: str, wallets: Iterable[str], token: str = CSN_TOKEN_ADDRESS) -> BalanceSnapshot:
+    """
+    Native and CSN balances for wallets, all read at the same block
+
+    The node is asked for the latest block number first; wallets already read at
+    that block come from the cache, and the rest are fetched in one batch pinned
+    to it (getBalance plus a balanceOf call per wallet).
+
+    Args:
+        rpc_url: Node HTTP endpoint
+        wallets: Wallet addresses (duplicates and invalid addresses are dropped)
+        token: CSN token contract address
+
+    Raises:
+        RpcBatchError: If the node cannot be reached
+    """
+    addresses = list(dict.fromkeys(Web3.to_checksum_address(w) for w in wallets if w and Web3.is_address(w)))
+    token = Web3.to_checksum_address(token)
+    key = (rpc_url, token)
+    with _locks_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+
+    # Concurrent requests for the same node share one fetch
+    with lock:
+        snapshot = _snapshots.get(key)
+        fresh = snapshot is not None and time.monotonic() - snapshot.checked_at < BALANCE_MIN_INTERVAL
+        if not fresh:
+            block_hex = batch_call(rpc_url, [("eth_blockNumber", [])])[0]
+            if block_hex is None:
+                raise RpcBatchError(f"Node at {rpc_url} did not return a block number")
+            block_number = int(block_hex, 16)
+            if snapshot is None or snapshot.block_number != block_number:
+                snapshot = BalanceSnapshot(block_number=block_number, csn_decimals=_token_decimals.get(key, 18))
+                _snapshots[key] = snapshot
+            snapshot.checked_at = time.monotonic()
+
+        missing = [address for address in addresses if address not in snapshot.wallets]
+        failed: Dict[str, WalletBalance] = {}
+        if missing:
+            balances, decimals = _fetch(rpc_url, token, missing, hex(snapshot.block_number), key not in _token_decimals)
+            for address, balance in balances.items():
+                # Failed reads stay out of the snapshot so the next request retries them
+                if balance.native_wei is None:
+                    failed[address] = balance
+                else:
+                    snapshot.wallets[address] = balance
+            if key not in _token_decimals:
+                _token_decimals[key] = snapshot.csn_decimals = decimals if decimals is not None else 18
+
+        return BalanceSnapshot(
+            block_number=snapshot.block_number,
+            csn_decimals=snapshot.csn_decimals,
+            wallets={address: snapshot.wallets.get(address) or failed[address] for address in addresses},
+            checked_at=snapshot.checked_at
+        )
@@ -0,0 +1,124 @@
+"""
+Write-Behind Buffer
+Coalesces frequent row updates in memory and writes them in batches on an
+interval, so read endpoints that refresh a cached column do not pay for a
+database write each time
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "5"))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000"))
+
+logger = logging.getLogger(__name__)
+
+# Receives the coalesced (key, values) pairs of one flush
+FlushFn = Callable[[List[Tuple[Hashable, Dict[str, Any]]]], Awaitable[None]]
+
+
+class WriteBehindBuffer:
+    """Latest-value-wins buffer of pending row updates, flushed in the background"""
+
+    def __init__(self, flush_fn: FlushFn, interval: float = WRITE_BEHIND_INTERVAL, max_pending: int = WRITE_BEHIND_MAX_PENDING):
+        self.flush_fn = flush_fn
+        self.interval = interval
+        self.max_pending = max(1, max_pending)
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self.queued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.flushes = 0
+        self.failures = 0
+
+    def put(self, key: Hashable, values: Dict[str, Any]):
+        """
+        Queue an update for key (merged into any update still pending for it)
+
+        Must be called from a running event loop; the flusher starts on first use.
+        """
+        self.queued += 1
+        if key in self._pending:
+            self.coalesced += 1
+            self._pending[key].update(values)
+        else:
+            self._pending[key] = dict(values)
+
+        self._ensure_task()
+        if len(self._pending) >= self.max_pending:
+            # Don't let a burst of distinct rows grow the buffer unbounded
+            self._wakeup.set()
+
+    def put_many(self, items: List[Tuple[Hashable, Dict[str, Any]]]):
+        """Queue many (key, values) updates at once, as put() would one by one"""
+        for key, values in items:
+            self.queued += 1
+            if key in self._pending:
+                self.coalesced += 1
+                self._pending[key].update(values)
+            else:
+                self._pending[key] = dict(values)
+
+        self._ensure_task()
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write everything pending now"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await self.flush_fn(list(batch.items()))
+            except Exception as e:
+                self.failures += 1
+                logger.warning("Write-behind flush of %d row(s) failed: %s", len(batch), e)
+                # Requeue, keeping anything newer that arrived during the flush
+                for key, values in batch.items():
+                    self._pending[key] = {**values, **self._pending.get(key, {})}
+                return
+            self.flushes += 1
+            self.written += len(batch)
+
+    async def close(self):
+        """Stop the background flusher and write what is left"""
+        if self._task is not None:
+            # Signal rather than cancel: wait_for() can swallow a cancellation that
+            # lands just as the wakeup event fires, leaving the flusher running
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._closing = False
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "interval_seconds": self.interval,
+            "queued": self.queued,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failures": self.failures,
+        }
+
+    def _ensure_task(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
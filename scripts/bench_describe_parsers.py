@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Golden test and microbenchmark for the Avalanche CLI output parsers
+
+Each recorded output in scripts/cli_outputs/<command>_<case>.txt is parsed with the
+parser for <command> and compared to <command>_<case>.golden.json, then timed.
+
+Usage:
+    python scripts/bench_describe_parsers.py                  # check + benchmark
+    python scripts/bench_describe_parsers.py --iterations 5000
+    python scripts/bench_describe_parsers.py --update-golden  # re-record expected results
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from backend.describe_parser import parse_blockchain_describe, parse_subnet_describe, parse_network_status
+
+CORPUS_DIR = Path(__file__).parent / "cli_outputs"
+
+PARSERS = {
+    "blockchain_describe": parse_blockchain_describe,
+    "subnet_describe": parse_subnet_describe,
+    "network_status": parse_network_status,
+}
+
+
+def parser_for(sample: Path):
+    for prefix, parser in PARSERS.items():
+        if sample.stem.startswith(prefix + "_"):
+            return parser
+    return None
+
+
+def benchmark(parser, output: str, iterations: int) -> float:
+    """Return the mean parse time in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parser(output)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Check and benchmark CLI output parsers")
+    arg_parser.add_argument("--iterations", type=int, default=2000, help="Parse iterations per sample")
+    arg_parser.add_argument("--update-golden", action="store_true", help="Rewrite the expected results")
+    args = arg_parser.parse_args()
+
+    samples = sorted(CORPUS_DIR.glob("*.txt"))
+    if not samples:
+        print(f"No recorded outputs found in {CORPUS_DIR}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("CLI Output Parser Benchmark")
+    print("=" * 70)
+    print(f"{'sample':<40} {'result':<10} {'mean (us)':>10} {'KB':>6}")
+    print("-" * 70)
+
+    failures = 0
+    for sample in samples:
+        parser = parser_for(sample)
+        if parser is None:
+            print(f"{sample.name:<40} {'skipped':<10}")
+            continue
+
+        output = sample.read_text()
+        parsed = parser(output)
+        golden_file = sample.with_suffix(".golden.json")
+
+        if args.update_golden:
+            golden_file.write_text(json.dumps(parsed, indent=2) + "\n")
+            result = "recorded"
+        elif not golden_file.exists():
+            result = "no golden"
+            failures += 1
+        elif json.loads(golden_file.read_text()) != parsed:
+            result = "MISMATCH"
+            failures += 1
+        else:
+            result = "ok"
+
+        mean_us = benchmark(parser, output, args.iterations)
+        print(f"{sample.name:<40} {result:<10} {mean_us:>10.1f} {len(output) / 1024:>6.1f}")
+
+    print("-" * 70)
+    if failures:
+        print(f"{failures} sample(s) did not match their golden results")
+        print("Run with --update-golden after reviewing intended parser changes")
+        sys.exit(1)
+    print("All samples match")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nBenchmark interrupted by user")
+        sys.exit(1)
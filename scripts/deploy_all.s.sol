@@ -101,8 +101,10 @@ contract DeployAll is Script {
             "}\n"
         ));
         
-        vm.writeFile("./deployments/addresses.json", json);
-        console.log("\nAddresses saved to ./deployments/addresses.json");
+        // DEPLOYMENTS_FILE lets parallel deployments to different subnets write separate files
+        string memory outFile = vm.envOr("DEPLOYMENTS_FILE", string("./deployments/addresses.json"));
+        vm.writeFile(outFile, json);
+        console.log("\nAddresses saved to", outFile);
         console.log("DigitalID:", _addressToString(addresses.digitalID));
         console.log("Treasury:", _addressToString(addresses.treasury));
         console.log("Land:", _addressToString(addresses.land));
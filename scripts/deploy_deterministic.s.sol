@@ -0,0 +1,128 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import {Script, console} from "forge-std/Script.sol";
+import {Create2Factory} from "../src/contracts/Create2Factory.sol";
+import {SaraktDigitalID} from "../src/contracts/SaraktDigitalID.sol";
+import {SaraktTreasury} from "../src/contracts/SaraktTreasury.sol";
+import {SaraktLandV2} from "../src/contracts/SaraktLandV2.sol";
+import {DummyToken} from "../src/contracts/DummyToken.sol";
+
+/// @notice Deploys the core Sarakt suite at deterministic CREATE2 addresses.
+/// Contracts that already have code are skipped, so re-running is safe and cheap.
+/// backend/create2_deployer.py computes the same addresses offline.
+contract DeployDeterministic is Script {
+    // The factory itself goes through forge's deterministic deployment proxy
+    bytes32 constant FACTORY_SALT = keccak256("sarakt.create2-factory.v1");
+
+    uint256 constant DUMMY_TOKEN_SUPPLY = 1_000_000 ether;
+
+    struct DeploymentAddresses {
+        address digitalID;
+        address treasury;
+        address land;
+        address dummyToken;
+    }
+
+    DeploymentAddresses public deployed;
+
+    function run() external {
+        uint256 deployerPrivateKey = vm.envUint("PRIVATE_KEY");
+        address deployer = vm.addr(deployerPrivateKey);
+        string memory salt = vm.envOr("DEPLOY_SALT", string("sarakt-v1"));
+
+        console.log("Deterministic deployment with account:", deployer);
+        console.log("Salt:", salt);
+
+        vm.startBroadcast(deployerPrivateKey);
+
+        Create2Factory factory = _factory();
+
+        // Constructors make the factory the owner; hand everything to the deployer
+        bytes[] memory ownerCalls = new bytes[](1);
+        ownerCalls[0] = abi.encodeWithSignature("transferOwnership(address)", deployer);
+
+        // 1. SaraktDigitalID
+        deployed.digitalID = _deploy(factory, deployer, salt, "SaraktDigitalID", type(SaraktDigitalID).creationCode, ownerCalls);
+
+        // 2. DummyToken (supply is minted to the factory, then forwarded)
+        bytes[] memory tokenCalls = new bytes[](1);
+        tokenCalls[0] = abi.encodeWithSignature("transfer(address,uint256)", deployer, DUMMY_TOKEN_SUPPLY);
+        deployed.dummyToken = _deploy(
+            factory, deployer, salt, "DummyToken",
+            abi.encodePacked(type(DummyToken).creationCode, abi.encode("Sarakt Token", "SAR")),
+            tokenCalls
+        );
+
+        // 3. SaraktTreasury (with DummyToken in supported tokens)
+        address[] memory supportedTokens = new address[](1);
+        supportedTokens[0] = deployed.dummyToken;
+        deployed.treasury = _deploy(
+            factory, deployer, salt, "SaraktTreasury",
+            abi.encodePacked(type(SaraktTreasury).creationCode, abi.encode(supportedTokens)),
+            ownerCalls
+        );
+
+        // 4. SaraktLandV2 (phase 1 wallets default to msg.sender, so route them to the deployer first)
+        bytes[] memory landCalls = new bytes[](2);
+        landCalls[0] = abi.encodeWithSignature("setTreasuryRouting(address,address)", deployer, deployer);
+        landCalls[1] = ownerCalls[0];
+        deployed.land = _deploy(
+            factory, deployer, salt, "SaraktLandV2",
+            abi.encodePacked(type(SaraktLandV2).creationCode, abi.encode(deployed.treasury, deployed.digitalID)),
+            landCalls
+        );
+
+        vm.stopBroadcast();
+
+        _saveAddresses(deployed);
+    }
+
+    function _factory() internal returns (Create2Factory) {
+        address predicted = computeCreate2Address(FACTORY_SALT, keccak256(type(Create2Factory).creationCode));
+        if (predicted.code.length > 0) {
+            console.log("Create2Factory present at:", predicted);
+            return Create2Factory(predicted);
+        }
+        Create2Factory factory = new Create2Factory{salt: FACTORY_SALT}();
+        console.log("Create2Factory deployed at:", address(factory));
+        return factory;
+    }
+
+    function _deploy(
+        Create2Factory factory,
+        address deployer,
+        string memory salt,
+        string memory name,
+        bytes memory initCode,
+        bytes[] memory calls
+    ) internal returns (address) {
+        bytes32 contractSalt = keccak256(abi.encodePacked(salt, ":", name));
+        address predicted = factory.computeAddress(deployer, contractSalt, keccak256(initCode));
+
+        if (predicted.code.length > 0) {
+            console.log(string.concat(name, " already deployed at:"), predicted);
+            return predicted;
+        }
+
+        address addr = factory.deploy(contractSalt, initCode, calls);
+        require(addr == predicted, "CREATE2 address mismatch");
+        console.log(string.concat(name, " deployed at:"), addr);
+        return addr;
+    }
+
+    function _saveAddresses(DeploymentAddresses memory addresses) internal {
+        string memory json = string(abi.encodePacked(
+            "{\n",
+            '  "digitalID": "', vm.toString(addresses.digitalID), '",\n',
+            '  "treasury": "', vm.toString(addresses.treasury), '",\n',
+            '  "land": "', vm.toString(addresses.land), '",\n',
+            '  "dummyToken": "', vm.toString(addresses.dummyToken), '"\n',
+            "}\n"
+        ));
+
+        string memory outFile = vm.envOr("DEPLOYMENTS_FILE", string("./deployments/addresses.json"));
+        vm.writeFile(outFile, json);
+        console.log("\nAddresses saved to", outFile);
+    }
+}
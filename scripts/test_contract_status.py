@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Contract Status Probe Test
+Checks that batched probe results stay aligned with their contracts, using a
+mocked node (no RPC endpoint needed)
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from backend import contract_status
+
+CODE = "0x6080604052348015600f57600080fd"
+
+
+def mock_node(code_by_address):
+    def batch_call(rpc_url, calls):
+        results = []
+        for method, params in calls:
+            if method == "eth_blockNumber":
+                results.append("0x10")
+            elif method == "eth_getCode":
+                results.append(code_by_address[params[0].lower()])
+            else:
+                # View calls only succeed against code
+                results.append("0x01" if code_by_address[params[0]["to"].lower()] != "0x" else None)
+        return results
+    return batch_call
+
+
+def test_contract_without_code_before_one_with_code():
+    treasury = "0x" + "11" * 20
+    token = "0x" + "22" * 20
+    land = "0x" + "33" * 20
+    contract_status.batch_call = mock_node({treasury: "0x", token: CODE, land: CODE})
+    contract_status.invalidate()
+
+    probes = contract_status.probe_contracts("http://mock", {
+        "SaraktTreasury": treasury,
+        "DummyToken": token,
+        "SaraktLandV2": land,
+        "SaraktDigitalID": "not-an-address",
+    }).contracts
+
+    assert not probes["SaraktTreasury"].has_code
+    assert probes["SaraktTreasury"].view_ok is False
+    assert probes["DummyToken"].has_code
+    assert probes["DummyToken"].view_ok is None
+    assert probes["SaraktLandV2"].has_code and probes["SaraktLandV2"].view_ok
+    assert not probes["SaraktDigitalID"].has_code
+    assert probes["SaraktDigitalID"].error
+
+
+def main():
+    test_contract_without_code_before_one_with_code()
+    print("✓ Contract status probe results line up with their contracts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+/// @title Create2Factory
+/// @notice Deploys contracts at addresses derived from the caller, a salt and the init code,
+/// so the same suite lands at the same addresses on every subnet
+/// @dev Follow-up calls run in the deploy transaction: contracts whose constructor makes
+/// msg.sender (this factory) the owner hand ownership over before anyone else can act
+contract Create2Factory {
+    event Deployed(address indexed caller, bytes32 indexed salt, address deployed);
+
+    /// @notice Address deploy(salt, initCode, ...) yields when called by caller
+    function computeAddress(address caller, bytes32 salt, bytes32 initCodeHash) external view returns (address) {
+        bytes32 hash = keccak256(abi.encodePacked(bytes1(0xff), address(this), _callerSalt(caller, salt), initCodeHash));
+        return address(uint160(uint256(hash)));
+    }
+
+    /// @notice Deploy initCode with CREATE2, then run calls against the new contract
+    /// @dev The salt is bound to msg.sender so nobody else can claim a caller's addresses
+    function deploy(bytes32 salt, bytes memory initCode, bytes[] calldata calls) external returns (address deployed) {
+        bytes32 callerSalt = _callerSalt(msg.sender, salt);
+        assembly {
+            deployed := create2(0, add(initCode, 0x20), mload(initCode), callerSalt)
+        }
+        require(deployed != address(0), "CREATE2 failed");
+
+        for (uint256 i = 0; i < calls.length; i++) {
+            (bool ok, bytes memory result) = deployed.call(calls[i]);
+            if (!ok) {
+                assembly {
+                    revert(add(result, 0x20), mload(result))
+                }
+            }
+        }
+
+        emit Deployed(msg.sender, salt, deployed);
+    }
+
+    function _callerSalt(address caller, bytes32 salt) internal pure returns (bytes32) {
+        return keccak256(abi.encodePacked(caller, salt));
+    }
+}
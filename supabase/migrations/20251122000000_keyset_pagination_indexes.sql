@@ -0,0 +1,28 @@
+-- Indexes backing keyset pagination on the list endpoints
+-- Each matches the (filter, sort column, id) order the API pages by, so every
+-- page is an index range scan regardless of how deep the cursor is
+
+CREATE INDEX IF NOT EXISTS idx_accounts_active_created_id
+    ON accounts (is_active, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_accounts_owner_created_id
+    ON accounts (owner_wallet, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_account_clusters_owner_created_id
+    ON account_clusters (owner_wallet, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_account_clusters_created_id
+    ON account_clusters (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_star_systems_created_id
+    ON star_systems (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_star_systems_owner_created_id
+    ON star_systems (owner_wallet, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_planets_created_id
+    ON planets (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_planets_system_created_id
+    ON planets (star_system_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_planets_owner_created_id
+    ON planets (owner_wallet, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_portfolio_managers_status_roi_id
+    ON portfolio_managers (approval_status, roi_annualized DESC, id DESC);
@@ -0,0 +1,33 @@
+-- Batched native balance writes
+-- The API buffers balance refreshes and applies them here in one statement per
+-- table instead of one UPDATE per read
+
+CREATE OR REPLACE FUNCTION apply_star_system_balances(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE star_systems s
+    SET native_balance = r.native_balance,
+        updated_at = COALESCE(r.updated_at, NOW())
+    FROM jsonb_to_recordset(p_rows) AS r(id UUID, native_balance NUMERIC, updated_at TIMESTAMPTZ)
+    WHERE s.id = r.id;
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_planet_balances(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE planets p
+    SET native_balance = r.native_balance,
+        updated_at = COALESCE(r.updated_at, NOW())
+    FROM jsonb_to_recordset(p_rows) AS r(id UUID, native_balance NUMERIC, updated_at TIMESTAMPTZ)
+    WHERE p.id = r.id;
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,58 @@
+-- Account hierarchy queries
+-- Sub-account links (sub_accounts) and accounts.parent_id both make an account a
+-- child of another. account_subtree walks both in a single recursive query, so a
+-- whole organisation and its balances come back in one round trip.
+
+CREATE OR REPLACE VIEW account_edges AS
+    SELECT parent_id AS parent_account_id, id AS child_account_id
+    FROM accounts
+    WHERE parent_id IS NOT NULL
+    UNION
+    SELECT parent_account_id, child_account_id
+    FROM sub_accounts;
+
+-- Every account under p_roots (roots included, depth 0), each reached by its
+-- shortest path, with its own balances
+CREATE OR REPLACE FUNCTION account_subtree(p_roots UUID[], p_max_depth INTEGER DEFAULT 32)
+RETURNS TABLE (
+    account_id UUID,
+    parent_account_id UUID,
+    depth INTEGER,
+    name TEXT,
+    type TEXT,
+    wallet_address TEXT,
+    xbgl_balance NUMERIC,
+    chaos_balance NUMERIC,
+    sc_balance NUMERIC,
+    avax_balance NUMERIC
+) AS $$
+    WITH RECURSIVE tree(account_id, parent_account_id, depth) AS (
+        SELECT root, NULL::UUID, 0
+        FROM unnest(p_roots) AS root
+        -- UNION drops repeated (account, parent, depth) rows, so diamonds in the
+        -- graph don't multiply the work
+        UNION
+        SELECT e.child_account_id, e.parent_account_id, t.depth + 1
+        FROM tree t
+        JOIN account_edges e ON e.parent_account_id = t.account_id
+        -- The depth bound also stops cycles
+        WHERE t.depth < p_max_depth
+    ),
+    shortest AS (
+        SELECT DISTINCT ON (account_id) account_id, parent_account_id, depth
+        FROM tree
+        ORDER BY account_id, depth
+    )
+    SELECT s.account_id, s.parent_account_id, s.depth,
+           a.name, a.type::TEXT, a.wallet_address,
+           COALESCE(b.xbgl_balance, 0), COALESCE(b.chaos_balance, 0),
+           COALESCE(b.sc_balance, 0), COALESCE(b.avax_balance, 0)
+    FROM shortest s
+    JOIN accounts a ON a.id = s.account_id
+    LEFT JOIN account_balances b ON b.account_id = s.account_id
+    ORDER BY s.depth, a.created_at, s.account_id;
+$$ LANGUAGE sql STABLE;
+
+-- The recursive step looks edges up by parent on both sides of the view
+CREATE INDEX IF NOT EXISTS idx_sub_accounts_parent_child ON sub_accounts (parent_account_id, child_account_id);
+CREATE INDEX IF NOT EXISTS idx_accounts_parent_id_id ON accounts (parent_id, id);
@@ -0,0 +1,5 @@
+-- Economy tick engine
+-- Ticks are read back newest first (engine resume, per-plot history)
+
+CREATE INDEX IF NOT EXISTS idx_economy_ticks_tick_number ON economy_ticks(tick_number DESC);
+CREATE INDEX IF NOT EXISTS idx_economy_ticks_plot_tick ON economy_ticks(plot_id, tick_number DESC);